@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""End-to-end benchmark of scans and refreshes against the local fake Plex server.
+
+Each scenario runs one refresh cycle in a fresh child process pointed at the fake server,
+and reports wall time, HTTP requests, bytes received and the child's peak RSS.
+
+Scenarios:
+  quick    dry run using Plex's title search
+  deep     dry run listing every item
+  refresh  wet run: deep scan, refresh every due match, verify
+
+Usage: python benchmarks/e2e_benchmark.py [--sizes 1000,10000,100000] [--scenarios quick,deep,refresh]
+                                          [--backend plexapi|raw|async] [--latency-ms 0] [--error-rate 0]
+                                          [--patterns TBA,TBD] [--no-or-filter]
+
+--no-or-filter makes the fake server reject title filters that OR several patterns, as
+servers without that support would, so quick search falls back to one query per pattern.
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+SCENARIOS = ('quick', 'deep', 'refresh')
+
+DEFAULT_LOGGING = 'level: "INFO"\n'
+DEFAULT_PATTERNS = ('TBA', 'TBD')
+
+def scenario_config(scenario: str, url: str, backend: str, log_file: Path, logging_settings: str = DEFAULT_LOGGING,
+                    patterns=DEFAULT_PATTERNS) -> str:
+    wet = scenario == 'refresh'
+    logging_settings = ''.join(f"  {line}\n" for line in logging_settings.splitlines())
+    return f"""
+plex:
+  url: "{url}"
+  token: "benchmark-token-0123456789"
+search:
+  method: "{'quick' if scenario == 'quick' else 'deep'}"
+  backend: "{backend}"
+  patterns: {json.dumps(list(patterns))}
+refresh:
+  interval_seconds: 3600
+  delay_between_items: 1
+  dry_run: {'false' if wet else 'true'}
+  requests_per_second: 1000
+  max_in_flight: 8
+  max_queued: 1000
+  verify_delay_seconds: 0
+logging:
+{logging_settings}  format: "%(asctime)s - %(levelname)s - %(message)s"
+  file: "{log_file}"
+  max_size_mb: 50
+  backup_count: 0
+"""
+
+def run_child(result_path: str):
+    """Run one cycle with ./data/config.yaml and write wall time and peak RSS as JSON"""
+    from plex_refresher.core.refresher import PlexMetadataRefresher
+    started = time.perf_counter()
+    refresher = PlexMetadataRefresher()
+    try:
+        refresher.refresh_metadata()
+    finally:
+        refresher.close()
+    wall = time.perf_counter() - started
+    Path(result_path).write_text(json.dumps({'wall': wall, 'peak_rss_kib': peak_rss_kib()}))
+
+def peak_rss_kib() -> int:
+    # Linux carries ru_maxrss across exec, so it would include the benchmark parent and its fake
+    # library; VmHWM belongs to this process image alone
+    try:
+        for line in Path('/proc/self/status').read_text().splitlines():
+            if line.startswith('VmHWM:'):
+                return int(line.split()[1])
+    except OSError:
+        pass
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss // 1024 if sys.platform == 'darwin' else maxrss
+
+def run_scenario(server, scenario: str, backend: str, logging_settings: str = DEFAULT_LOGGING,
+                 script: str = __file__, patterns=DEFAULT_PATTERNS) -> dict:
+    """Run one scenario in a child process; script is the benchmark whose --child flag runs the cycle"""
+    with tempfile.TemporaryDirectory(prefix='plex-bench-') as workdir:
+        data_dir = Path(workdir) / 'data'
+        data_dir.mkdir()
+        (data_dir / 'config.yaml').write_text(
+            scenario_config(scenario, server.url, backend, data_dir / 'logs' / 'bench.log', logging_settings, patterns)
+        )
+        result_path = Path(workdir) / 'result.json'
+        env = dict(os.environ, PYTHONPATH=str(REPO_ROOT))
+        server.reset_counters()
+        subprocess.run(
+            [sys.executable, str(Path(script).resolve()), '--child', str(result_path)],
+            cwd=workdir, env=env, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        result = json.loads(result_path.read_text())
+        log_file = data_dir / 'logs' / 'bench.log'
+        result['log_lines'] = len(log_file.read_bytes().splitlines()) if log_file.exists() else 0
+    result.update(requests=server.requests, bytes=server.bytes_sent, errors=server.errors)
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='1000,10000,100000')
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS))
+    parser.add_argument('--backend', default='plexapi', choices=['plexapi', 'raw', 'async'])
+    parser.add_argument('--tba-ratio', type=float, default=0.01)
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--patterns', default=','.join(DEFAULT_PATTERNS))
+    parser.add_argument('--no-or-filter', action='store_true')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child)
+        return
+
+    from fake_plex_server import FakeLibrary, FakePlexServer
+    scenarios = [s for s in args.scenarios.split(',') if s]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    patterns = [p for p in args.patterns.split(',') if p]
+    print(
+        f"backend={args.backend} tba_ratio={args.tba_ratio} latency={args.latency_ms}ms error_rate={args.error_rate} "
+        f"patterns={len(patterns)} or_filter={not args.no_or_filter}"
+    )
+    print(f"{'items':>8s} {'scenario':8s} {'wall':>8s} {'requests':>9s} {'MiB recv':>9s} {'peak RSS':>9s} {'errors':>7s}")
+    for size in (int(s) for s in args.sizes.split(',') if s):
+        for scenario in scenarios:
+            # A fresh library per scenario, so refreshes in one run do not fix titles for the next
+            server = FakePlexServer(
+                FakeLibrary(size, args.tba_ratio), latency=args.latency_ms / 1000, error_rate=args.error_rate,
+                or_filter=not args.no_or_filter
+            ).start()
+            try:
+                result = run_scenario(server, scenario, args.backend, patterns=patterns)
+            finally:
+                server.stop()
+            print(
+                f"{size:8d} {scenario:8s} {result['wall']:7.2f}s {result['requests']:9d} "
+                f"{result['bytes'] / 1024 / 1024:9.2f} {result['peak_rss_kib'] / 1024:7.1f}MB {result['errors']:7d}"
+            )
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,425 @@
+#!/usr/bin/env python3
+"""Local stand-in for a Plex Media Server with synthetic movie and TV sections.
+
+Serves the endpoints PlexClient and the refresher use: server identity, section listings
+with title/updatedAt filters, sorting and paging, metadata by ratingKey, allLeaves, item
+refreshes, sessions and activities. It also serves the notification websocket, so event
+mode can be driven with notify(), and builds webhook payloads for its items. Latency and server errors can be injected, either at
+random or for the next few requests, and every response and connection is counted so
+benchmarks and tests can report requests, bytes and connection reuse.
+
+Usage: python benchmarks/fake_plex_server.py [item_count] [port] [tba_ratio] [latency_ms] [error_rate]
+"""
+import base64
+import hashlib
+import json
+import random
+import re
+import socket
+import struct
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import quoteattr
+
+MACHINE_IDENTIFIER = 'fakeplex0000000000000000000000000000000'
+MOVIE_SECTION = '1'
+SHOW_SECTION = '2'
+EPISODES_PER_SEASON = 10
+SEASONS_PER_SHOW = 3
+SHOW_KEY_BASE = 1_000_000
+SEASON_KEY_BASE = 2_000_000
+EPISODE_KEY_BASE = 10_000_000
+NOTIFICATIONS_PATH = '/:/websockets/notifications'
+WEBSOCKET_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+TIMELINE_TYPES = {'movie': 1, 'show': 2, 'season': 3, 'episode': 4}
+
+class FakeLibrary:
+    """Synthetic library: a fifth movies, the rest episodes, with about tba_ratio of titles TBA"""
+
+    def __init__(self, item_count: int, tba_ratio: float = 0.01, fix_ratio: float = 0.5, seed: int = 42):
+        rng = random.Random(seed)
+        self.fix_ratio = fix_ratio
+        self.rng = rng
+        self.items: Dict[str, Dict[str, str]] = {}
+        self.sections: Dict[str, List[Dict[str, str]]] = {MOVIE_SECTION: [], SHOW_SECTION: []}
+        self.shows: Dict[str, Dict[str, str]] = {}
+        self._lock = threading.Lock()
+
+        movie_count = item_count // 5
+        for idx in range(movie_count):
+            key = str(idx + 1)
+            self._add(MOVIE_SECTION, {
+                'ratingKey': key, 'key': f'/library/metadata/{key}', 'type': 'movie',
+                'title': 'TBA' if rng.random() < tba_ratio else f'Movie {idx}',
+                'year': str(1980 + idx % 45), 'guid': f'plex://movie/{key}',
+                'originallyAvailableAt': f'{1980 + idx % 45}-06-01',
+                'addedAt': str(1_600_000_000 + idx), 'updatedAt': str(1_600_000_000 + idx),
+                'librarySectionID': MOVIE_SECTION
+            }, [f'tmdb://{key}', f'imdb://tt{key}'])
+
+        per_show = EPISODES_PER_SEASON * SEASONS_PER_SHOW
+        for idx in range(item_count - movie_count):
+            show, within = divmod(idx, per_show)
+            season, episode = divmod(within, EPISODES_PER_SEASON)
+            show_key = str(SHOW_KEY_BASE + show)
+            if show_key not in self.shows:
+                self.shows[show_key] = {
+                    'ratingKey': show_key, 'key': f'/library/metadata/{show_key}/children', 'type': 'show',
+                    'title': f'Show {show}', 'guid': f'plex://show/{show_key}', 'librarySectionID': SHOW_SECTION
+                }
+            key = str(EPISODE_KEY_BASE + idx)
+            # Later seasons of later shows are the newest episodes
+            aired = time.strftime('%Y-%m-%d', time.gmtime(1_500_000_000 + idx * 3600))
+            self._add(SHOW_SECTION, {
+                'ratingKey': key, 'key': f'/library/metadata/{key}', 'type': 'episode',
+                'title': 'TBA' if rng.random() < tba_ratio else f'Episode {episode + 1}',
+                'grandparentTitle': f'Show {show}', 'grandparentRatingKey': show_key,
+                'grandparentKey': f'/library/metadata/{show_key}',
+                'parentRatingKey': str(SEASON_KEY_BASE + show * SEASONS_PER_SHOW + season),
+                'parentKey': f'/library/metadata/{SEASON_KEY_BASE + show * SEASONS_PER_SHOW + season}',
+                'parentIndex': str(season + 1), 'index': str(episode + 1),
+                'guid': f'plex://episode/{key}', 'originallyAvailableAt': aired,
+                'addedAt': str(1_600_000_000 + idx), 'updatedAt': str(1_600_000_000 + idx),
+                'librarySectionID': SHOW_SECTION
+            }, [f'tvdb://{key}'])
+
+    def _add(self, section: str, attrs: Dict[str, str], guids: List[str]):
+        attrs['_guids'] = guids
+        self.items[attrs['ratingKey']] = attrs
+        self.sections[section].append(attrs)
+
+    def refresh(self, rating_key: str) -> bool:
+        """Refresh an item, fixing a TBA title with probability fix_ratio"""
+        keys = [rating_key]
+        if rating_key in self.shows:
+            keys = [k for k, v in self.items.items() if v.get('grandparentRatingKey') == rating_key]
+        elif int(rating_key) >= SEASON_KEY_BASE and rating_key not in self.items:
+            keys = [k for k, v in self.items.items() if v.get('parentRatingKey') == rating_key]
+        found = False
+        with self._lock:
+            for key in keys:
+                item = self.items.get(key)
+                if item is None:
+                    continue
+                found = True
+                if item['title'] == 'TBA' and self.rng.random() < self.fix_ratio:
+                    item['title'] = f"Episode {item.get('index', key)}" if item['type'] == 'episode' else f'Movie {key}'
+                    item['updatedAt'] = str(int(time.time()))
+        return found
+
+def element(item: Dict[str, str], include_guids: bool = True) -> str:
+    attrs = ' '.join(f'{name}={quoteattr(value)}' for name, value in item.items() if not name.startswith('_'))
+    tag = 'Directory' if item['type'] in ('show', 'season') else 'Video'
+    guids = item.get('_guids') if include_guids else None
+    if not guids:
+        return f'<{tag} {attrs} />'
+    return f'<{tag} {attrs}>' + ''.join(f'<Guid id="{guid}" />' for guid in guids) + f'</{tag}>'
+
+def container(elements: List[str], **attrs) -> str:
+    head = ' '.join(f'{name}="{value}"' for name, value in attrs.items())
+    return f'<MediaContainer size="{len(elements)}" {head}>' + ''.join(elements) + '</MediaContainer>'
+
+def ws_frame(opcode: int, payload: bytes) -> bytes:
+    """An unmasked, unfragmented websocket frame as a server sends it"""
+    length = len(payload)
+    if length < 126:
+        head = struct.pack('!BB', 0x80 | opcode, length)
+    elif length < 65536:
+        head = struct.pack('!BBH', 0x80 | opcode, 126, length)
+    else:
+        head = struct.pack('!BBQ', 0x80 | opcode, 127, length)
+    return head + payload
+
+def read_ws_frame(rfile):
+    """Read one client frame; returns (opcode, payload), or (None, b'') once the connection is gone"""
+    head = rfile.read(2)
+    if len(head) < 2:
+        return None, b''
+    opcode, length = head[0] & 0x0F, head[1] & 0x7F
+    if length == 126:
+        length = struct.unpack('!H', rfile.read(2))[0]
+    elif length == 127:
+        length = struct.unpack('!Q', rfile.read(8))[0]
+    mask = rfile.read(4) if head[1] & 0x80 else b''
+    payload = rfile.read(length)
+    if mask:
+        payload = bytes(byte ^ mask[i % 4] for i, byte in enumerate(payload))
+    return opcode, payload
+
+class FakePlexServer:
+    """Threaded HTTP server around a FakeLibrary that counts requests and bytes sent"""
+
+    def __init__(self, library: FakeLibrary, port: int = 0, latency: float = 0.0, error_rate: float = 0.0,
+                 or_filter: bool = True):
+        self.library = library
+        self.latency = latency
+        self.error_rate = error_rate
+        # Without it, title filters that OR several values are rejected like on older servers
+        self.or_filter = or_filter
+        self.requests = 0
+        self.bytes_sent = 0
+        self.errors = 0
+        self.connections = 0
+        self.refreshed: List[str] = []
+        # Query parameters of every library listing, to check the filters clients send
+        self.listings: List[Dict[str, List[str]]] = []
+        self._faults: List = []
+        self._subscribers: List = []
+        self._lock = threading.Lock()
+        self._rng = random.Random(7)
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', port), _handler_for(self))
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._httpd.server_address[1]}"
+
+    def start(self) -> 'FakePlexServer':
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='fake-plex', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for connection, _, _ in subscribers:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    @property
+    def subscribers(self) -> int:
+        """Clients connected to the notification websocket"""
+        with self._lock:
+            return len(self._subscribers)
+
+    def _item(self, rating_key: str) -> Dict[str, str]:
+        return self.library.items.get(rating_key) or self.library.shows[rating_key]
+
+    def notify(self, rating_key: str, state: int = 5) -> int:
+        """Push a library timeline entry for an item to every websocket client.
+
+        State 5 means processing finished. Returns the number of clients reached.
+        """
+        item = self._item(rating_key)
+        message = {'NotificationContainer': {'type': 'timeline', 'size': 1, 'TimelineEntry': [{
+            'identifier': 'com.plexapp.plugins.library', 'sectionID': item['librarySectionID'],
+            'itemID': rating_key, 'type': TIMELINE_TYPES[item['type']], 'title': item['title'], 'state': state
+        }]}}
+        frame = ws_frame(0x1, json.dumps(message).encode('utf8'))
+        with self._lock:
+            subscribers = list(self._subscribers)
+        reached = 0
+        for _, wfile, lock in subscribers:
+            try:
+                with lock:
+                    wfile.write(frame)
+                reached += 1
+            except OSError:
+                pass
+        return reached
+
+    def webhook_payload(self, rating_key: str, event: str = 'library.new') -> Dict:
+        """The JSON Plex posts to a webhook when an item is added"""
+        item = self._item(rating_key)
+        return {
+            'event': event,
+            'Server': {'title': 'Fake Plex', 'uuid': MACHINE_IDENTIFIER},
+            'Metadata': {name: value for name, value in item.items() if not name.startswith('_')}
+        }
+
+    def reset_counters(self):
+        with self._lock:
+            self.requests = self.bytes_sent = self.errors = self.connections = 0
+            self.refreshed = []
+
+    def inject(self, *faults):
+        """Fail the next requests in order: an int answers with that HTTP status, a float stalls that many seconds"""
+        with self._lock:
+            self._faults.extend(faults)
+
+    def next_fault(self):
+        with self._lock:
+            return self._faults.pop(0) if self._faults else None
+
+    def _count(self, size: int, error: bool = False):
+        with self._lock:
+            self.requests += 1
+            self.bytes_sent += size
+            self.errors += error
+
+    def should_fail(self) -> bool:
+        with self._lock:
+            return self.error_rate > 0 and self._rng.random() < self.error_rate
+
+    def rejects(self, query: Dict[str, List[str]]) -> bool:
+        return not self.or_filter and ',' in query.get('title', [''])[0]
+
+    def handle(self, method: str, path: str, query: Dict[str, List[str]], headers) -> Optional[str]:
+        """Return the XML body for a request, or None for 404"""
+        library = self.library
+        if method == 'PUT':
+            match = re.fullmatch(r'/library/metadata/(\d+)/refresh', path)
+            if not match or not library.refresh(match.group(1)):
+                return None
+            with self._lock:
+                self.refreshed.append(match.group(1))
+            return ''
+        if path in ('/', '/identity'):
+            return container([], friendlyName='Fake Plex', machineIdentifier=MACHINE_IDENTIFIER,
+                             version='1.40.0.0000', platform='Linux')
+        if path == '/library':
+            return container([])
+        if path == '/library/sections':
+            return container([
+                f'<Directory key="{MOVIE_SECTION}" type="movie" title="Movies" agent="tv.plex.agents.movie" uuid="m1" />',
+                f'<Directory key="{SHOW_SECTION}" type="show" title="TV Shows" agent="tv.plex.agents.series" uuid="s1" />'
+            ])
+        if path in ('/status/sessions', '/activities'):
+            return container([])
+
+        match = re.fullmatch(r'/library/sections/(\d+)/(all|search)', path)
+        if match:
+            return self._listing(match.group(1), query, headers)
+        match = re.fullmatch(r'/library/metadata/(\d+)/allLeaves', path)
+        if match:
+            key = match.group(1)
+            return container([element(i) for i in library.sections[SHOW_SECTION]
+                              if key in (i['grandparentRatingKey'], i['parentRatingKey'])])
+        match = re.fullmatch(r'/library/metadata/([\d,]+)', path)
+        if match:
+            found = [library.items.get(k) or library.shows.get(k) for k in match.group(1).split(',')]
+            return container([element(i) for i in found if i is not None])
+        return None
+
+    def _listing(self, section: str, query: Dict[str, List[str]], headers) -> Optional[str]:
+        items = self.library.sections.get(section)
+        if items is None:
+            return None
+        with self._lock:
+            self.listings.append(query)
+        if query.get('type', [''])[0] in ('2', '3'):
+            items = []
+        if 'title' in query:
+            # Plex title filters match substrings; commas OR the values together
+            values = [v.lower() for v in query['title'][0].split(',')]
+            items = [i for i in items if any(v in i['title'].lower() for v in values)]
+        for name, value in query.items():
+            if name.endswith('>>') or name.endswith('>'):
+                field = name.rstrip('>')
+                items = [i for i in items if int(i.get(field, 0)) > int(value[0])]
+        sort = query.get('sort', [''])[0]
+        if sort:
+            field, _, direction = sort.partition(':')
+            items = sorted(items, key=lambda i: i.get(field, ''), reverse=direction == 'desc')
+        start = int(headers.get('X-Plex-Container-Start') or query.get('X-Plex-Container-Start', ['0'])[0])
+        size = int(headers.get('X-Plex-Container-Size') or query.get('X-Plex-Container-Size', [str(len(items))])[0])
+        page = items[start:start + size]
+        include_guids = query.get('includeGuids', ['0'])[0] == '1'
+        return container([element(i, include_guids) for i in page], totalSize=len(items), offset=start)
+
+def _handler_for(server: FakePlexServer):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, *args):
+            pass
+
+        def setup(self):
+            super().setup()
+            with server._lock:
+                server.connections += 1
+
+        def _respond(self, method: str):
+            if server.latency:
+                time.sleep(server.latency)
+            fault = server.next_fault()
+            if isinstance(fault, float):
+                time.sleep(fault)
+            url = urlparse(self.path)
+            query = parse_qs(url.query)
+            if isinstance(fault, int):
+                status, body = fault, container([])
+            elif server.should_fail():
+                status, body = 500, container([])
+            elif server.rejects(query):
+                status, body = 400, container([])
+            else:
+                body = server.handle(method, url.path, query, self.headers)
+                status = 200 if body is not None else 404
+                body = body if body is not None else container([])
+            payload = body.encode('utf8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'text/xml;charset=utf-8')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+            server._count(len(payload), status >= 500)
+
+        def _notifications(self):
+            """Upgrade to a websocket that receives notify() messages and answers pings"""
+            key = self.headers.get('Sec-WebSocket-Key', '')
+            accept = base64.b64encode(hashlib.sha1((key + WEBSOCKET_GUID).encode()).digest()).decode()
+            self.send_response(101, 'Switching Protocols')
+            self.send_header('Upgrade', 'websocket')
+            self.send_header('Connection', 'Upgrade')
+            self.send_header('Sec-WebSocket-Accept', accept)
+            self.end_headers()
+            subscriber = (self.connection, self.wfile, threading.Lock())
+            with server._lock:
+                server._subscribers.append(subscriber)
+            try:
+                while True:
+                    opcode, payload = read_ws_frame(self.rfile)
+                    if opcode is None:
+                        break
+                    if opcode == 0x9:
+                        with subscriber[2]:
+                            self.wfile.write(ws_frame(0xA, payload))
+                    elif opcode == 0x8:
+                        with subscriber[2]:
+                            self.wfile.write(ws_frame(0x8, payload[:2]))
+                        break
+            except OSError:
+                pass
+            finally:
+                with server._lock:
+                    server._subscribers.remove(subscriber)
+                self.close_connection = True
+
+        def do_GET(self):
+            if self.path.split('?')[0] == NOTIFICATIONS_PATH and self.headers.get('Upgrade', '').lower() == 'websocket':
+                self._notifications()
+                return
+            self._respond('GET')
+
+        def do_PUT(self):
+            self._respond('PUT')
+
+    return Handler
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else 32400
+    tba_ratio = float(sys.argv[3]) if len(sys.argv) > 3 else 0.01
+    latency = float(sys.argv[4]) / 1000 if len(sys.argv) > 4 else 0.0
+    error_rate = float(sys.argv[5]) if len(sys.argv) > 5 else 0.0
+    server = FakePlexServer(FakeLibrary(count, tba_ratio), port, latency, error_rate).start()
+    print(f"Fake Plex server with {count} items at {server.url} (any token of 20+ characters)")
+    try:
+        while True:
+            time.sleep(60)
+            print(f"{server.requests} requests, {server.bytes_sent / 1024 / 1024:.1f} MiB sent, {server.errors} errors")
+    except KeyboardInterrupt:
+        server.stop()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Benchmark of deep-scan throughput with each logging mode, against the local fake Plex server.
+
+Every mode runs the same dry-run deep scan in a fresh child process (see e2e_benchmark.py);
+a high TBA ratio makes per-item match lines the dominant logging cost. Modes:
+
+  off      level WARNING, so per-item lines are discarded
+  sync     file and console handlers on the scanning thread (the default)
+  queue    logging.queue: handlers run on a background listener thread
+  limited  queue plus logging.item_lines_per_second
+  loki     queue plus batched Loki pushes to a local sink that counts received lines
+
+Usage: python benchmarks/logging_benchmark.py [--items 100000] [--tba-ratio 0.2]
+                                              [--modes off,sync,queue,limited,loki] [--backend raw]
+"""
+import argparse
+import json
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from e2e_benchmark import run_child, run_scenario  # noqa: E402
+
+MODES = ('off', 'sync', 'queue', 'limited', 'loki')
+
+def mode_settings(mode: str, loki_url: str) -> str:
+    if mode == 'off':
+        return 'level: "WARNING"\n'
+    settings = 'level: "INFO"\n'
+    if mode in ('queue', 'limited', 'loki'):
+        settings += 'queue: true\n'
+    if mode == 'limited':
+        settings += 'item_lines_per_second: 20\n'
+    if mode == 'loki':
+        settings += f'loki_url: "{loki_url}"\nloki_batch_size: 1000\n'
+    return settings
+
+class LokiSink:
+    """Accepts Loki pushes and counts requests and log lines"""
+
+    def __init__(self):
+        self.pushes = 0
+        self.lines = 0
+        sink = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                sink.pushes += 1
+                sink.lines += sum(len(stream['values']) for stream in body['streams'])
+                self.send_response(204)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        threading.Thread(target=self._httpd.serve_forever, name='loki-sink', daemon=True).start()
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._httpd.server_address[1]}/loki/api/v1/push"
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--items', type=int, default=100_000)
+    parser.add_argument('--tba-ratio', type=float, default=0.2)
+    parser.add_argument('--modes', default=','.join(MODES))
+    parser.add_argument('--backend', default='raw', choices=['plexapi', 'raw', 'async'])
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child)
+        return
+
+    from fake_plex_server import FakeLibrary, FakePlexServer
+    modes = [m for m in args.modes.split(',') if m]
+    unknown = set(modes) - set(MODES)
+    if unknown:
+        parser.error(f"unknown modes: {', '.join(sorted(unknown))}")
+
+    server = FakePlexServer(FakeLibrary(args.items, args.tba_ratio)).start()
+    sink = LokiSink()
+    print(f"items={args.items} tba_ratio={args.tba_ratio} backend={args.backend}")
+    print(f"{'mode':8s} {'wall':>8s} {'items/s':>9s} {'log lines':>10s} {'loki pushes':>12s}")
+    try:
+        for mode in modes:
+            sink.pushes = sink.lines = 0
+            result = run_scenario(server, 'deep', args.backend, mode_settings(mode, sink.url), script=__file__)
+            lines = result['log_lines'] if mode != 'loki' else sink.lines
+            print(
+                f"{mode:8s} {result['wall']:7.2f}s {args.items / result['wall']:9.0f} {lines:10d} "
+                f"{sink.pushes if mode == 'loki' else '-':>12}"
+            )
+    finally:
+        sink.stop()
+        server.stop()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Compare the plexapi and raw streaming scanners on a deep scan of the local fake Plex server.
+
+Each path lists every episode of the fake TV section with the real SectionScanner or
+RawSectionScanner in a fresh child process (see e2e_benchmark.py), matches the titles and
+reports wall and CPU time, the child's peak RSS and the bytes received.
+
+Usage: python benchmarks/raw_scan_benchmark.py [--items 20000] [--page-size 1000] [--paths plexapi,raw]
+"""
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from e2e_benchmark import peak_rss_kib  # noqa: E402
+
+PATHS = ('plexapi', 'raw')
+PATTERNS = ['TBA', 'TBD']
+TOKEN = 'benchmark-token-0123456789'
+
+def run_child(path: str, url: str, page_size: int, result_path: str):
+    """Scan the TV section once with the given path and write the timings as JSON"""
+    from plex_refresher.core.plex_client import PlexClient
+    from plex_refresher.core.raw_scanner import RawSectionScanner
+    from plex_refresher.core.section_scanner import ScanStats, SectionScanner
+    from plex_refresher.utils.title_matcher import TitleMatcher
+
+    logger = logging.getLogger('raw_scan_benchmark')
+    client = PlexClient(url, TOKEN, logger, connect_retries=1)
+    plex = client.connect()
+    library = client.section('TV Shows')
+    matcher = TitleMatcher(PATTERNS)
+    if path == 'raw':
+        scanner = RawSectionScanner(client, plex, page_size, logger)
+    else:
+        scanner = SectionScanner(plex, page_size, logger)
+    stats = ScanStats(library.title)
+
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    matches = 0
+    for item in scanner.iter_items(library, 'episode', stats):
+        title = item.title
+        show = item.grandparent_title if path == 'raw' else item.grandparentTitle
+        if matcher.match(title, show):
+            matches += 1
+    Path(result_path).write_text(json.dumps({
+        'wall': time.perf_counter() - started,
+        'cpu': time.process_time() - cpu_started,
+        'items': stats.items,
+        'matches': matches,
+        'peak_rss_kib': peak_rss_kib()
+    }))
+
+def run_path(server, path: str, page_size: int) -> dict:
+    with tempfile.TemporaryDirectory(prefix='plex-bench-') as workdir:
+        result_path = Path(workdir) / 'result.json'
+        env = dict(os.environ, PYTHONPATH=str(REPO_ROOT))
+        server.reset_counters()
+        subprocess.run(
+            [sys.executable, str(Path(__file__).resolve()), '--child', path, server.url, str(page_size),
+             str(result_path)],
+            cwd=workdir, env=env, check=True
+        )
+        result = json.loads(result_path.read_text())
+    result.update(requests=server.requests, bytes=server.bytes_sent)
+    return result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--items', type=int, default=20_000)
+    parser.add_argument('--page-size', type=int, default=1000)
+    parser.add_argument('--tba-ratio', type=float, default=0.01)
+    parser.add_argument('--paths', default=','.join(PATHS))
+    parser.add_argument('--child', nargs=4, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        path, url, page_size, result_path = args.child
+        run_child(path, url, int(page_size), result_path)
+        return
+
+    from fake_plex_server import FakeLibrary, FakePlexServer
+    paths = [p for p in args.paths.split(',') if p]
+    unknown = set(paths) - set(PATHS)
+    if unknown:
+        parser.error(f"unknown paths: {', '.join(sorted(unknown))}")
+
+    server = FakePlexServer(FakeLibrary(args.items, args.tba_ratio)).start()
+    print(f"items={args.items} page_size={args.page_size} tba_ratio={args.tba_ratio}")
+    print(f"{'path':8s} {'episodes':>9s} {'matches':>8s} {'wall':>8s} {'cpu':>8s} {'MiB recv':>9s} {'peak RSS':>9s}")
+    try:
+        for path in paths:
+            result = run_path(server, path, args.page_size)
+            print(
+                f"{path:8s} {result['items']:9d} {result['matches']:8d} {result['wall']:7.2f}s {result['cpu']:7.2f}s "
+                f"{result['bytes'] / 1024 / 1024:9.2f} {result['peak_rss_kib'] / 1024:7.1f}MB"
+            )
+    finally:
+        server.stop()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Benchmark of main.py start-up: time to the first Plex request, total wall time and peak RSS.
+
+Runs main.py as a child process against the local fake Plex server, once per repeat, and
+reports medians. The arguments are passed to main.py unchanged, so the same benchmark covers
+the service's dry run (no arguments) and the CLI subcommands.
+
+Usage: python benchmarks/startup_benchmark.py [--items 1000] [--repeat 5] [--main path/to/main.py]
+                                              [--args "scan --library Movies --json"]
+"""
+import argparse
+import os
+import shlex
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fake_plex_server import FakeLibrary, FakePlexServer  # noqa: E402
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+CONFIG = """
+plex:
+  url: "{url}"
+  token: "benchmark-token-0123456789"
+search:
+  method: "deep"
+  backend: "raw"
+  patterns: ["TBA", "TBD"]
+refresh:
+  interval_seconds: 3600
+  delay_between_items: 1
+  dry_run: true
+logging:
+  level: "INFO"
+  format: "%(asctime)s - %(levelname)s - %(message)s"
+  file: "{log_file}"
+  max_size_mb: 10
+  backup_count: 0
+"""
+
+class TimedPlexServer(FakePlexServer):
+    """Fake server that remembers when the first request of a run arrived"""
+
+    def reset_counters(self):
+        super().reset_counters()
+        self.first_request = None
+
+    def _count(self, size: int, error: bool = False):
+        if self.first_request is None:
+            self.first_request = time.perf_counter()
+        super()._count(size, error)
+
+def run_once(server: TimedPlexServer, main_path: Path, args: list) -> dict:
+    with tempfile.TemporaryDirectory(prefix='plex-startup-') as workdir:
+        data_dir = Path(workdir) / 'data'
+        data_dir.mkdir()
+        (data_dir / 'config.yaml').write_text(CONFIG.format(url=server.url, log_file=data_dir / 'logs' / 'startup.log'))
+        env = dict(os.environ, PYTHONPATH=str(main_path.parent))
+        server.reset_counters()
+        started = time.perf_counter()
+        child = subprocess.Popen(
+            [sys.executable, str(main_path), *args],
+            cwd=workdir, env=env, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+        )
+        output = child.stdout.read()
+        # wait4 reports the child's own peak RSS rather than the largest of all children
+        _, status, usage = os.wait4(child.pid, 0)
+        wall = time.perf_counter() - started
+        child.returncode = os.waitstatus_to_exitcode(status)
+    return {
+        'first_request': (server.first_request or started) - started,
+        'wall': wall,
+        'peak_rss_kib': usage.ru_maxrss,
+        'requests': server.requests,
+        'stdout_lines': len(output.splitlines()),
+        'exit': child.returncode
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--items', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--main', default=str(REPO_ROOT / 'main.py'), help='main.py to run, e.g. from another checkout')
+    parser.add_argument('--args', default='', help='Arguments for main.py')
+    args = parser.parse_args()
+
+    main_path = Path(args.main).resolve()
+    main_args = shlex.split(args.args)
+    server = TimedPlexServer(FakeLibrary(args.items, 0.01)).start()
+    try:
+        runs = [run_once(server, main_path, main_args) for _ in range(args.repeat)]
+    finally:
+        server.stop()
+
+    def median(key: str) -> float:
+        return statistics.median(run[key] for run in runs)
+
+    print(f"main={main_path} args={args.args!r} items={args.items} repeat={args.repeat}")
+    print(f"first request  {median('first_request') * 1000:8.0f} ms")
+    print(f"wall           {median('wall') * 1000:8.0f} ms")
+    print(f"peak RSS       {median('peak_rss_kib') / 1024:8.1f} MB")
+    print(f"requests       {median('requests'):8.0f}")
+    print(f"stdout lines   {median('stdout_lines'):8.0f}")
+    print(f"exit codes     {sorted({run['exit'] for run in runs})}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""Measure bytes retained per match by plexapi-backed records versus compact TBAItem records.
+
+Usage: python benchmarks/tba_item_memory_benchmark.py [match_count]
+"""
+import gc
+import sys
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Optional
+from xml.etree import ElementTree
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from plexapi.video import Episode  # noqa: E402
+from plex_refresher.core.raw_scanner import RawItem  # noqa: E402
+from plex_refresher.models.tba_item import TBAItem  # noqa: E402
+
+@dataclass
+class PlexBackedItem:
+    """Layout of TBAItem before it became compact: a plain dataclass pinning the plexapi object"""
+    title: str
+    type: str
+    item: Any
+    year: Optional[str] = None
+    show: Optional[str] = None
+    season: Optional[int] = None
+    episode: Optional[int] = None
+    parent_rating_key: Optional[str] = None
+    grandparent_rating_key: Optional[str] = None
+
+def episode_xml(idx: int) -> str:
+    return (
+        f'<Video ratingKey="{idx}" key="/library/metadata/{idx}" type="episode" title="TBA" '
+        f'grandparentTitle="Show {idx // 100}" grandparentRatingKey="{idx // 100}" '
+        f'parentRatingKey="{idx // 10}" parentIndex="{idx // 10 % 10 + 1}" index="{idx % 10 + 1}" year="2024" '
+        f'summary="A long synthetic summary that plexapi parses but the refresher never reads." '
+        f'addedAt="1700000000" updatedAt="1700000000" duration="2700000">'
+        f'<Media id="{idx}" duration="2700000" videoCodec="h264"><Part id="{idx}" file="/tv/{idx}.mkv" /></Media>'
+        f'</Video>'
+    )
+
+def plexapi_records(count: int):
+    records = []
+    for idx in range(count):
+        episode = Episode(None, ElementTree.fromstring(episode_xml(idx)), '/library/sections/1/all')
+        records.append(PlexBackedItem(
+            title=episode.title, type='episode', item=episode, show=episode.grandparentTitle,
+            season=episode.seasonNumber, episode=episode.episodeNumber,
+            parent_rating_key=str(episode.parentRatingKey),
+            grandparent_rating_key=str(episode.grandparentRatingKey)
+        ))
+    return records
+
+def compact_records(count: int):
+    return [
+        TBAItem.from_raw(RawItem.from_attrib(ElementTree.fromstring(episode_xml(idx)).attrib))
+        for idx in range(count)
+    ]
+
+def measure(name: str, build, count: int) -> float:
+    gc.collect()
+    tracemalloc.start()
+    records = build(count)
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    per_item = retained / len(records)
+    print(f"{name:8s} items={len(records):7d} retained={retained / 1024 / 1024:8.1f} MiB  {per_item:8.0f} bytes/item")
+    return per_item
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    before = measure('plexapi', plexapi_records, count)
+    after = measure('compact', compact_records, count)
+    print(f"Compact records use {before / after:.1f}x less memory per match")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Compare the per-title substring loop with the compiled TitleMatcher on synthetic titles.
+
+Usage: python benchmarks/title_matcher_benchmark.py [title_count]
+"""
+import random
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+from plex_refresher.utils.title_matcher import TitleMatcher  # noqa: E402
+
+PATTERNS = ['TBA', 'TBD', 'To Be Announced', 'Untitled', 'Episode TBA']
+WORDS = ['The', 'Return', 'Night', 'Tbaytown', 'Secrets', 'of', 'a', 'Lost', 'City', 'Part', 'One', 'Finale']
+
+def build_titles(count: int, tba_every: int = 200):
+    rng = random.Random(42)
+    titles = []
+    for idx in range(count):
+        if idx % tba_every == 0:
+            titles.append(rng.choice(PATTERNS))
+        else:
+            titles.append(' '.join(rng.choice(WORDS) for _ in range(rng.randint(2, 6))))
+    return titles
+
+def substring_loop(titles):
+    """The matching the refresher used before: patterns upper-cased again for every title"""
+    matches = 0
+    for title in titles:
+        patterns_to_check = [p.upper() for p in PATTERNS]
+        if any(pattern in title.upper() for pattern in patterns_to_check):
+            matches += 1
+    return matches
+
+def compiled_matcher(titles):
+    matcher = TitleMatcher(PATTERNS)
+    return sum(1 for title in titles if matcher.match(title))
+
+def compiled_substring(titles):
+    """Same semantics as the old loop, so "Tbaytown" still counts as a match"""
+    matcher = TitleMatcher(PATTERNS, word_boundary=False)
+    return sum(1 for title in titles if matcher.match(title))
+
+def measure(name: str, func, titles):
+    started = time.perf_counter()
+    matches = func(titles)
+    elapsed = time.perf_counter() - started
+    print(f"{name:10s} matches={matches:7d} {elapsed:6.2f}s {len(titles) / elapsed / 1e6:6.2f}M titles/s")
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    titles = build_titles(count)
+    print(f"{count} synthetic titles, {len(PATTERNS)} patterns")
+    measure('substring', substring_loop, titles)
+    measure('compiled', compiled_substring, titles)
+    measure('words', compiled_matcher, titles)
+
+if __name__ == '__main__':
+    main()
@@ -1,18 +1,122 @@
 #!/usr/bin/env python3
+"""Find Plex items with placeholder titles (TBA, TBD, ...) and refresh their metadata.
+
+Without a command, runs the service as configured in data/config.yaml. The commands run a
+single pass and exit:
+
+  scan     list matching items without refreshing or writing anything
+  refresh  scan and refresh the matching items
+  recheck  re-check the items pending in the TBA index, without listing libraries
+"""
+import argparse
 import sys
 import logging
-from plex_refresher.core.refresher import PlexMetadataRefresher
-from plex_refresher.exceptions.config_errors import ConfigurationError
+import time
+from pathlib import Path
+
+# plex_refresher (plexapi, requests, aiohttp) is imported only once a command runs, so --help
+# and argument errors return immediately
+
+COMMANDS = {
+    'scan': 'List matching items without refreshing them or writing any state',
+    'refresh': 'Scan and refresh matching items once',
+    'recheck': 'Re-check items pending in the TBA index without scanning libraries'
+}
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--config', type=Path, help='Config file (default: data/config.yaml)')
+    parser.add_argument('--once', action='store_true',
+                        help='Run the configured service for a single cycle, then exit')
+    commands = parser.add_subparsers(dest='command', metavar='command')
+    for name, help_text in COMMANDS.items():
+        command = commands.add_parser(name, help=help_text, description=help_text)
+        command.add_argument('--server', action='append', metavar='NAME',
+                             help='Only this server (by name); repeatable')
+        command.add_argument('--library', action='append', metavar='TITLE',
+                             help='Only this library (by title); repeatable')
+        if name == 'recheck':
+            command.set_defaults(rating_keys=None)
+        else:
+            command.add_argument('--rating-key', action='append', dest='rating_keys', metavar='KEY',
+                                 help='Only this item on the --server given; shows and seasons cover '
+                                      'their episodes; repeatable')
+        command.add_argument('--json', action='store_true',
+                             help='Stream matches and refresh results to stdout as JSON Lines')
+        command.add_argument('--log-level', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                             help='Log level for stderr (default: WARNING with --json, else INFO)')
+    args = parser.parse_args(argv)
+    # ratingKeys are local to a server, so the same key names a different item on another one
+    if args.command and args.rating_keys and len(args.server or []) != 1:
+        commands.choices[args.command].error('--rating-key needs exactly one --server')
+    return args
+
+def command_config(args: argparse.Namespace):
+    """The validated config with the overrides a one-shot command runs with"""
+    from plex_refresher.utils.config_loader import ConfigLoader
+    from plex_refresher.exceptions.config_errors import ConfigurationError
+    config = ConfigLoader.load_and_validate(args.config)
+    config['refresh']['dry_run'] = args.command != 'refresh'
+    # One-shot runs scan all of what they were asked to, now, and leave the service's schedule,
+    # checkpoint, watermarks and cycle report alone; scan also keeps the TBA index in memory
+    config['refresh']['adaptive_schedule'] = False
+    config['refresh']['incremental'] = False
+    config['checkpoint']['enabled'] = False
+    config['metrics']['cycle_report'] = False
+    config['reload']['enabled'] = False
+    config['logging']['level'] = args.log_level or ('WARNING' if args.json else 'INFO')
+    if args.server:
+        servers = [server for server in config['plex']['servers'] if server['name'] in args.server]
+        if not servers:
+            raise ConfigurationError(f"No configured server named {', '.join(args.server)}")
+        config['plex']['servers'] = servers
+    return config
+
+def run_command(args: argparse.Namespace):
+    from plex_refresher.core.refresher import PlexMetadataRefresher
+    from plex_refresher.utils.json_lines import JsonLinesWriter
+    started = time.monotonic()
+    refresher = PlexMetadataRefresher(command_config(args), log_file=False, read_only=args.command == 'scan')
+    if args.library:
+        refresher.library_filter = set(args.library)
+    writer = None
+    if args.json:
+        writer = JsonLinesWriter()
+        refresher.on_match = writer.match
+        refresher.on_refresh = writer.refresh
+    try:
+        if args.rating_keys:
+            refresher.check_rating_keys(args.rating_keys)
+        elif args.command == 'recheck':
+            refresher.recheck_pending()
+        else:
+            refresher.refresh_metadata()
+    finally:
+        refresher.close()
+    if writer:
+        writer.write({
+            'event': 'done',
+            'command': args.command,
+            'records': writer.records,
+            'seconds': round(time.monotonic() - started, 3)
+        })
 
 def main():
+    args = parse_args()
+    from plex_refresher.exceptions.config_errors import ConfigurationError
     try:
+        if args.command:
+            run_command(args)
+            return
+
         # Add basic logging until our full logging is set up
         logging.basicConfig(level=logging.INFO)
         logging.info("Starting Plex Metadata Refresher")
-        
-        refresher = PlexMetadataRefresher()
-        refresher.run()  # Changed from run_forever to run
-        
+
+        from plex_refresher.core.refresher import PlexMetadataRefresher
+        refresher = PlexMetadataRefresher(config_path=args.config)
+        refresher.run(once=args.once)  # Changed from run_forever to run
+
     except ConfigurationError as e:
         print(f"Configuration Error: {str(e)}", file=sys.stderr)
         sys.exit(1)
@@ -24,4 +128,4 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
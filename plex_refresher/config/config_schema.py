@@ -3,9 +3,25 @@ CONFIG_SCHEMA = {
         'required': True,
         'type': dict,
         'fields': {
-            'url': {'type': str, 'required': True},
-            'token': {'type': str, 'required': True},
-            'libraries': {'type': (list, type(None)), 'required': False}
+            'url': {'type': str, 'required': False},
+            'token': {'type': str, 'required': False},
+            'libraries': {'type': (list, type(None)), 'required': False},
+            'max_connections': {'type': int, 'required': False, 'default': 16, 'min': 1, 'max': 256},  # Per server, async backend
+            'timeout': {'type': int, 'required': False, 'default': 30, 'min': 1},
+            'connect_retries': {'type': int, 'required': False, 'default': 3, 'min': 1, 'max': 10},
+            'connect_retry_delay_seconds': {'type': (int, float), 'required': False, 'default': 5, 'min': 0},  # Doubles per attempt
+            'reconnect_max_delay_seconds': {'type': int, 'required': False, 'default': 900, 'min': 1},  # Circuit breaker cap
+            'section_cache_ttl_seconds': {'type': int, 'required': False, 'default': 300, 'min': 0},
+            'servers': {
+                'type': (list, type(None)),
+                'required': False,
+                'item_fields': {
+                    'name': {'type': str, 'required': False},
+                    'url': {'type': str, 'required': True},
+                    'token': {'type': str, 'required': True},
+                    'libraries': {'type': (list, type(None)), 'required': False}
+                }
+            }
         }
     },
     'search': {
@@ -13,10 +29,17 @@ CONFIG_SCHEMA = {
         'type': dict,
         'fields': {
             'method': {'type': str, 'required': True, 'values': ['quick', 'deep'], 'default': 'quick'},
+            'backend': {'type': str, 'required': False, 'values': ['plexapi', 'raw', 'async'], 'default': 'plexapi'},
             'patterns': {'type': list, 'required': True},
+            'exclude_patterns': {'type': (list, type(None)), 'required': False, 'default': None},
             'case_sensitive': {'type': bool, 'required': False, 'default': False},
+            'word_boundary': {'type': bool, 'required': False, 'default': False},  # Match literals as whole words only
             'include_full_title': {'type': bool, 'required': False, 'default': False},
-            'episode_scan_limit': {'type': (int, type(None)), 'required': False, 'default': None}  # Allow None or int
+            'episode_scan_limit': {'type': (int, type(None)), 'required': False, 'default': None},  # Allow None or int
+            'max_parallel_scans': {'type': int, 'required': False, 'default': 4, 'min': 1, 'max': 32},
+            'max_scans_per_server': {'type': int, 'required': False, 'default': 2, 'min': 1, 'max': 16},
+            'page_size': {'type': int, 'required': False, 'default': 1000, 'min': 50, 'max': 10000},  # Items per deep scan request
+            'match_queue_size': {'type': int, 'required': False, 'default': 8, 'min': 1, 'max': 1000}  # Batches of 100 matches
         }
     },
     'refresh': {
@@ -25,7 +48,80 @@ CONFIG_SCHEMA = {
         'fields': {
             'interval_seconds': {'type': int, 'required': True, 'min': 60},
             'delay_between_items': {'type': int, 'required': True, 'min': 1, 'max': 30},
-            'dry_run': {'type': bool, 'required': False, 'default': True}
+            'dry_run': {'type': bool, 'required': False, 'default': True},
+            'requests_per_second': {'type': (int, float, type(None)), 'required': False, 'default': None, 'min': 0.01},  # None: 1 / delay_between_items
+            'max_in_flight': {'type': int, 'required': False, 'default': 2, 'min': 1, 'max': 32},
+            'max_retries': {'type': int, 'required': False, 'default': 2, 'min': 0, 'max': 10},
+            'max_queued': {'type': int, 'required': False, 'default': 100, 'min': 1},  # Refreshes waiting on the rate limit
+            'backoff_base_seconds': {'type': int, 'required': False, 'default': 3600, 'min': 60},
+            'backoff_max_seconds': {'type': int, 'required': False, 'default': 604800, 'min': 60},
+            'backoff_jitter': {'type': (int, float), 'required': False, 'default': 0.1, 'min': 0, 'max': 1},
+            'season_refresh_threshold': {'type': int, 'required': False, 'default': 5, 'min': 0},  # 0 disables
+            'show_refresh_threshold': {'type': int, 'required': False, 'default': 0, 'min': 0},  # 0 disables
+            'verify_delay_seconds': {'type': int, 'required': False, 'default': 15, 'min': 0, 'max': 600},
+            'incremental': {'type': bool, 'required': False, 'default': False},  # Deep search only
+            'full_scan_interval_seconds': {'type': int, 'required': False, 'default': 86400, 'min': 0},
+            'adaptive_schedule': {'type': bool, 'required': False, 'default': False},  # Per-library scan intervals
+            'max_library_interval_seconds': {'type': int, 'required': False, 'default': 604800, 'min': 60},
+            'scan_cost_target_seconds': {'type': (int, float), 'required': False, 'default': 60, 'min': 0},  # 0 ignores scan cost
+            'recent_air_days': {'type': int, 'required': False, 'default': 30, 'min': 0}
+        }
+    },
+    'events': {
+        'required': False,
+        'type': dict,
+        'fields': {
+            'enabled': {'type': bool, 'required': False, 'default': False},  # Continuous mode only
+            'websocket': {'type': bool, 'required': False, 'default': True},
+            'webhook_host': {'type': str, 'required': False, 'default': '0.0.0.0'},
+            'webhook_port': {'type': (int, type(None)), 'required': False, 'default': None, 'min': 1, 'max': 65535},
+            'debounce_seconds': {'type': int, 'required': False, 'default': 10, 'min': 0, 'max': 600},
+            'sweep_interval_seconds': {'type': int, 'required': False, 'default': 21600, 'min': 300}
+        }
+    },
+    'throttle': {
+        'required': False,
+        'type': dict,
+        'fields': {
+            'enabled': {'type': bool, 'required': False, 'default': False},
+            'poll_interval_seconds': {'type': int, 'required': False, 'default': 30, 'min': 5},
+            'reduce_at_sessions': {'type': int, 'required': False, 'default': 2, 'min': 0},  # 0 disables
+            'reduce_at_transcodes': {'type': int, 'required': False, 'default': 1, 'min': 0},
+            'pause_at_sessions': {'type': int, 'required': False, 'default': 0, 'min': 0},
+            'pause_at_transcodes': {'type': int, 'required': False, 'default': 3, 'min': 0},
+            'pause_at_activities': {'type': int, 'required': False, 'default': 1, 'min': 0},
+            'activity_types': {'type': list, 'required': False, 'default': ['library.update.section', 'media.generate']},  # Prefixes
+            'reduced_factor': {'type': (int, float), 'required': False, 'default': 0.5, 'min': 0.05, 'max': 1},
+            'reduced_page_delay_seconds': {'type': (int, float), 'required': False, 'default': 2, 'min': 0},
+            'max_pause_seconds': {'type': int, 'required': False, 'default': 1800, 'min': 0}
+        }
+    },
+    'metrics': {
+        'required': False,
+        'type': dict,
+        'fields': {
+            'enabled': {'type': bool, 'required': False, 'default': False},  # Prometheus endpoint at /metrics
+            'host': {'type': str, 'required': False, 'default': '0.0.0.0'},
+            'port': {'type': int, 'required': False, 'default': 9464, 'min': 1, 'max': 65535},
+            'cycle_report': {'type': bool, 'required': False, 'default': False}  # data/reports/cycle_report.json
+        }
+    },
+    'reload': {
+        'required': False,
+        'type': dict,
+        'fields': {
+            'enabled': {'type': bool, 'required': False, 'default': False},  # Apply config.yaml edits between cycles
+            'poll_interval_seconds': {'type': int, 'required': False, 'default': 10, 'min': 1},
+            'cache_titles': {'type': bool, 'required': False, 'default': True}  # Re-match listed titles on pattern changes
+        }
+    },
+    'checkpoint': {
+        'required': False,
+        'type': dict,
+        'fields': {
+            'enabled': {'type': bool, 'required': False, 'default': False},  # data/state/checkpoint.json
+            'max_age_seconds': {'type': int, 'required': False, 'default': 21600, 'min': 0},  # Older checkpoints start over
+            'save_interval_seconds': {'type': (int, float), 'required': False, 'default': 5, 'min': 0}
         }
     },
     'logging': {
@@ -36,7 +132,15 @@ CONFIG_SCHEMA = {
             'format': {'type': str, 'required': True},
             'file': {'type': str, 'required': True},
             'max_size_mb': {'type': int, 'required': True, 'min': 1},
-            'backup_count': {'type': int, 'required': True, 'min': 0}
+            'backup_count': {'type': int, 'required': True, 'min': 0},
+            'queue': {'type': bool, 'required': False, 'default': False},  # Write logs from a background thread
+            'item_lines_per_second': {'type': (int, float), 'required': False, 'default': 0, 'min': 0},  # 0 = unlimited
+            'loki_url': {'type': (str, type(None)), 'required': False, 'default': None},  # .../loki/api/v1/push
+            'loki_labels': {'type': (dict, type(None)), 'required': False, 'default': None},
+            'loki_username': {'type': (str, type(None)), 'required': False, 'default': None},
+            'loki_password': {'type': (str, type(None)), 'required': False, 'default': None},
+            'loki_batch_size': {'type': int, 'required': False, 'default': 500, 'min': 1, 'max': 10000},
+            'loki_flush_interval_seconds': {'type': (int, float), 'required': False, 'default': 2, 'min': 0.1}
         }
     }
 }
\ No newline at end of file
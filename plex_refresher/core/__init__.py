@@ -1,5 +1,6 @@
 # plex_refresher/core/__init__.py
 from .refresher import PlexMetadataRefresher
 from .plex_client import PlexClient
+from .section_scanner import SectionScanner, ScanStats
 
-__all__ = ['PlexMetadataRefresher', 'PlexClient']
\ No newline at end of file
+__all__ = ['PlexMetadataRefresher', 'PlexClient', 'SectionScanner', 'ScanStats']
\ No newline at end of file
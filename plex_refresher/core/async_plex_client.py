@@ -0,0 +1,198 @@
+# plex_refresher/core/async_plex_client.py
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Coroutine, Deque, Dict, Iterator, List, Optional, Tuple
+from xml.etree import ElementTree
+import aiohttp
+from plex_refresher.core.raw_scanner import HYDRATE_BATCH_SIZE, RawItem
+from plex_refresher.core.section_scanner import LIBTYPE_IDS, ScanStats
+from plex_refresher.utils.metrics import RefresherMetrics
+
+class AsyncPlexClient:
+    """asyncio client for the few Plex endpoints this project uses, over one pooled keep-alive session.
+
+    GET requests that time out, lose their connection or get a 5xx response are retried up to
+    retries times with exponential backoff. Refreshes are not; the refresh dispatcher retries those.
+    """
+
+    def __init__(self, url: str, token: str, logger: logging.Logger,
+                 max_per_host: int = 16, timeout: float = 30, keepalive: float = 60,
+                 name: str = '', metrics: Optional[RefresherMetrics] = None,
+                 retries: int = 2, retry_delay: float = 0.5):
+        self.url = url.rstrip('/')
+        self.token = str(token).strip()
+        self.logger = logger
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.keepalive = keepalive
+        self.name = name or self.url
+        self.metrics = metrics
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.requests = 0
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    async def open(self):
+        if self._session is not None:
+            return
+        connector = aiohttp.TCPConnector(
+            limit_per_host=self.max_per_host,
+            keepalive_timeout=self.keepalive
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers={
+                'X-Plex-Token': self.token,
+                'Accept': 'application/xml',
+                'X-Plex-Client-Identifier': 'plex-tba-refresher',
+                'X-Plex-Product': 'Plex TBA Refresher',
+                'X-Plex-Version': '1.0'
+            }
+        )
+        self._slots = asyncio.Semaphore(self.max_per_host)
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _request(self, method: str, path: str, headers: Optional[Dict[str, str]] = None,
+                       stats: Optional[ScanStats] = None) -> Optional[ElementTree.Element]:
+        await self.open()
+        attempts = self.retries + 1 if method == 'GET' else 1
+        for attempt in range(1, attempts + 1):
+            try:
+                body = await self._send(method, path, headers)
+                break
+            except (aiohttp.ClientResponseError, aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                server_error = not isinstance(e, aiohttp.ClientResponseError) or e.status >= 500
+                if attempt == attempts or not server_error:
+                    raise
+                delay = self.retry_delay * (2 ** (attempt - 1))
+                self.logger.warning(
+                    f"[{self.name}] {method} {path.split('?')[0]} failed ({str(e) or type(e).__name__}) - "
+                    f"retrying in {delay:.1f}s ({attempt}/{attempts - 1})"
+                )
+                # Sleep without holding a connection slot
+                await asyncio.sleep(delay)
+        if stats is not None:
+            stats.bytes += len(body)
+        return ElementTree.fromstring(body) if body.strip() else None
+
+    async def _send(self, method: str, path: str, headers: Optional[Dict[str, str]]) -> bytes:
+        async with self._slots:
+            self.requests += 1
+            started = time.monotonic()
+            status = 'error'
+            try:
+                async with self._session.request(method, f"{self.url}{path}", headers=headers) as response:
+                    status = response.status
+                    response.raise_for_status()
+                    return await response.read()
+            finally:
+                if self.metrics is not None:
+                    self.metrics.observe_request(self.name, method, path, status, time.monotonic() - started)
+
+    async def list_page(self, section_key: str, libtype: str, start: int, size: int,
+                        filters: Optional[Dict[str, Any]] = None,
+                        stats: Optional[ScanStats] = None) -> Tuple[List[RawItem], int]:
+        """Fetch one page of /library/sections/{key}/all and return its records and the total size"""
+        from plexapi.utils import joinArgs
+        params = {'type': LIBTYPE_IDS[libtype], 'includeGuids': 1, **(filters or {})}
+        headers = {'X-Plex-Container-Start': str(start), 'X-Plex-Container-Size': str(size)}
+        data = await self._request('GET', f"/library/sections/{section_key}/all{joinArgs(params)}", headers, stats)
+        if data is None:
+            return [], 0
+        records = [RawItem.from_element(elem) for elem in data if elem.attrib.get('type') == libtype]
+        return records, int(data.attrib.get('totalSize', start + len(records)))
+
+    async def list_all(self, section_key: str, libtype: str, page_size: int,
+                       filters: Optional[Dict[str, Any]] = None,
+                       stats: Optional[ScanStats] = None,
+                       window: Optional[int] = None) -> AsyncIterator[List[RawItem]]:
+        """Yield every page of a listing in order as it arrives.
+
+        Pages after the first are fetched concurrently, but at most window of them (default
+        max_per_host) are in flight or waiting to be consumed, so a slow consumer holds back
+        fetching instead of the whole library piling up in memory.
+        """
+        records, total = await self.list_page(section_key, libtype, 0, page_size, filters, stats)
+        yield records
+        # Step by what the server actually returned in case it caps the container size
+        step = len(records)
+        starts = iter(range(step, total, step) if step else [])
+        window = max(1, window or self.max_per_host)
+        pending: Deque[asyncio.Task] = deque()
+
+        def fetch_next() -> bool:
+            start = next(starts, None)
+            if start is None:
+                return False
+            pending.append(asyncio.ensure_future(self.list_page(section_key, libtype, start, step, filters, stats)))
+            return True
+
+        try:
+            while len(pending) < window and fetch_next():
+                pass
+            while pending:
+                records, _ = await pending.popleft()
+                fetch_next()
+                yield records
+        finally:
+            # The consumer stopped early or a page failed; drop the pages still being fetched
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def fetch_metadata(self, rating_keys: List[str]) -> List[RawItem]:
+        """Fetch items by ratingKey, batching keys into comma-separated requests issued concurrently"""
+        batches = [rating_keys[i:i + HYDRATE_BATCH_SIZE] for i in range(0, len(rating_keys), HYDRATE_BATCH_SIZE)]
+        responses = await asyncio.gather(
+            *(self._request('GET', f"/library/metadata/{','.join(batch)}") for batch in batches)
+        )
+        return [
+            RawItem.from_element(elem)
+            for data in responses if data is not None
+            for elem in data if 'ratingKey' in elem.attrib
+        ]
+
+    async def refresh(self, rating_key: str):
+        await self._request('PUT', f"/library/metadata/{rating_key}/refresh")
+
+class AsyncRunner:
+    """Owns a background event loop so thread-based scan and refresh code can share async clients"""
+
+    def __init__(self):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='plex-async', daemon=True)
+        self._thread.start()
+
+    def run(self, coro: Coroutine, timeout: Optional[float] = None) -> Any:
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(timeout)
+
+    def iterate(self, agen: AsyncIterator) -> Iterator:
+        """Drive an async generator from a worker thread, one item at a time"""
+        try:
+            while True:
+                try:
+                    yield self.run(agen.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            self.run(agen.aclose())
+
+    def stop(self):
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
@@ -0,0 +1,164 @@
+# plex_refresher/core/event_listener.py
+import asyncio
+import json
+import logging
+import queue
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+import aiohttp
+from aiohttp import web
+from plex_refresher.core.async_plex_client import AsyncRunner
+from plex_refresher.core.plex_client import PlexClient
+
+# Timeline entry types and state that announce a library item has finished processing
+TIMELINE_TYPES = {1: 'movie', 2: 'show', 3: 'season', 4: 'episode'}
+TIMELINE_STATE_DONE = 5
+LIBRARY_IDENTIFIER = 'com.plexapp.plugins.library'
+
+# Webhook events that may introduce or change TBA items
+WEBHOOK_EVENTS = ('library.new',)
+
+@dataclass(frozen=True)
+class ItemEvent:
+    server: str
+    section_key: str
+    rating_key: str
+    libtype: str
+
+def parse_notification(server: str, data: str) -> List[ItemEvent]:
+    """Extract finished library items from a notification websocket message"""
+    container = json.loads(data).get('NotificationContainer', {})
+    if container.get('type') != 'timeline':
+        return []
+    events = []
+    for entry in container.get('TimelineEntry', []):
+        libtype = TIMELINE_TYPES.get(entry.get('type'))
+        if (entry.get('identifier') != LIBRARY_IDENTIFIER or libtype is None
+                or entry.get('state') != TIMELINE_STATE_DONE or entry.get('sectionID') in (None, '-1')):
+            continue
+        events.append(ItemEvent(server, str(entry['sectionID']), str(entry['itemID']), libtype))
+    return events
+
+def parse_webhook(payload: Dict, server_names: Dict[str, str]) -> List[ItemEvent]:
+    """Extract the item of a Plex webhook payload, mapping the server uuid to a configured server"""
+    if payload.get('event') not in WEBHOOK_EVENTS:
+        return []
+    server = server_names.get(payload.get('Server', {}).get('uuid'))
+    metadata = payload.get('Metadata', {})
+    if server is None or not metadata.get('ratingKey') or metadata.get('librarySectionID') is None:
+        return []
+    return [ItemEvent(server, str(metadata['librarySectionID']), str(metadata['ratingKey']), metadata.get('type', ''))]
+
+class PlexEventListener:
+    """Collects item events from each server's notification websocket and from Plex webhooks.
+
+    Listening runs on the shared AsyncRunner loop; the refresher thread picks up batches of
+    events with collect().
+    """
+
+    def __init__(self, clients: List[PlexClient], logger: logging.Logger, websocket: bool = True,
+                 webhook_host: str = '0.0.0.0', webhook_port: Optional[int] = None,
+                 max_reconnect_delay: float = 300):
+        self.clients = clients
+        self.logger = logger
+        self.websocket = websocket
+        self.webhook_host = webhook_host
+        self.webhook_port = webhook_port
+        self.max_reconnect_delay = max_reconnect_delay
+        self.received = 0
+        self._events: queue.Queue = queue.Queue()
+        self._runner: Optional[AsyncRunner] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._tasks: List[asyncio.Task] = []
+        self._site_runner: Optional[web.AppRunner] = None
+
+    def start(self, runner: AsyncRunner):
+        self._runner = runner
+        runner.run(self._start())
+
+    async def _start(self):
+        if self.websocket:
+            self._session = aiohttp.ClientSession()
+            self._tasks = [asyncio.create_task(self._watch(client)) for client in self.clients]
+        if self.webhook_port:
+            app = web.Application()
+            app.router.add_post('/webhook', self._handle_webhook)
+            self._site_runner = web.AppRunner(app, access_log=None)
+            await self._site_runner.setup()
+            await web.TCPSite(self._site_runner, self.webhook_host, self.webhook_port).start()
+            self.logger.info(f"Accepting Plex webhooks at http://{self.webhook_host}:{self.webhook_port}/webhook")
+
+    def stop(self):
+        if self._runner is not None:
+            self._runner.run(self._stop())
+            self._runner = None
+
+    async def _stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        if self._session is not None:
+            await self._session.close()
+        if self._site_runner is not None:
+            await self._site_runner.cleanup()
+
+    def _publish(self, events: List[ItemEvent]):
+        for event in events:
+            self.received += 1
+            self._events.put(event)
+
+    async def _watch(self, client: PlexClient):
+        url = f"{client.url}/:/websockets/notifications"
+        delay = 1
+        while True:
+            try:
+                async with self._session.ws_connect(url, headers={'X-Plex-Token': client.token}, heartbeat=30) as ws:
+                    self.logger.info(f"[{client.name}] Listening for Plex notifications")
+                    delay = 1
+                    async for message in ws:
+                        if message.type != aiohttp.WSMsgType.TEXT:
+                            continue
+                        try:
+                            self._publish(parse_notification(client.name, message.data))
+                        except (ValueError, KeyError) as e:
+                            self.logger.debug(f"[{client.name}] Ignoring malformed notification: {str(e)}")
+                self.logger.warning(f"[{client.name}] Notification websocket closed")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.warning(f"[{client.name}] Notification websocket failed: {str(e)}")
+            self.logger.info(f"[{client.name}] Reconnecting to notifications in {delay}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    async def _handle_webhook(self, request: web.Request) -> web.Response:
+        try:
+            if request.content_type.startswith('multipart/'):
+                form = await request.post()
+                payload = json.loads(form.get('payload', '{}'))
+            else:
+                payload = await request.json()
+        except ValueError:
+            return web.Response(status=400, text='invalid payload')
+        server_names = {
+            client.server_info.get('machine_identifier'): client.name for client in self.clients
+        }
+        events = parse_webhook(payload, server_names)
+        self._publish(events)
+        self.logger.debug(f"Webhook {payload.get('event')}: {len(events)} item events")
+        return web.Response(text='ok')
+
+    def collect(self, timeout: float, debounce: float) -> List[ItemEvent]:
+        """Wait up to timeout for an event, then gather whatever else arrives within debounce seconds"""
+        try:
+            events = [self._events.get(timeout=max(0.0, timeout))]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + debounce
+        while True:
+            remaining = deadline - time.monotonic()
+            try:
+                events.append(self._events.get(timeout=remaining) if remaining > 0 else self._events.get_nowait())
+            except queue.Empty:
+                return list(dict.fromkeys(events))
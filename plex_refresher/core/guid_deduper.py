@@ -0,0 +1,53 @@
+# plex_refresher/core/guid_deduper.py
+import logging
+import threading
+from typing import Dict, List, Tuple
+from plex_refresher.models.tba_item import TBAItem
+
+class GuidDeduper:
+    """Per-cycle registry that keeps one copy of each GUID for refreshing.
+
+    The copy that was primary in the last cycle stays primary, so its refresh backoff carries
+    over; otherwise the first copy seen in a cycle becomes the primary. Copies of the same GUID
+    in other libraries or on other servers are held back as mirrors, to be re-checked once the
+    primary has been refreshed.
+    """
+
+    def __init__(self, logger: logging.Logger):
+        self.logger = logger
+        self.collapsed = 0
+        self._primaries: Dict[str, Tuple[str, str]] = {}
+        self._previous: Dict[str, Tuple[str, str]] = {}
+        self._mirrors: Dict[Tuple[str, str], List[Tuple[str, TBAItem]]] = {}
+        self._lock = threading.Lock()
+
+    def reset(self):
+        with self._lock:
+            self.collapsed = 0
+            # Scans run in parallel, so the first copy seen can differ from one cycle to the next
+            self._previous = self._primaries
+            self._primaries = {}
+            self._mirrors = {}
+
+    def claim(self, section_id: str, items: List[TBAItem]) -> List[TBAItem]:
+        """Return the items that should be refreshed, holding back copies of already claimed GUIDs"""
+        primaries = []
+        with self._lock:
+            for item in items:
+                if not item.guid:
+                    primaries.append(item)
+                    continue
+                key = (section_id, item.rating_key)
+                owner = self._primaries.get(item.guid) or self._previous.get(item.guid, key)
+                if owner == key:
+                    self._primaries[item.guid] = key
+                    primaries.append(item)
+                    continue
+                self._mirrors.setdefault(owner, []).append((section_id, item))
+                self.collapsed += 1
+                self.logger.debug(f"  {item} in {section_id} mirrors {owner[0]}:{owner[1]} - not refreshing it separately")
+        return primaries
+
+    def mirrors_of(self, section_id: str, rating_key: str) -> List[Tuple[str, TBAItem]]:
+        with self._lock:
+            return list(self._mirrors.get((section_id, str(rating_key)), []))
@@ -0,0 +1,205 @@
+# plex_refresher/core/load_monitor.py
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from plex_refresher.core.plex_client import PlexClient
+
+NORMAL = 'normal'
+REDUCED = 'reduced'
+PAUSED = 'paused'
+
+@dataclass
+class ServerLoad:
+    sessions: int = 0
+    transcodes: int = 0
+    activities: int = 0
+
+    def __str__(self):
+        return f"{self.sessions} sessions, {self.transcodes} transcodes, {self.activities} background activities"
+
+@dataclass
+class ServerState:
+    level: str = NORMAL
+    load: ServerLoad = field(default_factory=ServerLoad)
+    paused_since: Optional[float] = None
+    pause_expired: bool = False  # Set once a pause outlasts max_pause_seconds, until the load drops
+    in_flight: int = 0
+    last_page: float = 0.0
+    last_refresh: float = 0.0
+    held_scans: float = 0.0  # Seconds scan pages were held back this cycle
+    held_refreshes: float = 0.0  # Summed over refresh workers
+    decisions: List[str] = field(default_factory=list)
+
+class LoadMonitor:
+    """Polls each server's sessions and activities and throttles scans and refreshes to match.
+
+    Below the reduce thresholds work runs at full speed. At or above them, refreshes run
+    at reduced_factor of their rate and concurrency and scan pages are spaced out. At the
+    pause thresholds scans and refreshes wait until the server quietens down, for at most
+    max_pause_seconds at a time.
+    """
+
+    def __init__(self, clients: List[PlexClient], throttle_config: Dict, refresh_rate: float,
+                 max_in_flight: int, logger: logging.Logger):
+        self.clients = clients
+        self.config = throttle_config
+        self.refresh_rate = refresh_rate
+        self.max_in_flight = max_in_flight
+        self.logger = logger
+        self._states: Dict[str, ServerState] = {client.name: ServerState() for client in clients}
+        self._condition = threading.Condition()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        self._stop.clear()
+        self.poll()
+        self._thread = threading.Thread(target=self._run, name='load-monitor', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.config['poll_interval_seconds']):
+            self.poll()
+
+    def poll(self):
+        for client in self.clients:
+            if client.plex is None:
+                continue
+            try:
+                load = self._read_load(client)
+            except Exception as e:
+                self.logger.debug(f"[{client.name}] Could not read server load: {str(e)}")
+                continue
+            self._apply(client.name, load)
+
+    def _read_load(self, client: PlexClient) -> ServerLoad:
+        sessions = client.plex.query('/status/sessions')
+        activities = client.plex.query('/activities')
+        activity_types = tuple(self.config['activity_types'])
+        return ServerLoad(
+            sessions=len(sessions),
+            transcodes=sum(1 for session in sessions if session.find('TranscodeSession') is not None),
+            activities=sum(
+                1 for activity in activities if activity.attrib.get('type', '').startswith(activity_types)
+            )
+        )
+
+    def _level_for(self, load: ServerLoad) -> str:
+        def reached(value: int, threshold: int) -> bool:
+            return bool(threshold) and value >= threshold
+
+        if (reached(load.sessions, self.config['pause_at_sessions'])
+                or reached(load.transcodes, self.config['pause_at_transcodes'])
+                or reached(load.activities, self.config['pause_at_activities'])):
+            return PAUSED
+        if (reached(load.sessions, self.config['reduce_at_sessions'])
+                or reached(load.transcodes, self.config['reduce_at_transcodes'])):
+            return REDUCED
+        return NORMAL
+
+    def _apply(self, server: str, load: ServerLoad):
+        level = self._level_for(load)
+        with self._condition:
+            state = self._states[server]
+            state.load = load
+            if level != PAUSED:
+                state.pause_expired = False
+            elif state.pause_expired:
+                level = REDUCED
+            if level == state.level:
+                return
+            decision = f"{time.strftime('%H:%M:%S')} {state.level} -> {level} ({load})"
+            state.decisions.append(decision)
+            state.level = level
+            state.paused_since = time.monotonic() if level == PAUSED else None
+            self._condition.notify_all()
+        self.logger.info(f"[{server}] Throttle {decision}")
+
+    def _paused(self, server: str, state: ServerState) -> bool:
+        if state.level != PAUSED:
+            return False
+        limit = self.config['max_pause_seconds']
+        if limit and time.monotonic() - state.paused_since >= limit:
+            # Do not starve indefinitely; carry on at the reduced pace until the server quietens down
+            self.logger.warning(f"[{server}] Busy for longer than max_pause_seconds - resuming at reduced pace")
+            state.level = REDUCED
+            state.pause_expired = True
+            state.decisions.append(f"{time.strftime('%H:%M:%S')} paused -> reduced (max_pause_seconds reached)")
+            return False
+        return True
+
+    def before_page(self, server: str) -> float:
+        """Called before each scan page request; returns the time the scan was held back"""
+        started = time.monotonic()
+        with self._condition:
+            state = self._states[server]
+            # Refresh releases and level changes wake the condition, so the spacing is re-checked each time
+            while True:
+                if self._paused(server, state):
+                    self._condition.wait(timeout=1)
+                    continue
+                if state.level != REDUCED:
+                    break
+                delay = state.last_page + self.config['reduced_page_delay_seconds'] - time.monotonic()
+                if delay <= 0:
+                    break
+                self._condition.wait(timeout=delay)
+            state.last_page = time.monotonic()
+            held = state.last_page - started
+            state.held_scans += held
+        return held
+
+    def acquire_refresh(self, server: str) -> float:
+        """Wait for a refresh slot on a server; pair with release_refresh()"""
+        started = time.monotonic()
+        with self._condition:
+            state = self._states[server]
+            while True:
+                if self._paused(server, state):
+                    self._condition.wait(timeout=1)
+                    continue
+                if state.level != REDUCED:
+                    break
+                limit = max(1, int(self.max_in_flight * self.config['reduced_factor']))
+                spacing = 1 / (self.refresh_rate * self.config['reduced_factor'])
+                delay = state.last_refresh + spacing - time.monotonic()
+                if state.in_flight < limit and delay <= 0:
+                    break
+                self._condition.wait(timeout=delay if delay > 0 else 1)
+            state.in_flight += 1
+            state.last_refresh = time.monotonic()
+            held = state.last_refresh - started
+            state.held_refreshes += held
+        return held
+
+    def release_refresh(self, server: str):
+        with self._condition:
+            self._states[server].in_flight -= 1
+            self._condition.notify_all()
+
+    def log_cycle(self):
+        """Log this cycle's throttle decisions and hold-back time per server, then reset them"""
+        with self._condition:
+            for server, state in self._states.items():
+                if state.decisions or state.held_scans + state.held_refreshes >= 0.1:
+                    self.logger.info(
+                        f"Throttle [{server}]: now {state.level} ({state.load}); held back scans "
+                        f"{state.held_scans:.1f}s and refreshes {state.held_refreshes:.1f}s this cycle"
+                    )
+                    for decision in state.decisions:
+                        self.logger.info(f"  {decision}")
+                state.decisions = []
+                state.held_scans = 0.0
+                state.held_refreshes = 0.0
@@ -0,0 +1,93 @@
+# plex_refresher/core/match_pipeline.py
+import itertools
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List
+from plex_refresher.models.tba_item import TBAItem
+
+# Matches handed from a scan to the refresh stage at a time
+MATCH_BATCH_SIZE = 100
+
+# Matches listed per library in the dry-run summary; the rest are only counted
+SUMMARY_SAMPLE_SIZE = 25
+
+def batched(items: Iterable[TBAItem], size: int = MATCH_BATCH_SIZE) -> Iterator[List[TBAItem]]:
+    iterator = iter(items)
+    while batch := list(itertools.islice(iterator, size)):
+        yield batch
+
+class MatchPipeline:
+    """Bounded hand-off from library scans to a single refresh-stage thread.
+
+    Scans put batches of matches while they are still running; when the refresh stage falls
+    behind the rate limiter, the queue fills and put() blocks the scanners until it catches up.
+    """
+
+    def __init__(self, handle: Callable[[str, List[TBAItem]], None], max_batches: int, logger: logging.Logger):
+        self.handle = handle
+        self.logger = logger
+        self.batches = 0
+        self.blocked = 0.0  # Seconds scanners spent waiting on a full queue
+        self._queue: queue.Queue = queue.Queue(maxsize=max_batches)
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name='refresh-stage', daemon=True)
+        self._thread.start()
+
+    def put(self, section_id: str, batch: List[TBAItem]):
+        started = time.monotonic()
+        self._queue.put((section_id, batch))
+        with self._lock:
+            self.blocked += time.monotonic() - started
+
+    def _run(self):
+        while True:
+            entry = self._queue.get()
+            if entry is None:
+                return
+            section_id, batch = entry
+            self.batches += 1
+            try:
+                self.handle(section_id, batch)
+            except Exception as e:
+                self.logger.error(f"Error queueing refreshes for {len(batch)} matches: {str(e)}")
+
+    def close(self):
+        """Wait for every queued batch to be handled and stop the refresh-stage thread"""
+        self._queue.put(None)
+        self._thread.join()
+        self.logger.info(
+            f"Refresh stage handled {self.batches} match batches; "
+            f"scans waited {self.blocked:.1f}s on backpressure"
+        )
+
+@dataclass
+class LibrarySummary:
+    movies: int = 0
+    episodes: int = 0
+    sample: List[str] = field(default_factory=list)
+
+class MatchSummary:
+    """Per-library match counters plus a small sample, so dry runs do not retain every match"""
+
+    def __init__(self, sample_size: int = SUMMARY_SAMPLE_SIZE):
+        self.sample_size = sample_size
+        self.libraries: Dict[str, LibrarySummary] = {}
+        self._lock = threading.Lock()
+
+    def add(self, library: str, items: Iterable[TBAItem]):
+        with self._lock:
+            summary = self.libraries.setdefault(library, LibrarySummary())
+            for item in items:
+                if item.type == 'movie':
+                    summary.movies += 1
+                else:
+                    summary.episodes += 1
+                if len(summary.sample) < self.sample_size:
+                    summary.sample.append(str(item))
+
+    @property
+    def total(self) -> int:
+        return sum(s.movies + s.episodes for s in self.libraries.values())
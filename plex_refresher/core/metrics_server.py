@@ -0,0 +1,42 @@
+# plex_refresher/core/metrics_server.py
+import logging
+from typing import Optional
+from aiohttp import web
+from plex_refresher.core.async_plex_client import AsyncRunner
+from plex_refresher.utils.metrics import MetricsRegistry
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+class MetricsServer:
+    """Serves a registry in the Prometheus text format at /metrics, on the shared AsyncRunner loop"""
+
+    def __init__(self, registry: MetricsRegistry, logger: logging.Logger,
+                 host: str = '0.0.0.0', port: int = 9464):
+        self.registry = registry
+        self.logger = logger
+        self.host = host
+        self.port = port
+        self._runner: Optional[AsyncRunner] = None
+        self._site_runner: Optional[web.AppRunner] = None
+
+    def start(self, runner: AsyncRunner):
+        self._runner = runner
+        runner.run(self._start())
+
+    async def _start(self):
+        app = web.Application()
+        app.router.add_get('/metrics', self._handle_metrics)
+        self._site_runner = web.AppRunner(app, access_log=None)
+        await self._site_runner.setup()
+        await web.TCPSite(self._site_runner, self.host, self.port).start()
+        self.logger.info(f"Serving metrics at http://{self.host}:{self.port}/metrics")
+
+    async def _handle_metrics(self, request: web.Request) -> web.Response:
+        body = self.registry.render()
+        return web.Response(body=body.encode('utf8'), headers={'Content-Type': PROMETHEUS_CONTENT_TYPE})
+
+    def stop(self):
+        if self._runner is not None and self._site_runner is not None:
+            self._runner.run(self._site_runner.cleanup())
+        self._runner = None
+        self._site_runner = None
@@ -1,14 +1,94 @@
 import logging
+import threading
 import time
-from typing import Optional
-from plexapi.server import PlexServer
+from typing import TYPE_CHECKING, Dict, List, Optional
 import requests
+from requests.adapters import HTTPAdapter
+from plex_refresher.utils.metrics import RefresherMetrics
+
+if TYPE_CHECKING:
+    # plexapi is slow to import, so it is only loaded once a connection is made
+    from plexapi.server import PlexServer
+
+class _TrackingAdapter(HTTPAdapter):
+    """Transport adapter that counts and times requests and reports connection and server errors to the client"""
+
+    def __init__(self, on_failure, server: str = '', metrics: Optional[RefresherMetrics] = None, **kwargs):
+        super().__init__(**kwargs)
+        self.on_failure = on_failure
+        self.server = server
+        self.metrics = metrics
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        with self._lock:
+            self.requests += 1
+        started = time.monotonic()
+        try:
+            response = super().send(request, **kwargs)
+        except requests.RequestException as e:
+            self._observe(request, 'error', started)
+            self.on_failure(str(e))
+            raise
+        # Time to response headers; streamed bodies are read by the caller afterwards
+        self._observe(request, response.status_code, started)
+        if response.status_code == 401 or response.status_code >= 500:
+            self.on_failure(f"HTTP {response.status_code} from {request.path_url.split('?')[0]}")
+        return response
+
+    def _observe(self, request, status, started: float):
+        if self.metrics is not None:
+            self.metrics.observe_request(self.server, request.method, request.path_url, status,
+                                         time.monotonic() - started)
+
+class _CountingReader:
+    """Wraps a streamed response body and reports the bytes read from it"""
+
+    def __init__(self, raw, on_read):
+        self._raw = raw
+        self._on_read = on_read
+
+    def read(self, *args, **kwargs):
+        data = self._raw.read(*args, **kwargs)
+        self._on_read(len(data))
+        return data
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
 
 class PlexClient:
-    def __init__(self, url: str, token: str, logger: logging.Logger):
+    def __init__(self, url: str, token: str, logger: logging.Logger,
+                 name: Optional[str] = None, libraries: Optional[List[str]] = None,
+                 connect_retries: int = 3, connect_retry_delay: float = 5,
+                 reconnect_max_delay: float = 900, section_cache_ttl: float = 300,
+                 pool_size: int = 10, metrics: Optional[RefresherMetrics] = None):
         self.url = url.rstrip('/')  # Remove trailing slash if present
         self.token = str(token).strip()  # Ensure token is string and stripped
         self.logger = logger
+        self.name = name or self.url
+        self.libraries = libraries
+        self.connect_retries = connect_retries
+        self.connect_retry_delay = connect_retry_delay
+        self.reconnect_max_delay = reconnect_max_delay
+        self.section_cache_ttl = section_cache_ttl
+        self.pool_size = pool_size
+        self.metrics = metrics
+        self.session: Optional[requests.Session] = None
+        self.plex: Optional['PlexServer'] = None
+        self.server_info: Dict[str, str] = {}
+        self._adapter: Optional[_TrackingAdapter] = None
+        # Per thread, so a scan can attribute the bytes to its library while others run in parallel
+        self._received = threading.local()
+
+        # Lazy re-verification and circuit breaker state
+        self._lock = threading.RLock()
+        self._needs_verify = False
+        self._last_failure: Optional[str] = None
+        self._consecutive_failures = 0
+        self._open_until = 0.0
+        self._sections: Optional[List] = None
+        self._sections_fetched = 0.0
         
         # Log token format for debugging
         self.logger.debug(f"Token length: {len(self.token)}")
@@ -16,59 +96,191 @@ class PlexClient:
         self.logger.debug(f"Token contains whitespace: {' ' in self.token}")
         self.logger.debug(f"Token is alphanumeric: {self.token.isalnum()}")
 
-    def connect(self) -> Optional[PlexServer]:
-        max_retries = 3
-        retry_delay = 5
+    @property
+    def request_count(self) -> int:
+        """HTTP requests sent over this client's session since it was created"""
+        return self._adapter.requests if self._adapter else 0
+
+    def bytes_received(self) -> int:
+        """Response bytes read over this client's session by the calling thread"""
+        return getattr(self._received, 'bytes', 0)
+
+    def _count_bytes(self, size: int):
+        self._received.bytes = self.bytes_received() + size
+
+    def _on_response(self, response, *args, **kwargs):
+        # Streamed bodies are counted as the caller reads them; see stream()
+        if not kwargs.get('stream'):
+            self._count_bytes(len(response.content))
+
+    @property
+    def circuit_open(self) -> bool:
+        return time.monotonic() < self._open_until
+
+    def mark_failed(self, reason: str):
+        """Flag the connection for re-verification before it is used in the next cycle"""
+        with self._lock:
+            if not self._needs_verify:
+                self.logger.debug(f"[{self.name}] Request failed ({reason}) - will re-verify before next use")
+            self._needs_verify = True
+            self._last_failure = reason
+
+    def _create_session(self) -> requests.Session:
+        session = requests.Session()
+        session.headers.update({
+            'X-Plex-Token': self.token,
+            'Accept': 'application/xml',
+            'X-Plex-Client-Identifier': 'plex-tba-refresher',
+            'X-Plex-Product': 'Plex TBA Refresher',
+            'X-Plex-Version': '1.0'
+        })
+        adapter = _TrackingAdapter(self.mark_failed, server=self.name, metrics=self.metrics,
+                                   pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        session.hooks['response'].append(self._on_response)
+        self._adapter = adapter
+        return session
+
+    def _trip(self):
+        """Open the circuit for an exponentially growing period after a failed connect"""
+        self._consecutive_failures += 1
+        delay = min(self.reconnect_max_delay,
+                    self.connect_retry_delay * (2 ** (self._consecutive_failures - 1)))
+        self._open_until = time.monotonic() + delay
+        self.logger.error(f"[{self.name}] Plex server unreachable - circuit open for {delay:.0f}s "
+                          f"({self._consecutive_failures} consecutive failed connects)")
+
+    def connect(self) -> Optional['PlexServer']:
+        """Return the long-lived server handle, connecting or re-verifying only when needed"""
+        with self._lock:
+            if self.plex is not None and not self._needs_verify:
+                return self.plex
+
+            if self.circuit_open:
+                remaining = self._open_until - time.monotonic()
+                self.logger.warning(f"[{self.name}] Circuit open - next reconnect attempt in {remaining:.0f}s")
+                return None
+
+            if self.plex is not None:
+                self.logger.info(f"[{self.name}] Re-verifying connection after failed request: {self._last_failure}")
+                self._needs_verify = False
+                if self.verify_connection(self.plex, refresh_sections=True):
+                    self._consecutive_failures = 0
+                    return self.plex
+                self.plex = None
+
+            # Half-open after a trip: a single probe decides whether the circuit closes again
+            attempts = 1 if self._consecutive_failures else self.connect_retries
+            plex = self._connect_with_retries(attempts)
+            if plex is None:
+                self._trip()
+                return None
+            self._consecutive_failures = 0
+            self._needs_verify = False
+            return plex
+
+    def _connect_with_retries(self, max_retries: int) -> Optional['PlexServer']:
+        from plexapi.server import PlexServer
+        retry_delay = self.connect_retry_delay
         
         for attempt in range(max_retries):
             try:
                 self.logger.debug(f"Attempting to connect to Plex server (attempt {attempt + 1}/{max_retries})")
                 
-                # Create session with explicit headers
-                session = requests.Session()
-                session.headers.update({
-                    'X-Plex-Token': self.token,
-                    'Accept': 'application/xml',
-                    'X-Plex-Client-Identifier': 'plex-tba-refresher',
-                    'X-Plex-Product': 'Plex TBA Refresher',
-                    'X-Plex-Version': '1.0'
-                })
+                # Keep one pooled session for the whole process and only replace the server handle
+                if self.session is None:
+                    self.session = self._create_session()
 
                 # Now create the PlexServer instance
                 plex = PlexServer(
                     baseurl=self.url,
                     token=self.token,
-                    session=session
+                    session=self.session
                 )
                 
+                # The constructor has just read the root document, so only the sections are listed
                 if self.verify_connection(plex):
+                    self.plex = plex
                     return plex
                     
             except Exception as e:
                 self.logger.error(f"Connection attempt {attempt + 1}/{max_retries} failed: {str(e)}")
-                if attempt < max_retries - 1:
-                    self.logger.info(f"Retrying in {retry_delay} seconds...")
-                    time.sleep(retry_delay)
-                    retry_delay *= 2
+            if attempt < max_retries - 1:
+                self.logger.info(f"Retrying in {retry_delay} seconds...")
+                if self.metrics is not None:
+                    self.metrics.connect_retries.inc(server=self.name)
+                    self.metrics.slept('connect_retry', retry_delay)
+                time.sleep(retry_delay)
+                retry_delay *= 2
                 
         self.logger.error("Failed to establish Plex connection after all retries")
         return None
 
-    def verify_connection(self, plex: PlexServer) -> bool:
+    def verify_connection(self, plex: 'PlexServer', refresh_sections: bool = False) -> bool:
         try:
+            if refresh_sections:
+                # Re-read the root document so a restarted or replaced server is noticed
+                plex._loadData(plex.query('/'))
             server_info = {
                 'friendly_name': plex.friendlyName,
                 'version': plex.version,
-                'platform': plex.platform
+                'platform': plex.platform,
+                'machine_identifier': plex.machineIdentifier
             }
-            self.logger.info(f"Connected to Plex server: {server_info['friendly_name']} "
-                          f"(Version: {server_info['version']}, Platform: {server_info['platform']}")
+            if server_info != self.server_info:
+                self.logger.info(f"Connected to Plex server: {server_info['friendly_name']} "
+                              f"(Version: {server_info['version']}, Platform: {server_info['platform']}")
+            self.server_info = server_info
             
-            libraries = plex.library.sections()
+            libraries = self._load_sections(plex)
             self.logger.info(f"Found {len(libraries)} libraries: {', '.join(lib.title for lib in libraries)}")
             
             return True
             
         except Exception as e:
             self.logger.error(f"Failed to verify Plex connection: {str(e)}")
-            return False
\ No newline at end of file
+            return False
+
+    def _load_sections(self, plex: 'PlexServer') -> List:
+        sections = plex.library.sections()
+        self._sections = sections
+        self._sections_fetched = time.monotonic()
+        return sections
+
+    def sections(self) -> List:
+        """Library sections, re-listed from the server only once the cache TTL has passed"""
+        with self._lock:
+            if self.plex is None:
+                raise RuntimeError("Not connected to a Plex server")
+            if self._sections is None or time.monotonic() - self._sections_fetched >= self.section_cache_ttl:
+                self.logger.debug(f"[{self.name}] Section cache expired - listing libraries")
+                self._load_sections(self.plex)
+            return self._sections
+
+    def section(self, title: str):
+        for section in self.sections():
+            if section.title == title:
+                return section
+        # Fall back to the server so the usual NotFound error surfaces for unknown names
+        return self.plex.library.section(title)
+
+    def refresh_item(self, rating_key: str, timeout: int = 30):
+        """Ask Plex to refresh metadata for any item, season or show by ratingKey"""
+        if self.session is None:
+            raise RuntimeError("Not connected to a Plex server")
+        response = self.session.put(f"{self.url}/library/metadata/{rating_key}/refresh", timeout=timeout)
+        response.raise_for_status()
+
+    def stream(self, key: str, headers: Optional[dict] = None, timeout: int = 60) -> requests.Response:
+        """Issue a streamed GET for key so large XML responses can be parsed incrementally"""
+        if self.session is None:
+            raise RuntimeError("Not connected to a Plex server")
+        response = self.session.get(f"{self.url}{key}", headers=headers, stream=True, timeout=timeout)
+        if not response.ok:
+            # Error bodies are small; reading them keeps the connection reusable
+            self._count_bytes(len(response.content))
+            response.raise_for_status()
+        response.raw.decode_content = True
+        response.raw = _CountingReader(response.raw, self._count_bytes)
+        return response
@@ -0,0 +1,120 @@
+# plex_refresher/core/raw_scanner.py
+import logging
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, Optional
+from xml.etree.ElementTree import iterparse
+from plex_refresher.core.plex_client import PlexClient
+from plex_refresher.core.section_scanner import LIBTYPE_IDS, ScanStats
+from plex_refresher.models.tba_item import dedupe_guid
+
+if TYPE_CHECKING:
+    from plexapi.server import PlexServer
+
+# Upper bound on ratingKeys per /library/metadata/{k1,k2,...} request
+HYDRATE_BATCH_SIZE = 100
+
+@dataclass(slots=True)
+class RawItem:
+    """The handful of attributes needed to match an item, read straight from the XML"""
+    rating_key: str
+    type: str
+    title: str
+    grandparent_title: Optional[str] = None
+    parent_rating_key: Optional[str] = None
+    grandparent_rating_key: Optional[str] = None
+    season: Optional[int] = None
+    episode: Optional[int] = None
+    year: Optional[int] = None
+    updated_at: Optional[int] = None
+    guid: Optional[str] = None
+    aired: Optional[str] = None
+
+    @classmethod
+    def from_element(cls, elem):
+        """Build from a listing element, including the external ids of its Guid children"""
+        record = cls.from_attrib(elem.attrib)
+        record.guid = dedupe_guid(record.guid, [child.attrib.get('id') for child in elem if child.tag == 'Guid'])
+        return record
+
+    @classmethod
+    def from_attrib(cls, attrib: Dict[str, str]):
+        return cls(
+            rating_key=attrib.get('ratingKey'),
+            type=attrib.get('type'),
+            title=attrib.get('title', ''),
+            grandparent_title=attrib.get('grandparentTitle'),
+            parent_rating_key=attrib.get('parentRatingKey'),
+            grandparent_rating_key=attrib.get('grandparentRatingKey'),
+            season=_to_int(attrib.get('parentIndex')),
+            episode=_to_int(attrib.get('index')),
+            year=_to_int(attrib.get('year')),
+            updated_at=_to_int(attrib.get('updatedAt')),
+            guid=attrib.get('guid'),
+            aired=attrib.get('originallyAvailableAt')
+        )
+
+def _to_int(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+class RawSectionScanner:
+    """Streams section listings with an incremental XML parser instead of building plexapi objects"""
+
+    def __init__(self, plex_client: PlexClient, plex: 'PlexServer', page_size: int, logger: logging.Logger,
+                 pace: Optional[Callable[[], float]] = None):
+        self.plex_client = plex_client
+        self.plex = plex
+        self.page_size = page_size
+        self.logger = logger
+        self.pace = pace  # Called before each page request; may block while the server is busy
+
+    def iter_items(self, library, libtype: str, stats: ScanStats,
+                   filters: Optional[Dict[str, str]] = None, start: int = 0) -> Iterator[RawItem]:
+        """Yield a RawItem for every item of libtype from position start, optionally narrowed by server-side filters"""
+        from plexapi.utils import joinArgs
+        params = {'type': LIBTYPE_IDS[libtype], 'includeGuids': 1, **(filters or {})}
+        key = f"/library/sections/{library.key}/all{joinArgs(params)}"
+        started = time.monotonic()
+
+        try:
+            while True:
+                headers = {
+                    'X-Plex-Container-Start': str(start),
+                    'X-Plex-Container-Size': str(self.page_size)
+                }
+                stats.page(start)
+                if self.pace:
+                    self.pace()
+                response = self.plex_client.stream(key, headers=headers)
+                stats.requests += 1
+                page_size = 0
+                total = None
+
+                with response:
+                    root = None
+                    for event, elem in iterparse(response.raw, events=('start', 'end')):
+                        if event == 'start':
+                            if root is None:
+                                root = elem
+                                total = _to_int(elem.attrib.get('totalSize'))
+                            continue
+                        if elem is root or elem.attrib.get('type') != libtype:
+                            continue
+                        page_size += 1
+                        stats.observe(elem.attrib)
+                        yield RawItem.from_element(elem)
+                        # Drop parsed children so memory stays flat across a page
+                        root.clear()
+
+                start += page_size
+                if total is None:
+                    total = start
+                self.logger.debug(f"    Streamed {libtype} page ending at {start} of {total}")
+                if page_size == 0 or page_size < self.page_size or start >= total:
+                    break
+            stats.completed = True
+        finally:
+            stats.elapsed += time.monotonic() - started
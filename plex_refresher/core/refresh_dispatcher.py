@@ -0,0 +1,112 @@
+# plex_refresher/core/refresh_dispatcher.py
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+from plex_refresher.core.refresh_planner import RefreshTarget
+from plex_refresher.utils.logging_setup import ITEM_LOGGER
+from plex_refresher.utils.rate_limiter import TokenBucket
+
+@dataclass
+class RefreshResult:
+    target: RefreshTarget
+    success: bool
+    latency: float
+    attempts: int
+    waited: float = 0.0
+    error: Optional[str] = None
+
+class RefreshDispatcher:
+    """Runs item refreshes on a bounded worker pool, paced by a token bucket.
+
+    At most max_queued refreshes may be waiting or running at once; submit() blocks beyond that
+    so callers cannot race ahead of the rate limit. Once the stop event is set, refreshes that
+    have not started yet are dropped without waiting on the rate limit.
+    """
+
+    def __init__(self, refresh: Callable[[RefreshTarget], None], requests_per_second: float, max_in_flight: int,
+                 max_retries: int, logger: logging.Logger,
+                 on_result: Optional[Callable[[RefreshResult], None]] = None, max_queued: int = 100,
+                 stop: Optional[threading.Event] = None):
+        self.refresh = refresh
+        self.logger = logger
+        self.item_logger = logger.getChild(ITEM_LOGGER)
+        self.max_retries = max_retries
+        self.on_result = on_result
+        self.stop = stop or threading.Event()
+        self.limiter = TokenBucket(requests_per_second, capacity=max_in_flight)
+        self._executor = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix='refresh')
+        self._slots = threading.Semaphore(max(max_queued, max_in_flight))
+        self._results: List[RefreshResult] = []
+        self._lock = threading.Lock()
+
+    def submit(self, target: RefreshTarget) -> Future:
+        """Queue a refresh, waiting for a free slot when max_queued refreshes are already pending"""
+        self._slots.acquire()
+        future = self._executor.submit(self._refresh, target)
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def _refresh(self, target: RefreshTarget) -> RefreshResult:
+        waited = 0.0
+        error = None
+        attempt = 0
+        started = time.monotonic()
+        for attempt in range(1, self.max_retries + 2):
+            if self.stop.is_set():
+                error = 'cancelled by shutdown'
+                break
+            waited += self.limiter.acquire()
+            started = time.monotonic()
+            try:
+                self.refresh(target)
+                error = None
+                break
+            except Exception as e:
+                error = str(e)
+                self.logger.warning(f"  Refresh attempt {attempt} failed for {target}: {error}")
+
+        result = RefreshResult(
+            target=target,
+            success=error is None,
+            latency=time.monotonic() - started,
+            attempts=attempt,
+            waited=waited,
+            error=error
+        )
+        if result.success:
+            self.item_logger.info(f"  Refreshed {target} in {result.latency:.2f}s ({attempt} attempt(s))")
+        elif not self.stop.is_set():
+            self.logger.error(f"  Failed to refresh {target} after {attempt} attempts: {error}")
+
+        with self._lock:
+            self._results.append(result)
+        if self.on_result:
+            try:
+                self.on_result(result)
+            except Exception as e:
+                self.logger.error(f"  Error recording refresh result for {target}: {str(e)}")
+        return result
+
+    def drain(self) -> List[RefreshResult]:
+        """Wait for every queued refresh, log a summary and stop the worker pool"""
+        self._executor.shutdown(wait=True)
+        self.log_summary()
+        return list(self._results)
+
+    def log_summary(self):
+        results = list(self._results)
+        if not results:
+            return
+        succeeded = sum(1 for r in results if r.success)
+        retries = sum(r.attempts - 1 for r in results)
+        latencies = sorted(r.latency for r in results)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        waited = sum(r.waited for r in results)
+        self.logger.info(
+            f"Refresh summary: {succeeded}/{len(results)} succeeded, {retries} retries, "
+            f"avg latency {sum(latencies) / len(latencies):.2f}s, p95 {p95:.2f}s, "
+            f"{waited:.1f}s spent waiting on the rate limit"
+        )
@@ -0,0 +1,69 @@
+# plex_refresher/core/refresh_planner.py
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Tuple
+from plex_refresher.models.tba_item import TBAItem
+
+@dataclass
+class RefreshTarget:
+    """One refresh request: an item itself, or the season/show covering several TBA episodes"""
+    rating_key: str
+    level: str  # 'item', 'season' or 'show'
+    label: str
+    section_id: str
+    items: List[TBAItem] = field(default_factory=list)
+
+    def __str__(self):
+        if self.level == 'item':
+            return self.label
+        return f"{self.label} ({self.level}, {len(self.items)} TBA episodes)"
+
+class RefreshPlanner:
+    """Groups due items by show and season so crowded seasons are refreshed with a single request"""
+
+    def __init__(self, season_threshold: int, show_threshold: int, logger: logging.Logger):
+        self.season_threshold = season_threshold
+        self.show_threshold = show_threshold
+        self.logger = logger
+        self.saved = 0  # Requests saved since the counter was last reset
+        self._lock = threading.Lock()
+
+    def plan(self, items: Iterable[Tuple[TBAItem, str]]) -> List[RefreshTarget]:
+        """Turn (item, section_id) pairs into refresh targets, collapsing siblings above the thresholds"""
+        targets = []
+        shows: Dict[Tuple[str, str], List[TBAItem]] = {}
+        item_count = 0
+
+        for item, section_id in items:
+            item_count += 1
+            if item.type == 'episode' and item.grandparent_rating_key:
+                shows.setdefault((section_id, item.grandparent_rating_key), []).append(item)
+            else:
+                targets.append(RefreshTarget(item.rating_key, 'item', str(item), section_id, [item]))
+
+        for (section_id, show_key), episodes in shows.items():
+            if self.show_threshold and len(episodes) >= self.show_threshold:
+                targets.append(RefreshTarget(show_key, 'show', episodes[0].show, section_id, episodes))
+                continue
+
+            seasons: Dict[str, List[TBAItem]] = {}
+            for episode in episodes:
+                seasons.setdefault(episode.parent_rating_key, []).append(episode)
+
+            for season_key, season_episodes in seasons.items():
+                if self.season_threshold and season_key and len(season_episodes) >= self.season_threshold:
+                    label = f"{season_episodes[0].show} - Season {season_episodes[0].season}"
+                    targets.append(RefreshTarget(season_key, 'season', label, section_id, season_episodes))
+                else:
+                    targets.extend(
+                        RefreshTarget(episode.rating_key, 'item', str(episode), section_id, [episode])
+                        for episode in season_episodes
+                    )
+
+        saved = item_count - len(targets)
+        with self._lock:
+            self.saved += saved
+        if saved:
+            self.logger.info(f"  Collapsed {item_count} due items into {len(targets)} refresh requests ({saved} saved)")
+        return targets
@@ -0,0 +1,115 @@
+# plex_refresher/core/refresh_scheduler.py
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+from plex_refresher.models.tba_item import TBAItem
+
+@dataclass
+class ScheduleEntry:
+    item: TBAItem
+    section_id: str
+    next_due: float
+    attempts: int = 0
+
+class RefreshScheduler:
+    """Priority queue of pending refreshes keyed by next-due time, with exponential backoff.
+
+    Newly matched items are due immediately and sort ahead of retries. Items that are still
+    TBA after a refresh are pushed back by base * 2^attempts seconds (capped, with jitter)
+    until they resolve and are forgotten.
+    """
+
+    def __init__(self, base_delay: float, max_delay: float, jitter: float, logger: logging.Logger):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+        self.logger = logger
+        self._entries: Dict[Tuple[str, str], ScheduleEntry] = {}
+        self._heap: List[Tuple[float, int, int, Tuple[str, str]]] = []
+        self._counter = itertools.count()
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _push(self, entry: ScheduleEntry, is_new: bool):
+        key = (entry.section_id, entry.item.rating_key)
+        heapq.heappush(self._heap, (entry.next_due, 0 if is_new else 1, next(self._counter), key))
+
+    def backoff_delay(self, attempts: int) -> float:
+        delay = min(self.max_delay, self.base_delay * (2 ** max(0, attempts - 1)))
+        return delay * random.uniform(1 - self.jitter, 1 + self.jitter)
+
+    def observe(self, section_id: str, items: Iterable[TBAItem],
+                history: Optional[Dict[str, Tuple[int, Optional[float]]]] = None):
+        """Track matched items; unknown ones are seeded from refresh history or made due now"""
+        now = time.time()
+        history = history or {}
+        with self._lock:
+            for item in items:
+                entry = self._entries.get((section_id, item.rating_key))
+                if entry:
+                    entry.item = item
+                    continue
+
+                attempts, last_refreshed = history.get(item.rating_key, (0, None))
+                is_new = not attempts or last_refreshed is None
+                next_due = now if is_new else last_refreshed + self.backoff_delay(attempts)
+                entry = ScheduleEntry(item=item, section_id=section_id, next_due=next_due, attempts=attempts)
+                self._entries[(section_id, item.rating_key)] = entry
+                self._push(entry, is_new)
+
+    def pop_due(self, now: Optional[float] = None) -> List[ScheduleEntry]:
+        """Remove and return every entry that is due, new items first"""
+        now = now or time.time()
+        due = []
+        with self._lock:
+            while self._heap and self._heap[0][0] <= now:
+                next_due, _, _, key = heapq.heappop(self._heap)
+                entry = self._entries.get(key)
+                # Skip stale heap slots left behind by forget() or reschedule()
+                if entry is None or entry.next_due != next_due:
+                    continue
+                entry.next_due = float('inf')
+                due.append(entry)
+        return due
+
+    def reschedule(self, section_id: str, rating_key: str):
+        """Back off an item that was refreshed but is still TBA"""
+        with self._lock:
+            entry = self._entries.get((section_id, str(rating_key)))
+            if entry is None:
+                return
+            entry.attempts += 1
+            delay = self.backoff_delay(entry.attempts)
+            entry.next_due = time.time() + delay
+            self._push(entry, is_new=False)
+        self.logger.debug(f"  {entry.item} still unresolved after {entry.attempts} refreshes, next try in {delay:.0f}s")
+
+    def reschedule_unverified(self, section_id: str, rating_keys: Iterable[str]):
+        """Back off popped items whose re-check failed, as if they were still TBA.
+
+        pop_due() parks entries until their outcome is known; without this they would never be due again.
+        """
+        with self._lock:
+            parked = [
+                rating_key for rating_key in rating_keys
+                if getattr(self._entries.get((section_id, str(rating_key))), 'next_due', None) == float('inf')
+            ]
+        for rating_key in parked:
+            self.reschedule(section_id, rating_key)
+
+    def forget(self, section_id: str, rating_keys: Iterable[str]):
+        with self._lock:
+            for rating_key in rating_keys:
+                self._entries.pop((section_id, str(rating_key)), None)
+
+    def next_due(self) -> Optional[float]:
+        with self._lock:
+            pending = [entry.next_due for entry in self._entries.values() if entry.next_due != float('inf')]
+        return min(pending) if pending else None
@@ -1,170 +1,721 @@
+import signal
 import sys
+import threading
 import time
 import logging
-from typing import Dict, List
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from plex_refresher.utils.atomic_file import write_json_atomic
 from plex_refresher.utils.config_loader import ConfigLoader
-from plex_refresher.utils.logging_setup import LoggingSetup
+from plex_refresher.utils.config_watcher import RESTART_SECTIONS, ConfigWatcher, changed_sections, matcher_changed
+from plex_refresher.utils.logging_setup import ITEM_LOGGER, LoggingSetup
+from plex_refresher.utils.title_matcher import TitleMatcher
+from plex_refresher.utils.metrics import RefresherMetrics
 from plex_refresher.core.plex_client import PlexClient
+from plex_refresher.core.section_scanner import LEAN_LISTING, NEWEST_FIRST, SectionScanner, ScanStats
+from plex_refresher.core.raw_scanner import RawSectionScanner, RawItem, HYDRATE_BATCH_SIZE
+from plex_refresher.core.refresh_dispatcher import RefreshDispatcher, RefreshResult
+from plex_refresher.core.refresh_scheduler import RefreshScheduler
+from plex_refresher.core.refresh_planner import RefreshPlanner, RefreshTarget
+from plex_refresher.core.scan_executor import ScanExecutor, ScanJob
+from plex_refresher.core.match_pipeline import MatchPipeline, MatchSummary, batched
+from plex_refresher.core.guid_deduper import GuidDeduper
+from plex_refresher.core.load_monitor import LoadMonitor
+from plex_refresher.core.title_cache import TitleCache
 from plex_refresher.models.tba_item import TBAItem
+from plex_refresher.storage.watermark_store import WatermarkStore
+from plex_refresher.storage.tba_index import TBAIndex
+from plex_refresher.storage.library_schedule import LibraryScheduleStore
+from plex_refresher.storage.cycle_checkpoint import CycleCheckpoint
+
+if TYPE_CHECKING:
+    # These pull in aiohttp, so they are imported where used to keep start-up fast
+    from plex_refresher.core.async_plex_client import AsyncPlexClient, AsyncRunner
+    from plex_refresher.core.event_listener import ItemEvent
+
+class ShutdownRequested(Exception):
+    """Raised inside scans once SIGTERM has been received"""
+
+def _filter_rejected(error: Exception) -> bool:
+    """Whether Plex answered 400 Bad Request, from plexapi, requests or aiohttp"""
+    # plexapi is already loaded by the time one of its errors can reach here
+    from plexapi.exceptions import BadRequest
+    if isinstance(error, BadRequest):
+        return True
+    status = getattr(getattr(error, 'response', None), 'status_code', None) or getattr(error, 'status', None)
+    return status == 400
 
 class PlexMetadataRefresher:
-    def __init__(self):
-        self.config = ConfigLoader.load_and_validate()
-        self.logger = LoggingSetup.setup_logging(self.config)
+    def __init__(self, config: Optional[Dict] = None, log_file: bool = True, config_path: Optional[Path] = None,
+                 read_only: bool = False):
+        self.config_path = config_path or ConfigLoader.default_path()
+        self.config = config or ConfigLoader.load_and_validate(self.config_path)
+        self.logger = LoggingSetup.setup_logging(self.config, log_file=log_file)
+        # Per-item lines go through a child logger so logging.item_lines_per_second can limit them
+        self.item_logger = self.logger.getChild(ITEM_LOGGER)
         self.dry_run = self.config['refresh'].get('dry_run', True)
-        self.plex_client = PlexClient(
-            self.config['plex']['url'],
-            self.config['plex']['token'],
+        self.metrics = RefresherMetrics()
+        self.metrics_server = None
+        self._stopping = threading.Event()
+        self._cycle_scans: List[Dict] = []
+        self._cycle_lock = threading.Lock()
+        self.matcher = TitleMatcher.from_config(self.config['search'])
+        if self.config['search']['method'] == 'quick' and len(self.matcher.literals) < len(self.matcher.patterns):
+            self.logger.warning("Regex search patterns cannot be sent to Plex and are only applied by deep search")
+        # A read-only run (the scan command) keeps its matches in memory and leaves data/state untouched
+        index_path = ':memory:' if read_only else ConfigLoader.data_dir() / 'state' / 'tba_index.db'
+        self.index = TBAIndex(index_path, self.logger)
+        self.scheduler = RefreshScheduler(
+            self.config['refresh']['backoff_base_seconds'],
+            self.config['refresh']['backoff_max_seconds'],
+            self.config['refresh']['backoff_jitter'],
             self.logger
         )
+        self.deduper = GuidDeduper(self.logger)
+        self.planner = RefreshPlanner(
+            self.config['refresh']['season_refresh_threshold'],
+            self.config['refresh']['show_refresh_threshold'],
+            self.logger
+        )
+        self.watermarks = self._create_watermarks()
+        self.library_schedule = self._create_library_schedule()
+        self.checkpoint = self._create_checkpoint()
+        self.plex_clients = [self._create_client(server) for server in self.config['plex']['servers']]
+        self.clients_by_machine: Dict[str, PlexClient] = {}
+        self.async_runner = None
+        self.async_clients: Dict[str, 'AsyncPlexClient'] = {}
+        self._async_lock = threading.Lock()
+        self._show_cache: Dict[Tuple[str, str], object] = {}
+        self._show_lock = threading.Lock()
+        # Servers that rejected a title filter ORing several patterns
+        self._per_pattern_servers: Set[str] = set()
+        self.scan_executor = self._create_scan_executor()
+        self.load_monitor = self._create_load_monitor()
+        self.config_watcher = None
+        self.title_cache = self._create_title_cache()
+        # Set by the CLI: scan only these library titles, and stream matches and refresh results
+        self.library_filter: Optional[Set[str]] = None
+        self.on_match: Optional[Callable[[str, str, str, List[TBAItem]], None]] = None
+        self.on_refresh: Optional[Callable[[RefreshResult], None]] = None
         
         if self.dry_run:
             self.logger.info("=== DRY RUN MODE - NO CHANGES WILL BE MADE ===")
 
-    def get_tba_items(self, library) -> List[TBAItem]:
+    def _create_client(self, server: Dict) -> PlexClient:
+        plex_config = self.config['plex']
+        return PlexClient(server['url'], server['token'], self.logger,
+                          name=server['name'], libraries=server.get('libraries'),
+                          connect_retries=plex_config['connect_retries'],
+                          connect_retry_delay=plex_config['connect_retry_delay_seconds'],
+                          reconnect_max_delay=plex_config['reconnect_max_delay_seconds'],
+                          section_cache_ttl=plex_config['section_cache_ttl_seconds'],
+                          pool_size=plex_config['max_connections'],
+                          metrics=self.metrics)
+
+    def _create_watermarks(self) -> Optional[WatermarkStore]:
+        if not self.config['refresh'].get('incremental', False):
+            return None
+        return WatermarkStore(ConfigLoader.data_dir() / 'state' / 'watermarks.json', self.logger)
+
+    def _create_library_schedule(self) -> Optional[LibraryScheduleStore]:
+        if not self.config['refresh']['adaptive_schedule'] or self.dry_run:
+            return None
+        return LibraryScheduleStore(
+            ConfigLoader.data_dir() / 'state' / 'library_schedule.json',
+            self.config['refresh']['interval_seconds'],
+            self.config['refresh']['max_library_interval_seconds'],
+            self.config['refresh']['scan_cost_target_seconds'],
+            self.logger
+        )
+
+    def _create_checkpoint(self) -> Optional[CycleCheckpoint]:
+        if not self.config['checkpoint']['enabled'] or self.dry_run:
+            return None
+        return CycleCheckpoint(
+            ConfigLoader.data_dir() / 'state' / 'checkpoint.json',
+            self.config['checkpoint']['max_age_seconds'],
+            self.config['checkpoint']['save_interval_seconds'],
+            self.logger
+        )
+
+    def _create_scan_executor(self) -> ScanExecutor:
+        return ScanExecutor(
+            self.config['search']['max_parallel_scans'],
+            self.config['search']['max_scans_per_server'],
+            self.logger
+        )
+
+    def _create_load_monitor(self) -> Optional[LoadMonitor]:
+        if not self.config['throttle']['enabled']:
+            return None
+        return LoadMonitor(
+            self.plex_clients,
+            self.config['throttle'],
+            self._refresh_rate(),
+            self.config['refresh']['max_in_flight'],
+            self.logger
+        )
+
+    def _create_title_cache(self) -> Optional[TitleCache]:
+        reload_config = self.config['reload']
+        return TitleCache() if reload_config['enabled'] and reload_config['cache_titles'] else None
+
+    def get_tba_items(self, client: PlexClient, library, stats: ScanStats = None,
+                      filters: Dict[str, str] = None, start: int = 0) -> Iterator[TBAItem]:
+        """Yield matches as the library is scanned, so callers never hold a whole library of results.
+
+        start resumes a deep listing part way through; see _resume_offset for when that applies.
+        """
         search_method = self.config['search']['method']
+        stats = stats or ScanStats(library.title)
+        if self.config['search']['backend'] == 'raw':
+            return self._timed('raw_search', self._raw_search(client, library, stats, filters, start))
+        if self.config['search']['backend'] == 'async':
+            return self._timed('async_search', self._async_search(client, library, stats, filters))
         if search_method == 'quick':
-            return self._quick_search(library)
+            return self._timed('quick_search', self._quick_search(client, library, stats))
         else:
-            return self._deep_search(library)
+            return self._timed('deep_search', self._deep_search(client, library, stats, filters, start))
 
-    def _quick_search(self, library) -> List[TBAItem]:
-        """Perform a quick search using Plex's search API"""
-        tba_items = []
-        patterns = self.config['search']['patterns']
+    def _timed(self, operation: str, items: Iterator[TBAItem]) -> Iterator[TBAItem]:
+        # The searches are generators, so the timer has to span their iteration
+        with self.metrics.time(operation):
+            yield from items
+
+    def _quick_search(self, client: PlexClient, library, stats: ScanStats) -> Iterator[TBAItem]:
+        """Perform a quick search: Plex filters the library by title and the results are matched locally"""
+        libtype = 'movie' if library.type == 'movie' else 'episode'
+        scanner = SectionScanner(client.plex, self.config['search']['page_size'], self.logger, self._pacer(client))
+        failed_results = 0
+        duplicates = 0
+        seen_keys = set()
         
         try:
             self.logger.info(f"Quick searching library: {library.title}")
             self.logger.info(f"Library key: {library.key}")  # Log the library identifier
+            self.logger.info(f"  Searching for: {' OR '.join(repr(p) for p in self.matcher.literals)}")
             
-            for pattern in patterns:
-                self.logger.info(f"  Searching for pattern: '{pattern}'")
-                
-                # Log the actual search URL being used
-                search_url = f"{self.plex_client.url}/library/sections/{library.key}/search?query={pattern}&type={'4' if library.type == 'show' else '1'}"
-                self.logger.info(f"  Search URL: {search_url}")
-                
-                # Use the Plex API's search functionality
-                if library.type == 'show':
-                    # Type 4 is for episodes
-                    results = library.search(title=pattern, libtype='episode')
-                else:
-                    # Type 1 is for movies
-                    results = library.search(title=pattern, libtype='movie')
-
-                if results:
-                    self.logger.info(f"    Found {len(results)} items matching '{pattern}'")
-                    
-                    for item in results:
-                        try:
-                            if library.type == 'movie':
-                                self.logger.info(f"      Found movie: {item.title} ({getattr(item, 'year', 'Unknown')})")
-                                tba_items.append(TBAItem.from_movie(item))
-                            elif hasattr(item, 'type') and item.type == 'episode':
-                                self.logger.info(
-                                    f"      Found episode: {item.grandparentTitle} - "
-                                    f"S{item.seasonNumber:02d}E{item.episodeNumber:02d} - {item.title}"
-                                )
-                                tba_items.append(TBAItem.from_episode(item, item.show()))
-                        except Exception as e:
-                            self.logger.error(f"Error processing search result: {str(e)}")
-                else:
-                    self.logger.info(f"    No items found matching '{pattern}'")
-
-            self.logger.info(f"  Total items found in {library.title}: {len(tba_items)}")
+            passes = self._quick_passes(client, None, lambda filters: scanner.iter_items(library, libtype, stats, filters))
+            for item in passes:
+                # A title such as "TBA/TBD" is returned by each per-pattern query; refresh it once
+                if str(item.ratingKey) in seen_keys:
+                    duplicates += 1
+                    continue
+                # Plex filters by substring; the matcher then applies word boundaries and exclusions
+                pattern = self.matcher.match(item.title, getattr(item, 'grandparentTitle', None))
+                if not pattern:
+                    self.logger.debug(f"      Skipping partial or excluded match: {item.title}")
+                    continue
+                try:
+                    if libtype == 'movie':
+                        self.item_logger.info(f"      Found movie: {item.title} ({getattr(item, 'year', 'Unknown')})")
+                        match = TBAItem.from_movie(item)
+                    else:
+                        self.item_logger.info(
+                            f"      Found episode: {item.grandparentTitle} - "
+                            f"S{item.seasonNumber:02d}E{item.episodeNumber:02d} - {item.title}"
+                        )
+                        # The listing already carries the show title; only look it up when it does not
+                        show = None if item.grandparentTitle else self._cached_show(client, item.grandparentRatingKey)
+                        match = TBAItem.from_episode(item, show)
+                except Exception as e:
+                    failed_results += 1
+                    self.logger.error(f"Error processing search result: {str(e)}")
+                    continue
+                seen_keys.add(match.rating_key)
+                yield match
+            
+            self.logger.info(f"  Total items found in {library.title}: {len(seen_keys)} ({duplicates} duplicates merged)")
+            stats.completed = stats.completed and failed_results == 0
                     
         except Exception as e:
+            stats.completed = False
             self.logger.error(f"Error searching items in library {library.title}: {str(e)}")
             self.logger.debug("Detailed error: ", exc_info=True)
         
-        return tba_items
+        self.logger.info(f"  Quick search stats for {stats}")
 
-    def _deep_search(self, library) -> List[TBAItem]:
-        """Perform a deep search by scanning all items"""
-        tba_items = []
-        patterns = self.config['search']['patterns']
-        case_sensitive = self.config['search'].get('case_sensitive', False)
-        include_full_title = self.config['search'].get('include_full_title', False)
+    def _quick_filters(self, filters: Optional[Dict[str, str]], combined: bool) -> List[Dict[str, str]]:
+        """Server-side filters for a quick search, one listing each"""
+        if not combined:
+            return [{**(filters or {}), **LEAN_LISTING, 'title': pattern} for pattern in self.matcher.literals]
+        # Plex ORs comma-separated filter values, so every pattern fits in one listing
+        return [{**(filters or {}), **LEAN_LISTING, 'title': value} for value in self.matcher.title_filters()]
+
+    def _quick_passes(self, client: PlexClient, filters: Optional[Dict[str, str]],
+                      list_pass: Callable[[Dict[str, str]], Iterator]) -> Iterator:
+        """Yield what list_pass lists for each quick search filter.
+
+        A server that rejects the combined filter with 400 Bad Request is searched with one
+        plain title filter per pattern instead, for the rest of the process.
+        """
+        # Libraries of a server are scanned concurrently, so decide once which filters this scan sends
+        combined = client.name not in self._per_pattern_servers
+        for pass_filters in self._quick_filters(filters, combined):
+            listed = False
+            try:
+                for result in list_pass(pass_filters):
+                    listed = True
+                    yield result
+            except Exception as e:
+                if listed or not combined or not _filter_rejected(e):
+                    raise
+                if client.name not in self._per_pattern_servers:
+                    self._per_pattern_servers.add(client.name)
+                    self.logger.warning(
+                        f"[{client.name}] Server rejected the combined title filter ({str(e)}) - "
+                        f"quick searches will query one pattern at a time"
+                    )
+                yield from self._quick_passes(client, filters, list_pass)
+                return
+
+    def _cached_show(self, client: PlexClient, rating_key):
+        """Show objects fetched at most once per server and cycle"""
+        key = (client.name, str(rating_key))
+        with self._show_lock:
+            if key not in self._show_cache:
+                self._show_cache[key] = client.plex.fetchItem(int(rating_key))
+            return self._show_cache[key]
+
+    def _deep_search(self, client: PlexClient, library, stats: ScanStats,
+                     filters: Dict[str, str] = None, start: int = 0) -> Iterator[TBAItem]:
+        """Perform a deep search by listing every item of the library in pages"""
         episode_limit = self.config['search'].get('episode_scan_limit')
+        scanner = SectionScanner(client.plex, self.config['search']['page_size'], self.logger, self._pacer(client))
         
         try:
             if library.type == 'movie':
                 self.logger.info(f"Deep scanning movie library: {library.title}")
-                movies = library.all()
-                total_movies = len(movies)
-                self.logger.info(f"  Scanning {total_movies} movies")
                 
-                for idx, movie in enumerate(movies, 1):
-                    title = movie.title if case_sensitive else movie.title.upper()
-                    patterns_to_check = patterns if case_sensitive else [p.upper() for p in patterns]
-                    
-                    if any(pattern in title for pattern in patterns_to_check):
-                        self.logger.info(f"    Found matching movie ({idx}/{total_movies}): {movie.title} ({getattr(movie, 'year', 'Unknown')})")
-                        tba_items.append(TBAItem.from_movie(movie))
+                for idx, movie in enumerate(scanner.iter_items(library, 'movie', stats, filters, start), start + 1):
+                    pattern = self.matcher.match(movie.title)
+                    if pattern:
+                        self.item_logger.info(
+                            f"    Found matching movie ({idx}): {movie.title} ({getattr(movie, 'year', 'Unknown')}) "
+                            f"[{pattern}]"
+                        )
+                        yield TBAItem.from_movie(movie)
                     
                     if idx % 100 == 0:
-                        self.logger.info(f"    Processed {idx}/{total_movies} movies...")
+                        self.item_logger.info(f"    Processed {idx} movies...")
                 
             elif library.type == 'show':
-                shows = library.all()
-                total_shows = len(shows)
-                self.logger.info(f"Deep scanning TV library: {library.title} ({total_shows} shows)")
+                self.logger.info(f"Deep scanning TV library: {library.title}")
+                if episode_limit:
+                    # Keep the newest episodes of each show, which are the ones likely to be TBA
+                    self.logger.info(f"  Limited to the {episode_limit} newest episodes per show")
+                    filters = {**(filters or {}), **NEWEST_FIRST}
+                episodes_per_show = {}
                 
-                for show_idx, show in enumerate(shows, 1):
-                    self.logger.info(f"  Scanning show {show_idx}/{total_shows}: {show.title}")
-                    episodes = show.episodes()
-                    
+                for episode in scanner.iter_items(library, 'episode', stats, filters, start):
                     if episode_limit:
-                        episodes = episodes[:episode_limit]
-                        self.logger.info(f"    Limited to {episode_limit} episodes per show")
+                        seen = episodes_per_show.get(episode.grandparentRatingKey, 0)
+                        if seen >= episode_limit:
+                            continue
+                        episodes_per_show[episode.grandparentRatingKey] = seen + 1
                     
-                    for episode in episodes:
-                        # Check episode title
-                        title = episode.title if case_sensitive else episode.title.upper()
-                        patterns_to_check = patterns if case_sensitive else [p.upper() for p in patterns]
-                        
-                        # If configured, also check full title (Show Name - Episode Title)
-                        if include_full_title:
-                            full_title = f"{show.title} - {episode.title}"
-                            title = full_title if case_sensitive else full_title.upper()
-                        
-                        if any(pattern in title for pattern in patterns_to_check):
-                            self.logger.info(f"    Found matching episode: S{episode.seasonNumber:02d}E{episode.episodeNumber:02d} - {episode.title}")
-                            tba_items.append(TBAItem.from_episode(episode, show))
+                    pattern = self.matcher.match(episode.title, episode.grandparentTitle)
+                    if pattern:
+                        self.item_logger.info(
+                            f"    Found matching episode: {episode.grandparentTitle} - "
+                            f"S{episode.seasonNumber:02d}E{episode.episodeNumber:02d} - {episode.title} [{pattern}]"
+                        )
+                        yield TBAItem.from_episode(episode)
                             
         except Exception as e:
             self.logger.error(f"Error deep scanning items in library {library.title}: {str(e)}")
         
-        return tba_items
+        self.logger.info(f"  Deep scan stats for {stats}")
 
-    def print_dry_run_summary(self, all_items: Dict[str, List[TBAItem]]):
+    def _raw_search(self, client: PlexClient, library, stats: ScanStats,
+                    filters: Dict[str, str] = None, start: int = 0) -> Iterator[TBAItem]:
+        """Match streamed raw records and keep compact records for the items that match"""
+        quick = self.config['search']['method'] == 'quick'
+        libtype = 'movie' if library.type == 'movie' else 'episode'
+        episode_limit = None if quick or libtype != 'episode' else self.config['search'].get('episode_scan_limit')
+        scanner = RawSectionScanner(
+            client, client.plex, self.config['search']['page_size'], self.logger, self._pacer(client)
+        )
+        
+        try:
+            self.logger.info(f"{'Quick' if quick else 'Deep'} scanning library (raw): {library.title}")
+            
+            # Quick search lets the server filter by title; deep search checks every record locally
+            if quick:
+                records = self._quick_passes(
+                    client, filters, lambda pass_filters: scanner.iter_items(library, libtype, stats, pass_filters)
+                )
+            else:
+                records = scanner.iter_items(
+                    library, libtype, stats, {**(filters or {}), **NEWEST_FIRST} if episode_limit else filters, start
+                )
+            
+            seen_keys = set()
+            episodes_per_show = {}
+            for record in records:
+                if episode_limit:
+                    seen = episodes_per_show.get(record.grandparent_rating_key, 0)
+                    if seen >= episode_limit:
+                        continue
+                    episodes_per_show[record.grandparent_rating_key] = seen + 1
+                
+                if record.rating_key in seen_keys:
+                    continue
+                pattern = self.matcher.match(record.title, record.grandparent_title)
+                if pattern:
+                    seen_keys.add(record.rating_key)
+                    yield self._match_from_record(record, pattern)
+        
+        except Exception as e:
+            stats.completed = False
+            self.logger.error(f"Error raw scanning items in library {library.title}: {str(e)}")
+            self.logger.debug("Detailed error: ", exc_info=True)
+        
+        self.logger.info(f"  Raw scan stats for {stats}")
+
+    def _async_search(self, client: PlexClient, library, stats: ScanStats,
+                      filters: Dict[str, str] = None) -> Iterator[TBAItem]:
+        """Like the raw search, but pages are fetched concurrently over the pooled async client"""
+        quick = self.config['search']['method'] == 'quick'
+        libtype = 'movie' if library.type == 'movie' else 'episode'
+        episode_limit = None if quick or libtype != 'episode' else self.config['search'].get('episode_scan_limit')
+        page_size = self.config['search']['page_size']
+        async_client = self._async_client(client)
+        
+        def list_pass(pass_filters):
+            # Pages of a pass are fetched concurrently, so throttling applies per pass
+            self._pace(client)
+            return self.async_runner.iterate(async_client.list_all(library.key, libtype, page_size, pass_filters, stats))
+        
+        started = time.monotonic()
+        try:
+            self.logger.info(f"{'Quick' if quick else 'Deep'} scanning library (async): {library.title}")
+            if quick:
+                pages = self._quick_passes(client, filters, list_pass)
+            else:
+                pages = list_pass({**(filters or {}), **NEWEST_FIRST} if episode_limit else filters)
+            seen_keys = set()
+            episodes_per_show = {}
+            for page in pages:
+                stats.requests += 1
+                for record in page:
+                    stats.items += 1
+                    stats.max_updated_at = max(stats.max_updated_at, record.updated_at or 0)
+                    if stats.titles is not None:
+                        stats.titles[record.rating_key] = TitleCache.entry(record.title, record.grandparent_title)
+                    if episode_limit:
+                        seen = episodes_per_show.get(record.grandparent_rating_key, 0)
+                        if seen >= episode_limit:
+                            continue
+                        episodes_per_show[record.grandparent_rating_key] = seen + 1
+                    if record.rating_key in seen_keys:
+                        continue
+                    pattern = self.matcher.match(record.title, record.grandparent_title)
+                    if pattern:
+                        seen_keys.add(record.rating_key)
+                        yield self._match_from_record(record, pattern)
+            stats.completed = True
+        except Exception as e:
+            self.logger.error(f"Error async scanning items in library {library.title}: {str(e)}")
+            self.logger.debug("Detailed error: ", exc_info=True)
+        finally:
+            stats.elapsed += time.monotonic() - started
+        
+        self.logger.info(f"  Async scan stats for {stats}")
+
+    def _pacer(self, client: PlexClient) -> Callable[[], float]:
+        """Hook the scanners call before each page request"""
+        return lambda: self._pace(client)
+
+    def _pace(self, client: PlexClient) -> float:
+        """Stop scans on shutdown and hold them back while the server is busy"""
+        if self._stopping.is_set():
+            raise ShutdownRequested("shutting down")
+        if self.load_monitor is None:
+            return 0.0
+        held = self.load_monitor.before_page(client.name)
+        self.metrics.slept('throttle', held)
+        return held
+
+    def _runner(self) -> 'AsyncRunner':
+        """Background event loop shared by the async clients and the event listener"""
+        from plex_refresher.core.async_plex_client import AsyncRunner
+        with self._async_lock:
+            if self.async_runner is None:
+                self.async_runner = AsyncRunner()
+            return self.async_runner
+
+    def _async_client(self, client: PlexClient) -> 'AsyncPlexClient':
+        """One pooled async client per server, shared by the scan and refresh paths"""
+        from plex_refresher.core.async_plex_client import AsyncPlexClient
+        self._runner()
+        with self._async_lock:
+            if client.name not in self.async_clients:
+                self.async_clients[client.name] = AsyncPlexClient(
+                    client.url, client.token, self.logger,
+                    max_per_host=self.config['plex']['max_connections'],
+                    timeout=self.config['plex']['timeout'],
+                    name=client.name,
+                    metrics=self.metrics
+                )
+            return self.async_clients[client.name]
+
+    def _match_from_record(self, record: RawItem, pattern: str) -> TBAItem:
+        """Build a compact TBAItem for a matched raw record without fetching a plexapi object"""
+        item = TBAItem.from_raw(record)
+        if item.type == 'movie':
+            self.item_logger.info(f"    Found matching movie: {item} [{pattern}]")
+        else:
+            self.item_logger.info(f"    Found matching episode: {item} [{pattern}]")
+        return item
+
+    def _section_id(self, client: PlexClient, library) -> str:
+        """Identify a library across servers for persisted state"""
+        return f"{client.plex.machineIdentifier}:{library.key}"
+
+    def _client_for(self, section_id: str) -> PlexClient:
+        return self.clients_by_machine[section_id.rsplit(':', 1)[0]]
+
+    def _scan_library(self, client: PlexClient, library,
+                      on_matches: Callable[[str, List[TBAItem]], None]) -> int:
+        """Scan a library, recording matches in the TBA index and passing them on in batches.
+
+        With incremental scanning on, only items changed since the library's watermark are
+        listed and the index's pending items are re-checked by ratingKey instead.
+        Returns the number of matches.
+        """
+        section_id = self._section_id(client, library)
+        incremental = self.watermarks is not None and self.config['search']['method'] == 'deep'
+        full_scan = not incremental or self.watermarks.full_scan_due(
+            section_id, self.config['refresh']['full_scan_interval_seconds']
+        )
+        filters = None
+        if incremental and full_scan:
+            self.logger.info(f"  Full scan of {library.title} (no watermark or fallback interval reached)")
+        elif incremental:
+            watermark = self.watermarks.get_watermark(section_id)
+            # Plex date filters are exclusive, so step back a second to include the watermark itself
+            filters = {'updatedAt>>': watermark - 1}
+            self.logger.info(f"  Incremental scan of {library.title} for items updated since {watermark}")
+        
+        stats = ScanStats(library.title)
+        start = self._resume_offset(section_id, library)
+        if start:
+            self.logger.info(f"  Resuming {library.title} at item {start} from the checkpoint")
+        scan_started = time.time()
+        recent_since = self._recent_since()
+        recent = 0
+        found = set()
+        yielded = 0
+        handled = 0
+        
+        def counted(items: Iterator[TBAItem]) -> Iterator[TBAItem]:
+            nonlocal yielded
+            for item in items:
+                yielded += 1
+                yield item
+        
+        def on_page(offset: int):
+            # Matches still waiting for a full batch would be lost if the offset moved past them
+            if yielded == handled:
+                self.checkpoint.scanned_to(section_id, offset)
+        
+        if self.checkpoint is not None:
+            stats.on_page = on_page
+        if self.title_cache is not None and self.config['search']['method'] == 'deep':
+            stats.titles = {}
+        # A scan runs on a single thread, so the client's per-thread count covers just this library
+        bytes_before = client.bytes_received()
+        for batch in batched(counted(self.get_tba_items(client, library, stats, filters, start))):
+            self.metrics.matches.inc(len(batch), server=client.name, library=library.title)
+            found.update(item.rating_key for item in batch)
+            recent += sum(1 for item in batch if item.aired and item.aired >= recent_since)
+            self.index.record_matches(section_id, library.title, batch)
+            on_matches(section_id, batch)
+            handled += len(batch)
+            if self.checkpoint is not None:
+                self.checkpoint.scanned_to(section_id, stats.offset)
+        stats.bytes += client.bytes_received() - bytes_before
+        self.logger.info(
+            f"  {library.title}: {stats.requests} listing requests, {stats.bytes / 1024:.1f} KiB received"
+        )
+        matches = len(found)
+        # A resumed scan did not see the items before its start offset this time
+        completed = stats.completed and not start
+        if stats.titles is not None:
+            # Incremental, resumed and interrupted scans list part of the library, so their titles are merged
+            self.title_cache.store(section_id, stats.titles, complete=completed and not filters)
+        if self._stopping.is_set():
+            return matches
+        pending = [key for key in self.index.pending_keys(section_id) if key not in found]
+        recheck = [] if full_scan else pending
+        if completed and pending and self.config['search']['method'] == 'quick':
+            # The title filters only list items whose own title contains a literal pattern, so items
+            # matched by a regex or through their show title say nothing by being absent
+            titles = self.index.pending_titles(section_id)
+            recheck = [key for key in pending if not self.matcher.listable(titles.get(key))]
+            unlisted = set(recheck)
+            pending = [key for key in pending if key not in unlisted]
+        elif completed and pending and self._episode_limited(library):
+            # Episodes past the per-show limit were skipped, so a missing one may still be TBA
+            recheck, pending = pending, []
+
+        if recheck:
+            for batch in batched(self._recheck_items(section_id, recheck)):
+                matches += len(batch)
+                self.index.record_matches(section_id, library.title, batch)
+                on_matches(section_id, batch)
+        if full_scan and completed and pending:
+            # A complete scan that no longer finds a pending item means it was resolved
+            self._resolve(section_id, pending)
+            self.logger.info(f"  {len(pending)} previously pending items no longer match")
+        
+        if incremental and completed:
+            self.watermarks.update(section_id, stats.max_updated_at, full_scan)
+        elif incremental:
+            self.logger.warning(f"  Scan of {library.title} did not cover the whole library - keeping previous watermark")
+        
+        self._record_scan(client, library, stats, matches)
+        if self.library_schedule is not None:
+            interval = self.library_schedule.record_scan(
+                section_id, scan_started, matches, recent, stats.elapsed, completed
+            )
+            self.logger.info(
+                f"  {library.title}: {matches} matches ({recent} recent) in {stats.elapsed:.1f}s - "
+                f"next scan in {interval / 3600:.1f}h"
+            )
+        
+        if self.checkpoint is not None and stats.completed:
+            self.checkpoint.finish_library(section_id)
+        return matches
+
+    def _resume_offset(self, section_id: str, library) -> int:
+        """Listing offset to resume a library from, for the scans that list it in a single stable pass"""
+        if self.checkpoint is None or self.config['search']['method'] != 'deep':
+            return 0
+        if self.config['search']['backend'] == 'async':
+            # Pages are fetched concurrently, so there is no single position to resume from
+            return 0
+        if self._episode_limited(library):
+            # The per-show episode counts would start over part way through the listing
+            return 0
+        return self.checkpoint.offset(section_id)
+
+    def _episode_limited(self, library) -> bool:
+        """Whether deep scans of this library skip episodes past search.episode_scan_limit"""
+        search_config = self.config['search']
+        return library.type == 'show' and search_config['method'] == 'deep' and bool(search_config.get('episode_scan_limit'))
+
+    def _record_scan(self, client: PlexClient, library, stats: ScanStats, matches: int):
+        method = self.config['search']['method']
+        rate = stats.items / stats.elapsed if stats.elapsed else 0.0
+        self.metrics.scan_seconds.observe(stats.elapsed, server=client.name, library=library.title, method=method)
+        self.metrics.items_scanned.inc(stats.items, server=client.name, library=library.title)
+        self.metrics.scan_bytes.inc(stats.bytes, server=client.name, library=library.title)
+        self.metrics.scan_items_per_second.set(rate, server=client.name, library=library.title)
+        with self._cycle_lock:
+            self._cycle_scans.append({
+                'server': client.name, 'library': library.title, 'method': method,
+                'backend': self.config['search']['backend'], 'seconds': round(stats.elapsed, 3),
+                'items': stats.items, 'items_per_second': round(rate, 1), 'requests': stats.requests,
+                'bytes': stats.bytes, 'matches': matches, 'completed': stats.completed
+            })
+
+    def _recent_since(self) -> str:
+        """Earliest air date that counts as recent; upcoming air dates compare greater and count too"""
+        days = self.config['refresh']['recent_air_days']
+        return time.strftime('%Y-%m-%d', time.localtime(time.time() - days * 86400))
+
+    def _recheck_items(self, section_id: str, rating_keys: List[str]) -> List[TBAItem]:
+        """Fetch pending items by ratingKey in batches, resolving those that no longer match"""
+        client = self._client_for(section_id)
+        still_matching = []
+        resolved = {}
+        for offset in range(0, len(rating_keys), HYDRATE_BATCH_SIZE):
+            batch = rating_keys[offset:offset + HYDRATE_BATCH_SIZE]
+            try:
+                items = self._fetch_items(client, batch)
+            except Exception as e:
+                self.logger.error(f"Error re-checking pending items: {str(e)}")
+                # Refreshed items waiting on this check would otherwise never be due again
+                self.scheduler.reschedule_unverified(section_id, batch)
+                continue
+            
+            titles = {item.rating_key: item.title for item in items}
+            matching_keys = set()
+            for item in items:
+                if self.matcher.match(item.title, item.show):
+                    still_matching.append(item)
+                    matching_keys.add(item.rating_key)
+            # Items missing from the response were deleted, which also takes them off the pending list
+            for rating_key in batch:
+                if rating_key not in matching_keys:
+                    resolved[rating_key] = titles.get(rating_key)
+        
+        self._resolve(section_id, resolved.keys(), resolved)
+        if rating_keys:
+            self.logger.info(
+                f"  Re-checked {len(rating_keys)} pending items: "
+                f"{len(still_matching)} still match, {len(resolved)} resolved"
+            )
+        return still_matching
+
+    def _fetch_items(self, client: PlexClient, rating_keys: List[str]) -> List[TBAItem]:
+        """Fetch movies and episodes by ratingKey, over the pooled async client with the async backend"""
+        if self.config['search']['backend'] == 'async':
+            records = self._runner().run(self._async_client(client).fetch_metadata(rating_keys))
+            return [TBAItem.from_raw(record) for record in records]
+        return [TBAItem.from_item(item) for item in client.plex.fetchItems(f"/library/metadata/{','.join(rating_keys)}")]
+
+    def _resolve(self, section_id: str, rating_keys: Iterable[str], titles: Dict[str, str] = None):
+        rating_keys = list(rating_keys)
+        self.metrics.refreshes_resolved.inc(len(rating_keys))
+        self.index.mark_resolved(section_id, rating_keys, titles)
+        self.scheduler.forget(section_id, rating_keys)
+        if self.title_cache is not None and titles:
+            # Keep cached titles current so a later re-match does not find fixed items again
+            self.title_cache.retitle(section_id, {key: titles.get(key) for key in rating_keys})
+
+    def recheck_pending(self) -> Dict[str, List[TBAItem]]:
+        """Re-check every pending item in the index for the reachable servers without scanning"""
+        self._connect_servers()
+        results = {}
+        for section_id in self.index.pending_sections():
+            machine, section_key = section_id.rsplit(':', 1)
+            client = self.clients_by_machine.get(machine)
+            if client is None:
+                continue
+            if self.library_filter and self._library_title(client, section_key) not in self.library_filter:
+                continue
+            results[section_id] = self._recheck_items(section_id, self.index.pending_keys(section_id))
+            self._emit_matches(client.name, self._library_title(client, section_key), section_id, results[section_id])
+        return results
+
+    def print_dry_run_summary(self, summary: MatchSummary):
         self.logger.info("\n=== DRY RUN SUMMARY ===")
-        total_items = sum(len(items) for items in all_items.values())
+        total_items = summary.total
         
         patterns = self.config['search']['patterns']
         self.logger.info(f"\nSearching for: {', '.join(patterns)}")
         self.logger.info(f"Case sensitive: {self.config['search'].get('case_sensitive', False)}")
         self.logger.info(f"\nTotal matching items found: {total_items}")
+        if self.deduper.collapsed:
+            self.logger.info(
+                f"Copies of the same item in other libraries or servers: {self.deduper.collapsed} "
+                f"(only one copy of each would be refreshed)"
+            )
         
-        for library_name, items in all_items.items():
-            if not items:
+        for library_name, library in summary.libraries.items():
+            count = library.movies + library.episodes
+            if not count:
                 continue
                 
-            self.logger.info(f"\nLibrary: {library_name} ({len(items)} items)")
-            
-            # Group by type
-            movies = [item for item in items if item.type == 'movie']
-            episodes = [item for item in items if item.type == 'episode']
-            
-            if movies:
-                self.logger.info("\nMovies:")
-                for movie in movies:
-                    self.logger.info(f"- {movie}")
-                    
-            if episodes:
-                self.logger.info("\nTV Episodes:")
-                for episode in episodes:
-                    self.logger.info(f"- {episode}")
+            self.logger.info(f"\nLibrary: {library_name} ({count} items)")
+            self.logger.info(f"Movies: {library.movies}, TV Episodes: {library.episodes}")
+            for item in library.sample:
+                self.logger.info(f"- {item}")
+            if count > len(library.sample):
+                self.logger.info(f"... and {count - len(library.sample)} more (listed in the scan log above)")
 
         if total_items == 0:
             self.logger.info("\nNo matching items found in any library")
@@ -172,73 +723,732 @@ class PlexMetadataRefresher:
         self.logger.info("\nTo perform the actual refresh, set dry_run: false in config.yaml")
         self.logger.info("=== END DRY RUN SUMMARY ===\n")
 
-    def refresh_metadata(self):
+    def _refresh_rate(self) -> float:
+        refresh_config = self.config['refresh']
+        # Without an explicit rate, keep the historical pace of one refresh per delay_between_items
+        return refresh_config.get('requests_per_second') or 1 / refresh_config['delay_between_items']
+
+    def _create_dispatcher(self) -> RefreshDispatcher:
+        refresh_config = self.config['refresh']
+        return RefreshDispatcher(
+            self._refresh_target,
+            self._refresh_rate(),
+            refresh_config['max_in_flight'],
+            refresh_config['max_retries'],
+            self.logger,
+            max_queued=refresh_config['max_queued'],
+            on_result=self._record_refresh,
+            stop=self._stopping
+        )
+
+    def _refresh_target(self, target: RefreshTarget):
+        client = self._client_for(target.section_id)
+        if self.load_monitor is not None:
+            self.metrics.slept('throttle', self.load_monitor.acquire_refresh(client.name))
+        try:
+            self.metrics.refreshes_issued.inc(level=target.level)
+            with self.metrics.time('refresh'):
+                if self.config['search']['backend'] == 'async':
+                    self._runner().run(self._async_client(client).refresh(target.rating_key))
+                else:
+                    client.refresh_item(target.rating_key)
+        finally:
+            if self.load_monitor is not None:
+                self.load_monitor.release_refresh(client.name)
+
+    def _record_refresh(self, result: RefreshResult):
+        self.metrics.slept('rate_limit', result.waited)
+        if self.on_refresh is not None:
+            self.on_refresh(result)
+        if result.success:
+            self.metrics.refreshes_succeeded.inc(level=result.target.level)
+            for item in result.target.items:
+                self.index.record_refresh(result.target.section_id, item.rating_key)
+            if self.checkpoint is not None:
+                self.checkpoint.refreshed(result.target.section_id, [item.rating_key for item in result.target.items])
+
+    def _verify_refreshes(self, results: List[RefreshResult]):
+        """Re-check refreshed items and back off the ones whose title is still TBA"""
+        by_section = {}
+        for result in results:
+            for item in result.target.items:
+                if result.success:
+                    by_section.setdefault(result.target.section_id, []).append(item.rating_key)
+                else:
+                    self.scheduler.reschedule(result.target.section_id, item.rating_key)
+        if not by_section:
+            return
+        
+        # Give the metadata agents a moment to finish before reading the titles back
+        delay = self.config['refresh']['verify_delay_seconds']
+        self.logger.info(f"Verifying refreshed items in {delay} seconds...")
+        self.metrics.slept('verify_delay', delay)
+        time.sleep(delay)
+        
+        unresolved = 0
+        for section_id, rating_keys in by_section.items():
+            for item in self._recheck_items(section_id, rating_keys):
+                self.scheduler.reschedule(section_id, item.rating_key)
+                unresolved += 1
+        self.logger.info(
+            f"{unresolved} refreshed items are still TBA and will back off, "
+            f"{len(self.scheduler)} items scheduled in total"
+        )
+
+    def _recheck_mirrors(self, results: List[RefreshResult]):
+        """Re-check the held-back copies of refreshed items with a metadata fetch instead of refreshing them"""
+        by_section = {}
+        for result in results:
+            if not result.success:
+                continue
+            for item in result.target.items:
+                for section_id, mirror in self.deduper.mirrors_of(result.target.section_id, item.rating_key):
+                    by_section.setdefault(section_id, []).append(mirror.rating_key)
+        if not by_section:
+            return
+        
+        checked = 0
+        unresolved = 0
+        for section_id, rating_keys in by_section.items():
+            checked += len(rating_keys)
+            unresolved += len(self._recheck_items(section_id, rating_keys))
+        self.logger.info(
+            f"Re-checked {checked} mirrored copies of refreshed items: "
+            f"{checked - unresolved} resolved, {unresolved} still TBA"
+        )
+
+    def _connect_servers(self) -> List[PlexClient]:
+        connected = []
+        for client in self.plex_clients:
+            with self.metrics.time('connect'):
+                plex = client.connect()
+            if plex:
+                self.clients_by_machine[plex.machineIdentifier] = client
+                connected.append(client)
+            else:
+                self.logger.error(f"Could not connect to Plex server {client.name} - skipping it this cycle")
+        return connected
+
+    def _libraries_for(self, client: PlexClient) -> List:
+        if not client.libraries:
+            self.logger.info(f"[{client.name}] No specific libraries configured - processing all libraries")
+        else:
+            self.logger.info(f"[{client.name}] Processing configured libraries: {', '.join(client.libraries)}")
+        return self._selected_libraries(client)
+
+    def _selected_libraries(self, client: PlexClient) -> List:
+        """The server's configured libraries, narrowed by library_filter, that hold movies or shows"""
+        if not client.libraries:
+            libraries = client.sections()
+        else:
+            libraries = [client.section(name) for name in client.libraries]
+
+        if self.library_filter:
+            libraries = [lib for lib in libraries if lib.title in self.library_filter]
+        # Filter for movie and TV show libraries
+        return [lib for lib in libraries if lib.type in ('movie', 'show')]
+
+    def _selected_sections(self, clients: Dict[str, PlexClient]) -> Dict[str, Set[str]]:
+        """Section keys per server that scans cover, so item checks can skip everything else"""
+        sections = {}
+        for name, client in clients.items():
+            try:
+                sections[name] = {str(lib.key) for lib in self._selected_libraries(client)}
+            except Exception as e:
+                self.logger.error(f"[{name}] Error listing libraries: {str(e)}")
+                sections[name] = set()
+        return sections
+
+    def _library_due(self, client: PlexClient, library) -> bool:
+        if self.library_schedule is None:
+            return True
+        section_id = self._section_id(client, library)
+        if self.library_schedule.due(section_id):
+            return True
+        next_scan = self.library_schedule.next_scan(section_id)
+        self.logger.info(
+            f"Skipping {client.name}/{library.title} until its next scheduled scan in "
+            f"{(next_scan - time.time()) / 3600:.1f}h"
+        )
+        return False
+
+    def _queue_refreshes(self, dispatcher: RefreshDispatcher, section_id: str, items: List[TBAItem]):
+        """Refresh stage: schedule a batch of matches and submit whatever is due"""
+        if self._stopping.is_set():
+            # Left in the checkpoint for the next run
+            return
+        keys = [item.rating_key for item in items]
+        self.scheduler.observe(section_id, items, self.index.refresh_history(section_id, keys))
+        due = self.scheduler.pop_due()
+        if self.checkpoint is not None:
+            due_keys = {entry.item.rating_key for entry in due if entry.section_id == section_id}
+            self.checkpoint.settle(section_id, [key for key in keys if key not in due_keys])
+        if not due:
+            return
+        # Upcoming and recently aired items first; ISO dates sort chronologically as strings
+        due.sort(key=lambda entry: entry.item.aired or '', reverse=True)
+        self.logger.info(f"Queueing metadata refresh for {len(due)} due items")
+        for target in self.planner.plan((entry.item, entry.section_id) for entry in due):
+            if self.checkpoint is not None:
+                self.checkpoint.dispatch(target.section_id, [item.rating_key for item in target.items])
+            # Blocks while the dispatcher is saturated, which in turn fills the match queue
+            dispatcher.submit(target)
+
+    def _process_library(self, client: PlexClient, library, label: str, summary: MatchSummary,
+                         pipeline: Optional[MatchPipeline]) -> int:
+        """Scan one library, streaming its matches to the summary and the refresh stage"""
+        if self._stopping.is_set():
+            return 0
+        self.logger.info(f"\nProcessing library {client.name}/{library.title} ({library.type})")
+        
+        def on_matches(section_id: str, batch: List[TBAItem]):
+            summary.add(label, batch)
+            self._emit_matches(client.name, library.title, section_id, batch)
+            primaries = self.deduper.claim(section_id, batch)
+            if pipeline and primaries:
+                if self.checkpoint is not None:
+                    self.checkpoint.queue(section_id, [item.rating_key for item in primaries])
+                pipeline.put(section_id, primaries)
+        
+        matches = self._scan_library(client, library, on_matches)
+        self.logger.info(f"Completed scanning library: {client.name}/{library.title} ({matches} matches)\n")
+        return matches
+
+    def _emit_matches(self, server: str, library: str, section_id: str, items: List[TBAItem]):
+        if self.on_match is not None:
+            self.on_match(server, library, section_id, items)
+
+    def _requeue_checkpoint(self, pipeline: MatchPipeline):
+        """Hand the matches an interrupted cycle had not refreshed yet back to the refresh stage"""
+        pending = self.checkpoint.take_pending()
+        for section_id, keys in pending.items():
+            if section_id.rsplit(':', 1)[0] not in self.clients_by_machine:
+                continue
+            # Re-read them first; some may have been fixed by Plex since the checkpoint
+            items = self._recheck_items(section_id, keys)
+            self.logger.info(f"Re-queueing {len(items)} of {len(keys)} matches left pending by the interrupted cycle")
+            for batch in batched(items):
+                self.checkpoint.queue(section_id, [item.rating_key for item in batch])
+                pipeline.put(section_id, batch)
+
+    def _request_counts(self) -> Dict[str, int]:
+        """HTTP requests sent so far to each server, over both the plexapi and async sessions"""
+        counts = {client.name: client.request_count for client in self.plex_clients}
+        for name, async_client in self.async_clients.items():
+            counts[name] += async_client.requests
+        return counts
+
+    def refresh_metadata(self, exit_if_unreachable: bool = True):
+        """Run one scan and refresh cycle.
+
+        When no server can be reached, one-shot runs exit with status 1. The service passes
+        exit_if_unreachable=False and skips the cycle instead, so the circuit breakers keep their
+        reconnect backoff rather than starting over in a restarted container.
+        """
         self.logger.info("\nStarting metadata refresh scan...")
-        plex = self.plex_client.connect()
+        cycle_started = time.time()
+        metrics_before = self.metrics.snapshot()
+        self._cycle_scans = []
+        requests_before = self._request_counts()
+        self._show_cache.clear()
+        self.deduper.reset()
+        clients = self._connect_servers()
         
-        if not plex:
-            self.logger.error("Could not connect to Plex server. Exiting.")
+        if not clients and exit_if_unreachable:
+            self.logger.error("Could not connect to any Plex server. Exiting.")
             sys.exit(1)  # Exit with error status
+        if not clients:
+            self.logger.error("Could not connect to any Plex server - skipping this cycle")
+            return
+        self._start_load_monitor()
+        if self.checkpoint is not None and self.checkpoint.begin():
+            self.logger.info(f"Resuming from checkpoint - {self.checkpoint.summary()}")
 
+        finished = False
         try:
-            if 'libraries' not in self.config['plex']:
-                libraries = plex.library.sections()
-                self.logger.info("No specific libraries configured - processing all libraries")
-            else:
-                libraries = [plex.library.section(name) for name in self.config['plex']['libraries']]
-                self.logger.info(f"Processing configured libraries: {', '.join(self.config['plex']['libraries'])}")
-
-            # Filter for movie and TV show libraries
-            valid_libraries = [lib for lib in libraries if lib.type in ('movie', 'show')]
-            total_libraries = len(valid_libraries)
+            dispatcher = None if self.dry_run else self._create_dispatcher()
+            pipeline = None
+            if dispatcher:
+                pipeline = MatchPipeline(
+                    lambda section_id, batch: self._queue_refreshes(dispatcher, section_id, batch),
+                    self.config['search']['match_queue_size'],
+                    self.logger
+                )
+            summary = MatchSummary()
+            self.planner.saved = 0
+            if pipeline and self.checkpoint is not None:
+                self._requeue_checkpoint(pipeline)
+            jobs = []
+            for client in clients:
+                for library in self._libraries_for(client):
+                    if self.checkpoint is not None and self.checkpoint.library_done(self._section_id(client, library)):
+                        self.logger.info(f"Skipping {client.name}/{library.title} - already scanned before the restart")
+                        continue
+                    if not self._library_due(client, library):
+                        continue
+                    label = library.title if len(clients) == 1 else f"{client.name}/{library.title}"
+                    jobs.append(ScanJob(
+                        client.name,
+                        library.title,
+                        lambda client=client, library=library, label=label:
+                            self._process_library(client, library, label, summary, pipeline)
+                    ))
             
-            self.logger.info(f"\nFound {total_libraries} valid libraries to scan")
+            self.logger.info(f"\nFound {len(jobs)} valid libraries to scan on {len(clients)} server(s)")
             self.logger.info(f"Search patterns: {', '.join(self.config['search']['patterns'])}")
             self.logger.info(f"Case sensitive: {self.config['search'].get('case_sensitive', False)}\n")
 
-            all_items = {}
+            try:
+                results = self.scan_executor.run(jobs)
+            finally:
+                if pipeline:
+                    pipeline.close()
+                    self.metrics.slept('backpressure', pipeline.blocked)
             
-            for index, library in enumerate(valid_libraries, 1):
-                self.logger.info(f"\nProcessing library {index}/{total_libraries}: {library.title}")
-                self.logger.info(f"Library type: {library.type}")
-                
-                tba_items = self.get_tba_items(library)
-                all_items[library.title] = tba_items
-                
-                if not self.dry_run and tba_items:
-                    self.logger.info(f"\nRefreshing metadata for {len(tba_items)} items in {library.title}")
-                    for item_index, item in enumerate(tba_items, 1):
-                        try:
-                            self.logger.info(f"  Refreshing {item_index}/{len(tba_items)}: {item}")
-                            item.item.refresh()
-                            self.logger.info(f"  Refresh complete, waiting {self.config['refresh']['delay_between_items']} seconds...")
-                            time.sleep(self.config['refresh']['delay_between_items'])
-                        except Exception as e:
-                            self.logger.error(f"  Failed to refresh {item}: {str(e)}")
-                
-                self.logger.info(f"Completed scanning library: {library.title}\n")
+            for timing in ScanExecutor.server_timings(results).values():
+                matches = sum(o.result or 0 for o in results if o.job.server == timing.server)
+                self.logger.info(
+                    f"Server {timing.server}: {timing.jobs} libraries ({timing.failed} failed), "
+                    f"{matches} matches, {timing.wall:.1f}s wall, {timing.busy:.1f}s scanning"
+                )
+            
+            if dispatcher:
+                self.logger.info("Waiting for queued refreshes to finish...")
+                refresh_results = dispatcher.drain()
+                self._verify_refreshes(refresh_results)
+                self._recheck_mirrors(refresh_results)
+                if self.deduper.collapsed:
+                    self.logger.info(f"{self.deduper.collapsed} mirrored copies were not refreshed separately")
+                if self.planner.saved:
+                    self.logger.info(f"Season/show grouping saved {self.planner.saved} refresh requests this cycle")
             
             if self.dry_run:
-                self.print_dry_run_summary(all_items)
+                self.print_dry_run_summary(summary)
+            finished = True
 
         except Exception as e:
             self.logger.error(f"Error during refresh: {str(e)}")
+        
+        if self.checkpoint is not None:
+            # The searches end quietly on shutdown, so a stopped cycle can still get this far
+            if finished and not self._stopping.is_set():
+                self.checkpoint.finish()
+            else:
+                self.checkpoint.save(force=True)
+        
+        for name, count in self._request_counts().items():
+            self.logger.info(f"Server {name}: {count - requests_before.get(name, 0)} HTTP requests this cycle")
+        if self.load_monitor is not None:
+            self.load_monitor.log_cycle()
+        self._finish_cycle(cycle_started, metrics_before)
+
+    def _finish_cycle(self, started: float, metrics_before: Dict):
+        finished = time.time()
+        self.metrics.last_cycle_seconds.set(finished - started)
+        self.metrics.last_cycle_timestamp.set(finished)
+        if not self.config['metrics']['cycle_report']:
+            return
+        report = {
+            'started': started,
+            'finished': finished,
+            'duration_seconds': round(finished - started, 3),
+            'scans': self._cycle_scans,
+            'metrics': self.metrics.delta(
+                metrics_before, self.metrics.snapshot(), skip=['plex_refresher_scan_items_per_second']
+            )
+        }
+        path = ConfigLoader.data_dir() / 'reports' / 'cycle_report.json'
+        try:
+            write_json_atomic(path, report, indent=2)
+        except Exception as e:
+            self.logger.error(f"Error writing cycle report {path}: {str(e)}")
 
-    def run(self):
-        """Run the refresh process either once (dry run) or continuously (wet run)."""
+    def _start_metrics_server(self):
+        metrics_config = self.config['metrics']
+        if not metrics_config['enabled'] or self.metrics_server is not None:
+            return
+        from plex_refresher.core.metrics_server import MetricsServer
+        self.metrics_server = MetricsServer(self.metrics, self.logger, metrics_config['host'], metrics_config['port'])
         try:
+            self.metrics_server.start(self._runner())
+        except Exception as e:
+            self.logger.error(f"Could not start metrics endpoint: {str(e)}")
+            self.metrics_server = None
+
+    def _start_load_monitor(self):
+        if self.load_monitor is not None and not self.load_monitor.running:
+            self.load_monitor.start()
+
+    def check_events(self, events: List['ItemEvent']):
+        """Re-check only the items named by notifications and refresh the ones that match"""
+        clients = {client.name: client for client in self._connect_servers()}
+        selected = self._selected_sections(clients)
+        by_section: Dict[Tuple[str, str], set] = {}
+        skipped = 0
+        for event in events:
+            client = clients.get(event.server)
+            if client is None:
+                continue
+            if event.section_key not in selected[event.server]:
+                # Same libraries as the scans: configured ones, narrowed by --library
+                skipped += 1
+                continue
+            keys = by_section.setdefault((event.server, event.section_key), set())
+            if event.libtype in ('show', 'season'):
+                # A new show or season is announced once; check each of its episodes
+                try:
+                    keys.update(str(e.ratingKey) for e in client.plex.fetchItems(f"/library/metadata/{event.rating_key}/allLeaves"))
+                except Exception as e:
+                    self.logger.error(f"Error listing episodes of {event.libtype} {event.rating_key}: {str(e)}")
+            else:
+                keys.add(event.rating_key)
+        if skipped:
+            self.logger.debug(f"Ignoring {skipped} events for libraries that are not scanned")
+        self._check_items(clients, by_section, f"{len(events)} events", 'Event')
+
+    def check_rating_keys(self, rating_keys: List[str]):
+        """Check the named items (episodes of shows and seasons) in the scanned libraries and refresh the ones that match
+
+        ratingKeys are local to a server, so the command line only allows this with a single --server.
+        """
+        clients = {client.name: client for client in self._connect_servers()}
+        selected = self._selected_sections(clients)
+        by_section: Dict[Tuple[str, str], set] = {}
+        skipped = 0
+        for name, client in clients.items():
+            for offset in range(0, len(rating_keys), HYDRATE_BATCH_SIZE):
+                batch = rating_keys[offset:offset + HYDRATE_BATCH_SIZE]
+                try:
+                    items = client.plex.fetchItems(f"/library/metadata/{','.join(batch)}")
+                except Exception as e:
+                    self.logger.error(f"[{name}] Error fetching items {', '.join(batch)}: {str(e)}")
+                    continue
+                for item in items:
+                    section_key = str(item.librarySectionID)
+                    if section_key not in selected[name]:
+                        skipped += 1
+                        continue
+                    keys = by_section.setdefault((name, section_key), set())
+                    if item.type in ('show', 'season'):
+                        keys.update(str(e.ratingKey) for e in item.episodes())
+                    else:
+                        keys.add(str(item.ratingKey))
+        if skipped:
+            self.logger.info(f"Ignoring {skipped} items in libraries that are not scanned")
+        self._check_items(clients, by_section, f"{len(rating_keys)} ratingKeys", 'Match')
+
+    def _check_items(self, clients: Dict[str, PlexClient], by_section: Dict[Tuple[str, str], set],
+                     source: str, label: str):
+        """Re-check the given items per (server, section key) and refresh the ones that match"""
+        by_section = {section: keys for section, keys in by_section.items() if keys}
+        if not by_section:
+            return
+        
+        self.logger.info(f"Checking {sum(len(k) for k in by_section.values())} items named by {source}")
+        dispatcher = None if self.dry_run else self._create_dispatcher()
+        for (server, section_key), keys in by_section.items():
+            client = clients[server]
+            section_id = f"{client.plex.machineIdentifier}:{section_key}"
+            matches = self._recheck_items(section_id, sorted(keys))
+            if not matches:
+                continue
+            library = self._library_title(client, section_key)
+            for item in matches:
+                self.item_logger.info(f"  {label} in {server}/{library}: {item}")
+            self._emit_matches(server, library, section_id, matches)
+            self.index.record_matches(section_id, library, matches)
+            if dispatcher:
+                self._queue_refreshes(dispatcher, section_id, matches)
+        
+        if dispatcher:
+            self._verify_refreshes(dispatcher.drain())
+        if self.load_monitor is not None:
+            self.load_monitor.log_cycle()
+
+    def _library_title(self, client: PlexClient, section_key: str) -> str:
+        return next((lib.title for lib in client.sections() if str(lib.key) == section_key), section_key)
+
+    def apply_config(self, config: Dict):
+        """Switch to a re-validated config between cycles.
+
+        Unchanged servers keep their session, and the index, schedules and caches are kept unless
+        the change invalidates them. New search patterns are applied to the cached titles of
+        libraries already listed instead of listing them again.
+        """
+        previous = self.config
+        changed = changed_sections(previous, config)
+        if not changed:
+            return
+        self.logger.info(f"Config file changed ({', '.join(sorted(changed))}) - applying it before the next cycle")
+        for section in RESTART_SECTIONS:
+            if section in changed:
+                self.logger.warning(f"Changes to the {section} section take effect after a restart")
+        if config['refresh']['dry_run'] != self.dry_run:
+            self.logger.warning("Switching dry_run takes effect after a restart")
+        
+        def differs(section: str, *fields: str) -> bool:
+            return any(previous[section].get(field) != config[section].get(field) for field in fields)
+        
+        # Build everything before swapping anything in, so a failure leaves the running setup alone
+        self.config = config
+        try:
+            matcher = TitleMatcher.from_config(config['search']) if matcher_changed(previous, config) else self.matcher
+            clients = self._reconcile_clients(previous) if 'plex' in changed else self.plex_clients
+            watermarks = self._create_watermarks() if differs('refresh', 'incremental') else self.watermarks
+            library_schedule = self.library_schedule
+            if differs('refresh', 'adaptive_schedule', 'interval_seconds', 'max_library_interval_seconds',
+                       'scan_cost_target_seconds'):
+                library_schedule = self._create_library_schedule()
+            checkpoint = self._create_checkpoint() if 'checkpoint' in changed else self.checkpoint
+            scan_executor = self.scan_executor
+            if differs('search', 'max_parallel_scans', 'max_scans_per_server'):
+                scan_executor = self._create_scan_executor()
+            title_cache = self.title_cache
+            if 'reload' in changed:
+                # Keep the titles already cached unless caching was switched off
+                title_cache = (self.title_cache or TitleCache()) if self._create_title_cache() else None
+        except Exception as e:
+            self.config = previous
+            self.logger.error(f"Could not apply the new config - keeping the running one: {str(e)}")
+            return
+        
+        clients_changed = clients is not self.plex_clients
+        dropped = [client for client in self.plex_clients if client not in clients]
+        self.plex_clients = clients
+        for client in dropped:
+            self._drop_client(client)
+        if differs('plex', 'max_connections', 'timeout'):
+            # Pools are sized at creation; the async clients are recreated on first use
+            for name in list(self.async_clients):
+                self._close_async_client(name)
+        refresh_config = config['refresh']
+        self.scheduler.base_delay = refresh_config['backoff_base_seconds']
+        self.scheduler.max_delay = refresh_config['backoff_max_seconds']
+        self.scheduler.jitter = refresh_config['backoff_jitter']
+        self.planner.season_threshold = refresh_config['season_refresh_threshold']
+        self.planner.show_threshold = refresh_config['show_refresh_threshold']
+        self.watermarks = watermarks
+        self.library_schedule = library_schedule
+        self.checkpoint = checkpoint
+        self.scan_executor = scan_executor
+        self.title_cache = title_cache
+        if clients_changed or 'throttle' in changed or \
+                differs('refresh', 'requests_per_second', 'delay_between_items', 'max_in_flight'):
+            if self.load_monitor is not None:
+                self.load_monitor.stop()
+            # Started again by the next cycle
+            self.load_monitor = self._create_load_monitor()
+        if 'metrics' in changed and self.metrics_server is not None:
+            self.metrics_server.stop()
+            self.metrics_server = None
+        if 'metrics' in changed:
+            self._start_metrics_server()
+        if matcher is not self.matcher:
+            self.matcher = matcher
+            self._apply_matcher_change()
+        self.logger.info("New config applied")
+
+    def _reconcile_clients(self, previous: Dict) -> List[PlexClient]:
+        """Clients for the new server list, reusing the connected ones whose settings did not change"""
+        shared = ('connect_retries', 'connect_retry_delay_seconds', 'reconnect_max_delay_seconds',
+                  'section_cache_ttl_seconds', 'max_connections')
+        shared_changed = any(previous['plex'].get(field) != self.config['plex'].get(field) for field in shared)
+        existing = {client.name: client for client in self.plex_clients}
+        clients = []
+        for server in self.config['plex']['servers']:
+            client = existing.get(server['name'])
+            if client is not None and not shared_changed and client.url == server['url'].rstrip('/') \
+                    and client.token == str(server['token']).strip():
+                client.libraries = server.get('libraries')
+                clients.append(client)
+            else:
+                self.logger.info(f"Server {server['name']} is new or its connection settings changed - connecting afresh")
+                clients.append(self._create_client(server))
+        return clients
+
+    def _drop_client(self, client: PlexClient):
+        for machine, known in list(self.clients_by_machine.items()):
+            if known is client:
+                del self.clients_by_machine[machine]
+                if self.title_cache is not None:
+                    self.title_cache.forget(
+                        [section_id for section_id in self.title_cache.sections() if section_id.startswith(f"{machine}:")]
+                    )
+        self._close_async_client(client.name)
+        if getattr(client, 'session', None) is not None:
+            client.session.close()
+
+    def _close_async_client(self, name: str):
+        async_client = self.async_clients.pop(name, None)
+        if async_client is not None and self.async_runner is not None:
+            self.async_runner.run(async_client.close())
+
+    def _apply_matcher_change(self):
+        """Re-match the libraries whose titles are cached and fully rescan the rest next cycle"""
+        covered = [
+            section_id for section_id in (self.title_cache.sections() if self.title_cache else [])
+            if section_id.rsplit(':', 1)[0] in self.clients_by_machine
+        ]
+        if self.checkpoint is not None:
+            # Progress saved under the old patterns cannot be resumed
+            self.checkpoint.finish()
+        if self.watermarks is not None:
+            self.watermarks.require_full_scan([s for s in self.watermarks.sections if s not in covered])
+        if self.library_schedule is not None:
+            self.library_schedule.make_due([s for s in self.library_schedule.sections if s not in covered])
+        if covered:
+            self._rematch_titles(covered)
+
+    def _rematch_titles(self, section_ids: List[str]):
+        """Apply the current patterns to cached titles, fetching only the items that newly match"""
+        started = time.monotonic()
+        dispatcher = None if self.dry_run else self._create_dispatcher()
+        new_matches = 0
+        dropped = 0
+        for section_id in section_ids:
+            matched = set(self.title_cache.rematch(section_id, self.matcher))
+            pending = self.index.pending_keys(section_id)
+            titles = self.title_cache.titles(section_id, pending)
+            no_longer = [key for key in titles if key not in matched]
+            if no_longer:
+                # Still titled the same, but no longer something the patterns look for
+                self._resolve(section_id, no_longer, titles)
+                dropped += len(no_longer)
+            new_keys = sorted(matched.difference(pending))
+            if not new_keys:
+                continue
+            items = self._recheck_items(section_id, new_keys)
+            new_matches += len(items)
+            client = self._client_for(section_id)
+            library = self._library_title(client, section_id.rsplit(':', 1)[1])
+            for item in items:
+                self.item_logger.info(f"  New match in {client.name}/{library}: {item}")
+            self._emit_matches(client.name, library, section_id, items)
+            self.index.record_matches(section_id, library, items)
+            if dispatcher:
+                self._queue_refreshes(dispatcher, section_id, items)
+        if dispatcher:
+            self._verify_refreshes(dispatcher.drain())
+        self.logger.info(
+            f"Re-matched cached titles of {len(section_ids)} libraries in {time.monotonic() - started:.2f}s: "
+            f"{new_matches} new matches, {dropped} pending items no longer match"
+        )
+
+    def _check_config(self):
+        if self.config_watcher is None:
+            return
+        config = self.config_watcher.poll()
+        if config is not None:
+            self.apply_config(config)
+
+    def _wait_for_next_cycle(self, interval: float):
+        """Sleep until the next cycle, applying config edits as they are saved"""
+        deadline = time.monotonic() + interval
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            if self.config_watcher is None:
+                time.sleep(remaining)
+                return
+            time.sleep(min(remaining, self.config['reload']['poll_interval_seconds']))
+            self._check_config()
+
+    def _run_events(self):
+        """Event mode: react to notifications and webhooks, with a slow full sweep as a safety net"""
+        from plex_refresher.core.event_listener import PlexEventListener
+        events_config = self.config['events']
+        self._connect_servers()
+        listener = PlexEventListener(
+            self.plex_clients,
+            self.logger,
+            websocket=events_config['websocket'],
+            webhook_host=events_config['webhook_host'],
+            webhook_port=events_config['webhook_port']
+        )
+        listener.start(self._runner())
+        sweep_interval = events_config['sweep_interval_seconds']
+        try:
+            while True:
+                self.refresh_metadata(exit_if_unreachable=False)
+                next_sweep = time.monotonic() + sweep_interval
+                self.logger.info(f"Full sweep completed. Waiting for Plex events; next sweep in {sweep_interval} seconds")
+                while time.monotonic() < next_sweep:
+                    waiting = time.monotonic()
+                    timeout = next_sweep - time.monotonic()
+                    if self.config_watcher is not None:
+                        timeout = min(timeout, self.config['reload']['poll_interval_seconds'])
+                    events = listener.collect(timeout, events_config['debounce_seconds'])
+                    self.metrics.slept('interval', time.monotonic() - waiting)
+                    if events:
+                        self.check_events(events)
+                    self._check_config()
+                self.logger.info("Sweep interval reached - starting full sweep")
+        finally:
+            listener.stop()
+
+    def stop(self):
+        """Abort the running cycle at the next page or refresh and flush the checkpoint"""
+        self._stopping.set()
+        if self.checkpoint is not None:
+            self.checkpoint.save(force=True)
+
+    def _handle_sigterm(self, signum, frame):
+        # Docker sends SIGTERM (through tini) and kills the container stop_grace_period later
+        if self._stopping.is_set():
+            return
+        self.logger.info("Received SIGTERM - saving checkpoint and stopping")
+        self.stop()
+        raise KeyboardInterrupt()
+
+    def close(self):
+        """Release pooled connections and background threads"""
+        if self.checkpoint is not None:
+            self.checkpoint.save(force=True)
+        if self.load_monitor is not None:
+            self.load_monitor.stop()
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+            self.metrics_server = None
+        if self.async_runner is not None:
+            for async_client in self.async_clients.values():
+                self.async_runner.run(async_client.close())
+            self.async_runner.stop()
+            self.async_runner = None
+            self.async_clients = {}
+
+    def run(self, once: bool = False):
+        """Run the refresh process either once (dry run or once=True) or continuously (wet run)."""
+        if threading.current_thread() is threading.main_thread():
+            signal.signal(signal.SIGTERM, self._handle_sigterm)
+        try:
+            self._start_metrics_server()
+            if self.config['reload']['enabled'] and not self.dry_run and not once:
+                self.config_watcher = ConfigWatcher(self.config_path, self.logger)
+                self.logger.info(f"Watching {self.config_watcher.path} for config changes")
+                if self.config['events']['enabled']:
+                    self.logger.info("Event mode keeps its notification connections until restart when plex settings change")
             if self.dry_run:
                 self.logger.info("Starting Plex metadata refresh service (DRY RUN - will run only once)")
                 self.refresh_metadata()
                 self.logger.info("Dry run completed. Exiting.")
                 sys.exit(0)  # Exit cleanly after dry run
+            elif once:
+                self.logger.info("Starting Plex metadata refresh (single cycle)")
+                self.refresh_metadata()
+                self.logger.info("Refresh cycle completed. Exiting.")
+                sys.exit(0)
+            elif self.config['events']['enabled']:
+                self.logger.info("Starting Plex metadata refresh service (event mode)")
+                self._run_events()
             else:
                 self.logger.info("Starting Plex metadata refresh service (continuous mode)")
                 while True:
-                    self.refresh_metadata()
+                    self.refresh_metadata(exit_if_unreachable=False)
                     interval = self.config['refresh']['interval_seconds']
                     self.logger.info(f"Refresh cycle completed. Sleeping for {interval} seconds until next refresh")
-                    time.sleep(interval)
+                    self.metrics.slept('interval', interval)
+                    self._wait_for_next_cycle(interval)
                     self.logger.info("Wake up - starting next refresh cycle")
                     
         except KeyboardInterrupt:
@@ -251,4 +1461,6 @@ class PlexMetadataRefresher:
                 time.sleep(60)
             else:
                 self.logger.info("Exiting due to error in dry run mode.")
-                sys.exit(1)
\ No newline at end of file
+                sys.exit(1)
+        finally:
+            self.close()
\ No newline at end of file
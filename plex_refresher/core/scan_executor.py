@@ -0,0 +1,87 @@
+# plex_refresher/core/scan_executor.py
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+@dataclass
+class ScanJob:
+    server: str
+    label: str
+    func: Callable[[], Any]
+
+@dataclass
+class ScanJobResult:
+    job: ScanJob
+    result: Any = None
+    error: Optional[str] = None
+    started: float = 0.0
+    finished: float = 0.0
+
+    @property
+    def elapsed(self) -> float:
+        return self.finished - self.started
+
+@dataclass
+class ServerTiming:
+    server: str
+    jobs: int = 0
+    failed: int = 0
+    busy: float = 0.0  # Sum of individual scan times
+    started: float = field(default=float('inf'))
+    finished: float = 0.0
+
+    @property
+    def wall(self) -> float:
+        return max(0.0, self.finished - self.started)
+
+class ScanExecutor:
+    """Runs library scans concurrently with a global limit and a per-server limit"""
+
+    def __init__(self, max_parallel: int, max_per_server: int, logger: logging.Logger):
+        self.max_parallel = max_parallel
+        self.max_per_server = max_per_server
+        self.logger = logger
+        self._server_slots: Dict[str, threading.Semaphore] = {}
+        self._slots_lock = threading.Lock()
+
+    def _slot(self, server: str) -> threading.Semaphore:
+        with self._slots_lock:
+            if server not in self._server_slots:
+                self._server_slots[server] = threading.Semaphore(self.max_per_server)
+            return self._server_slots[server]
+
+    def _run_job(self, job: ScanJob) -> ScanJobResult:
+        outcome = ScanJobResult(job)
+        with self._slot(job.server):
+            outcome.started = time.monotonic()
+            try:
+                outcome.result = job.func()
+            except Exception as e:
+                outcome.error = str(e)
+                self.logger.error(f"Scan of {job.server}/{job.label} failed: {str(e)}")
+            finally:
+                outcome.finished = time.monotonic()
+        return outcome
+
+    def run(self, jobs: List[ScanJob]) -> List[ScanJobResult]:
+        """Run every job and return the results in submission order"""
+        if not jobs:
+            return []
+        with ThreadPoolExecutor(max_workers=self.max_parallel, thread_name_prefix='scan') as executor:
+            futures = [executor.submit(self._run_job, job) for job in jobs]
+            return [future.result() for future in futures]
+
+    @staticmethod
+    def server_timings(results: List[ScanJobResult]) -> Dict[str, ServerTiming]:
+        timings: Dict[str, ServerTiming] = {}
+        for outcome in results:
+            timing = timings.setdefault(outcome.job.server, ServerTiming(outcome.job.server))
+            timing.jobs += 1
+            timing.failed += 1 if outcome.error else 0
+            timing.busy += outcome.elapsed
+            timing.started = min(timing.started, outcome.started)
+            timing.finished = max(timing.finished, outcome.finished)
+        return timings
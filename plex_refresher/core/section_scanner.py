@@ -0,0 +1,100 @@
+# plex_refresher/core/section_scanner.py
+import logging
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, Optional
+from plex_refresher.core.title_cache import TitleCache
+
+if TYPE_CHECKING:
+    # plexapi is slow to import, so it is imported where used
+    from plexapi.server import PlexServer
+
+# Plex metadata type ids used by /library/sections/{key}/all?type=
+LIBTYPE_IDS = {'movie': 1, 'show': 2, 'season': 3, 'episode': 4}
+# Listing order that puts upcoming and recently aired episodes ahead of the back catalogue
+NEWEST_FIRST = {'sort': 'originallyAvailableAt:desc'}
+# Leaves out the attributes and child elements matching never reads (Guid children are kept)
+LEAN_LISTING = {
+    'excludeFields': 'summary,tagline,thumb,art,parentThumb,grandparentThumb,grandparentArt,grandparentTheme',
+    'excludeElements': 'Media,Genre,Country,Director,Writer,Role,Collection,Label,Image,UltraBlurColors'
+}
+
+@dataclass
+class ScanStats:
+    library: str
+    requests: int = 0
+    bytes: int = 0  # Response bytes received
+    items: int = 0
+    elapsed: float = 0.0
+    max_updated_at: int = 0
+    completed: bool = False
+    offset: int = 0  # Listing position of the page being read
+    on_page: Optional[Callable[[int], None]] = None  # Called with the offset before each page request
+    titles: Optional[Dict] = None  # When set, collects ratingKey -> (title, show title) for the TitleCache
+
+    def observe(self, attrib: Dict[str, str]):
+        """Count a listed item and track the newest updatedAt seen for watermarking"""
+        self.items += 1
+        updated_at = attrib.get('updatedAt')
+        if updated_at and updated_at.isdigit():
+            self.max_updated_at = max(self.max_updated_at, int(updated_at))
+        if self.titles is not None:
+            self.titles[attrib.get('ratingKey')] = TitleCache.entry(attrib.get('title'), attrib.get('grandparentTitle'))
+
+    def page(self, offset: int):
+        self.offset = offset
+        if self.on_page:
+            self.on_page(offset)
+
+    def __str__(self):
+        return f"{self.library}: {self.items} items in {self.requests} requests, {self.elapsed:.2f}s"
+
+class SectionScanner:
+    """Lists every item of a given type in a library section using large pages"""
+
+    def __init__(self, plex: 'PlexServer', page_size: int, logger: logging.Logger,
+                 pace: Optional[Callable[[], float]] = None):
+        self.plex = plex
+        self.page_size = page_size
+        self.logger = logger
+        self.pace = pace  # Called before each page request; may block while the server is busy
+
+    def iter_items(self, library, libtype: str, stats: ScanStats,
+                   filters: Optional[Dict[str, str]] = None, start: int = 0) -> Iterator:
+        """Yield plexapi objects for every item of libtype from position start, one page request at a time"""
+        from plexapi.utils import joinArgs
+        from plexapi.video import Episode, Movie
+        params = {'type': LIBTYPE_IDS[libtype], 'includeGuids': 1, **(filters or {})}
+        key = f"/library/sections/{library.key}/all{joinArgs(params)}"
+        cls = {'movie': Movie, 'episode': Episode}[libtype]
+        started = time.monotonic()
+
+        try:
+            while True:
+                headers = {
+                    'X-Plex-Container-Start': str(start),
+                    'X-Plex-Container-Size': str(self.page_size)
+                }
+                stats.page(start)
+                if self.pace:
+                    self.pace()
+                data = self.plex.query(key, headers=headers)
+                stats.requests += 1
+                if data is None:
+                    break
+
+                page_size = len(data)
+                total = int(data.attrib.get('totalSize', start + page_size))
+                self.logger.debug(f"    Fetched {libtype} page {start}-{start + page_size} of {total}")
+
+                for elem in data:
+                    stats.observe(elem.attrib)
+                for item in self.plex.findItems(data, cls, initpath=key):
+                    yield item
+
+                start += page_size
+                if page_size == 0 or page_size < self.page_size or start >= total:
+                    break
+            stats.completed = True
+        finally:
+            stats.elapsed += time.monotonic() - started
@@ -0,0 +1,67 @@
+# plex_refresher/core/title_cache.py
+import sys
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+from plex_refresher.utils.title_matcher import TitleMatcher
+
+# ratingKey -> (title, show title) for one library
+SectionTitles = Dict[str, Tuple[str, Optional[str]]]
+
+class TitleCache:
+    """Titles of every item the deep scans listed, per library.
+
+    Lets a change of search patterns be applied to items already listed instead of listing
+    every library again. Show titles are interned, so the episodes of a show share one copy.
+    """
+
+    def __init__(self):
+        self._sections: Dict[str, SectionTitles] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        with self._lock:
+            return sum(len(titles) for titles in self._sections.values())
+
+    @staticmethod
+    def entry(title: Optional[str], show: Optional[str]) -> Tuple[str, Optional[str]]:
+        return title or '', sys.intern(show) if show is not None else None
+
+    def store(self, section_id: str, titles: SectionTitles, complete: bool):
+        """Keep a scan's titles; a complete listing replaces the library's entry, a partial one is merged"""
+        with self._lock:
+            if complete or section_id not in self._sections:
+                self._sections[section_id] = titles
+            else:
+                self._sections[section_id].update(titles)
+
+    def sections(self) -> List[str]:
+        with self._lock:
+            return list(self._sections)
+
+    def rematch(self, section_id: str, matcher: TitleMatcher) -> List[str]:
+        """ratingKeys of the cached items that match under matcher"""
+        with self._lock:
+            titles = list(self._sections.get(section_id, {}).items())
+        return [rating_key for rating_key, (title, show) in titles if matcher.match(title, show)]
+
+    def titles(self, section_id: str, rating_keys: Iterable[str]) -> Dict[str, str]:
+        with self._lock:
+            titles = self._sections.get(section_id, {})
+            return {key: titles[key][0] for key in rating_keys if key in titles}
+
+    def retitle(self, section_id: str, titles: Dict[str, Optional[str]]):
+        """Record titles seen since the scan; None drops an item that no longer exists"""
+        with self._lock:
+            cached = self._sections.get(section_id)
+            if cached is None:
+                return
+            for rating_key, title in titles.items():
+                if title is None:
+                    cached.pop(rating_key, None)
+                elif rating_key in cached:
+                    cached[rating_key] = (title, cached[rating_key][1])
+
+    def forget(self, section_ids: Iterable[str]):
+        with self._lock:
+            for section_id in section_ids:
+                self._sections.pop(section_id, None)
@@ -1,39 +1,102 @@
 # plex_refresher/models/tba_item.py
+import sys
 from dataclasses import dataclass
-from typing import Optional, Any
+from typing import Iterable, Optional
 
-@dataclass
+@dataclass(slots=True)
 class TBAItem:
+    """Compact record of a matched item, kept instead of the plexapi object it was built from"""
+    rating_key: str
     title: str
     type: str  # 'movie' or 'episode'
-    item: Any  # The actual Plex item
-    year: Optional[str] = None
+    year: Optional[int] = None
     show: Optional[str] = None
     season: Optional[int] = None
     episode: Optional[int] = None
+    parent_rating_key: Optional[str] = None  # Season, for episodes
+    grandparent_rating_key: Optional[str] = None  # Show, for episodes
+    guid: Optional[str] = None  # External id shared by copies of the item in other libraries or servers
+    aired: Optional[str] = None  # originallyAvailableAt as YYYY-MM-DD
 
     @classmethod
     def from_movie(cls, movie):
         return cls(
+            rating_key=str(movie.ratingKey),
             title=movie.title,
             type='movie',
-            year=getattr(movie, 'year', 'Unknown'),
-            item=movie
+            year=getattr(movie, 'year', None),
+            guid=dedupe_guid(getattr(movie, 'guid', None), [g.id for g in getattr(movie, 'guids', None) or []]),
+            aired=_date(getattr(movie, 'originallyAvailableAt', None))
         )
 
     @classmethod
-    def from_episode(cls, episode, show):
+    def from_episode(cls, episode, show=None):
         return cls(
+            rating_key=str(episode.ratingKey),
             title=episode.title,
             type='episode',
-            show=show.title,
+            show=_intern(show.title if show is not None else episode.grandparentTitle),
             season=episode.seasonNumber,
             episode=episode.episodeNumber,
-            item=episode
+            parent_rating_key=_intern(_key(episode.parentRatingKey)),
+            grandparent_rating_key=_intern(_key(episode.grandparentRatingKey)),
+            guid=dedupe_guid(getattr(episode, 'guid', None), [g.id for g in getattr(episode, 'guids', None) or []]),
+            aired=_date(getattr(episode, 'originallyAvailableAt', None))
+        )
+
+    @classmethod
+    def from_item(cls, item):
+        """Build from any movie or episode, reading the show title from the episode itself"""
+        if item.type == 'movie':
+            return cls.from_movie(item)
+        return cls.from_episode(item)
+
+    @classmethod
+    def from_raw(cls, record):
+        """Build from a RawItem read straight from a section listing, without a plexapi object"""
+        return cls(
+            rating_key=record.rating_key,
+            title=record.title,
+            type=record.type,
+            year=record.year,
+            show=_intern(record.grandparent_title),
+            season=record.season,
+            episode=record.episode,
+            parent_rating_key=_intern(record.parent_rating_key),
+            grandparent_rating_key=_intern(record.grandparent_rating_key),
+            guid=record.guid,
+            aired=_intern(record.aired)
         )
 
     def __str__(self):
         if self.type == 'movie':
-            return f"{self.title} ({self.year})"
+            return f"{self.title} ({self.year or 'Unknown'})"
         return f"{self.show} - S{self.season:02d}E{self.episode:02d} - {self.title}"
 
+
+# External id schemes in order of preference when several are attached to one item
+GUID_PREFERENCE = ('tvdb://', 'tmdb://', 'imdb://')
+LEGACY_AGENT_PREFIX = 'com.plexapp.agents.'
+
+def dedupe_guid(guid: Optional[str], external_ids: Iterable[str] = ()) -> Optional[str]:
+    """Pick the id used to recognise copies of an item: tvdb, tmdb or imdb, else the item's own guid"""
+    external_ids = list(external_ids)
+    for scheme in GUID_PREFERENCE:
+        for external_id in external_ids:
+            if external_id and external_id.startswith(scheme):
+                return external_id
+    if guid and guid.startswith(LEGACY_AGENT_PREFIX):
+        # com.plexapp.agents.thetvdb://123/1/2?lang=en -> thetvdb://123/1/2
+        guid = guid[len(LEGACY_AGENT_PREFIX):].split('?', 1)[0]
+    return guid or None
+
+def _key(value) -> Optional[str]:
+    return str(value) if value is not None else None
+
+def _date(value) -> Optional[str]:
+    # plexapi parses originallyAvailableAt into a datetime; keep the compact string form
+    return sys.intern(value.strftime('%Y-%m-%d')) if value is not None else None
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    # Episodes of one show share these strings, so keep a single copy of each
+    return sys.intern(value) if value is not None else None
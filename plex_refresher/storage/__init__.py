@@ -0,0 +1,7 @@
+# plex_refresher/storage/__init__.py
+from .watermark_store import WatermarkStore
+from .tba_index import TBAIndex
+from .library_schedule import LibraryScheduleStore
+from .cycle_checkpoint import CycleCheckpoint
+
+__all__ = ['WatermarkStore', 'TBAIndex', 'LibraryScheduleStore', 'CycleCheckpoint']
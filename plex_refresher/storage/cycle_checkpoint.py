@@ -0,0 +1,162 @@
+# plex_refresher/storage/cycle_checkpoint.py
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+from plex_refresher.utils.atomic_file import write_json_atomic
+
+class CycleCheckpoint:
+    """Persists the progress of the running refresh cycle so a restart can pick it up.
+
+    Records which libraries are finished, the listing offset reached in libraries still being
+    scanned, and matches handed to the refresh stage that have not been refreshed yet, split
+    into queued and dispatched. A cycle that finishes deletes the file; one that is
+    interrupted leaves it behind, and the next cycle resumes from it if it is no older than
+    max_age seconds.
+    """
+
+    def __init__(self, path: Path, max_age: float, save_interval: float, logger: logging.Logger):
+        self.path = Path(path)
+        self.max_age = max_age
+        self.save_interval = save_interval
+        self.logger = logger
+        self.state: Dict = {}
+        self.active = False
+        self._dirty = False
+        self._last_save = 0.0
+        # Reentrant so the SIGTERM handler can flush even if it interrupts a method on the main thread
+        self._lock = threading.RLock()
+
+    def _load(self) -> Optional[Dict]:
+        if not self.path.exists():
+            return None
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable checkpoint {self.path}: {str(e)}")
+            return None
+
+    def begin(self) -> bool:
+        """Start tracking a cycle, resuming a recent enough checkpoint; returns True when resuming"""
+        with self._lock:
+            state = self._load()
+            now = time.time()
+            if state and now - state.get('updated', 0) <= self.max_age:
+                self.state = state
+                resumed = True
+            else:
+                if state:
+                    self.logger.info(f"Discarding checkpoint from {time.ctime(state.get('updated', 0))} - too old to resume")
+                self.state = {'started': now, 'libraries': {}, 'queued': {}, 'dispatched': {}}
+                resumed = False
+            self.active = True
+            self._dirty = True
+            self.save(force=True)
+            return resumed
+
+    def finish(self):
+        """The cycle completed; nothing is left to resume"""
+        with self._lock:
+            self.active = False
+            self.state = {}
+            try:
+                self.path.unlink(missing_ok=True)
+            except Exception as e:
+                self.logger.error(f"Error removing checkpoint {self.path}: {str(e)}")
+
+    def save(self, force: bool = False):
+        """Write the checkpoint atomically, at most every save_interval seconds unless forced"""
+        with self._lock:
+            if not self.active or not self._dirty:
+                return
+            if not force and time.monotonic() - self._last_save < self.save_interval:
+                return
+            self.state['updated'] = time.time()
+            try:
+                write_json_atomic(self.path, self.state)
+                self._dirty = False
+                self._last_save = time.monotonic()
+            except Exception as e:
+                self.logger.error(f"Error saving checkpoint {self.path}: {str(e)}")
+
+    def _update(self, change):
+        with self._lock:
+            if not self.active:
+                return
+            change(self.state)
+            self._dirty = True
+            self.save()
+
+    def library_done(self, section_id: str) -> bool:
+        with self._lock:
+            return self.active and self.state['libraries'].get(section_id, {}).get('done', False)
+
+    def offset(self, section_id: str) -> int:
+        with self._lock:
+            return self.state['libraries'].get(section_id, {}).get('offset', 0) if self.active else 0
+
+    def scanned_to(self, section_id: str, offset: int):
+        """Every item listed before offset has been matched and handed on"""
+        self._update(lambda state: state['libraries'].setdefault(section_id, {}).update(offset=offset))
+
+    def finish_library(self, section_id: str):
+        def change(state):
+            state['libraries'][section_id] = {'done': True}
+        self._update(change)
+
+    def queue(self, section_id: str, rating_keys: Iterable[str]):
+        """Matches handed to the refresh stage"""
+        rating_keys = list(rating_keys)
+        def change(state):
+            queued = state['queued'].setdefault(section_id, [])
+            queued.extend(key for key in rating_keys if key not in queued)
+        self._update(change)
+
+    def settle(self, section_id: str, rating_keys: Iterable[str]):
+        """Queued matches the refresh stage decided not to refresh this cycle"""
+        rating_keys = set(rating_keys)
+        def change(state):
+            state['queued'][section_id] = [k for k in state['queued'].get(section_id, []) if k not in rating_keys]
+        self._update(change)
+
+    def dispatch(self, section_id: str, rating_keys: Iterable[str]):
+        """Queued matches submitted to the dispatcher"""
+        rating_keys = list(rating_keys)
+        def change(state):
+            state['queued'][section_id] = [k for k in state['queued'].get(section_id, []) if k not in rating_keys]
+            dispatched = state['dispatched'].setdefault(section_id, [])
+            dispatched.extend(key for key in rating_keys if key not in dispatched)
+        self._update(change)
+
+    def refreshed(self, section_id: str, rating_keys: Iterable[str]):
+        rating_keys = set(rating_keys)
+        def change(state):
+            state['dispatched'][section_id] = [k for k in state['dispatched'].get(section_id, []) if k not in rating_keys]
+        self._update(change)
+
+    def take_pending(self) -> Dict[str, List[str]]:
+        """Remove and return the matches still waiting for a refresh, queued or dispatched, per library"""
+        with self._lock:
+            if not self.active:
+                return {}
+            pending = {}
+            for bucket in ('queued', 'dispatched'):
+                for section_id, keys in self.state[bucket].items():
+                    pending.setdefault(section_id, []).extend(k for k in keys if k not in pending.get(section_id, []))
+                self.state[bucket] = {}
+            self._dirty = True
+            return {section_id: keys for section_id, keys in pending.items() if keys}
+
+    def summary(self) -> str:
+        with self._lock:
+            libraries = self.state.get('libraries', {})
+            done = sum(1 for lib in libraries.values() if lib.get('done'))
+            partial = sum(1 for lib in libraries.values() if not lib.get('done') and lib.get('offset'))
+            pending = sum(len(keys) for bucket in ('queued', 'dispatched') for keys in self.state.get(bucket, {}).values())
+            return (
+                f"cycle started {time.ctime(self.state.get('started', 0))}: {done} libraries finished, "
+                f"{partial} partly scanned, {pending} refreshes pending"
+            )
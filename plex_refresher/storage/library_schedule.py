@@ -0,0 +1,85 @@
+# plex_refresher/storage/library_schedule.py
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+from plex_refresher.utils.atomic_file import write_json_atomic
+
+# Weight of the latest scan in the running averages of matches and scan cost
+EWMA_WEIGHT = 0.5
+
+class LibraryScheduleStore:
+    """Persists per-library scan yield and cost and decides when each library is next scanned.
+
+    Libraries whose last scan found recently aired or upcoming TBA items are scanned every
+    min_interval. Libraries with older matches wait twice as long. Each scan that finds
+    nothing doubles the wait, stretched further for libraries whose scans take longer than
+    cost_target seconds, up to max_interval.
+    """
+
+    def __init__(self, path: Path, min_interval: int, max_interval: int, cost_target: float,
+                 logger: logging.Logger):
+        self.path = Path(path)
+        self.min_interval = min_interval
+        self.max_interval = max(max_interval, min_interval)
+        self.cost_target = cost_target
+        self.logger = logger
+        self.sections: Dict[str, Dict] = self._load()
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Dict]:
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable library schedule {self.path}: {str(e)}")
+            return {}
+
+    def save(self):
+        write_json_atomic(self.path, self.sections, indent=2, sort_keys=True)
+
+    def next_scan(self, section_id: str) -> Optional[float]:
+        return self.sections.get(section_id, {}).get('next_scan')
+
+    def due(self, section_id: str, now: Optional[float] = None) -> bool:
+        next_scan = self.next_scan(section_id)
+        return next_scan is None or (now or time.time()) >= next_scan
+
+    def make_due(self, section_ids: Iterable[str]):
+        """Scan these sections in the next cycle regardless of their schedule"""
+        with self._lock:
+            for section_id in section_ids:
+                if section_id in self.sections:
+                    self.sections[section_id]['next_scan'] = 0
+            self.save()
+
+    def interval_for(self, section: Dict, recent_matches: int) -> float:
+        if recent_matches:
+            return self.min_interval
+        if section['matches'] >= 0.5:
+            return min(self.max_interval, self.min_interval * 2)
+        cost_factor = max(1.0, section['cost'] / self.cost_target) if self.cost_target else 1.0
+        return min(self.max_interval, self.min_interval * 2 ** section['empty_scans'] * cost_factor)
+
+    def record_scan(self, section_id: str, started: float, matches: int, recent_matches: int,
+                    cost: float, completed: bool) -> float:
+        """Fold a scan's yield and cost into the library's history and return the delay until its next scan"""
+        with self._lock:
+            section = self.sections.setdefault(section_id, {'matches': float(matches), 'cost': cost, 'empty_scans': 0})
+            if not completed:
+                # An interrupted scan says nothing about the library; try again next cycle
+                interval = self.min_interval
+            else:
+                section['matches'] = EWMA_WEIGHT * matches + (1 - EWMA_WEIGHT) * section['matches']
+                section['cost'] = EWMA_WEIGHT * cost + (1 - EWMA_WEIGHT) * section['cost']
+                section['empty_scans'] = 0 if matches else section['empty_scans'] + 1
+                section['last_scan'] = started
+                interval = self.interval_for(section, recent_matches)
+            # Measured from the scan start, so a cycle that runs every min_interval always finds it due
+            section['next_scan'] = started + interval
+            self.save()
+        return interval
@@ -0,0 +1,137 @@
+# plex_refresher/storage/tba_index.py
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from plex_refresher.models.tba_item import TBAItem
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tba_items (
+    section_id TEXT NOT NULL,
+    rating_key TEXT NOT NULL,
+    library TEXT NOT NULL,
+    type TEXT NOT NULL,
+    title TEXT NOT NULL,
+    show TEXT,
+    season INTEGER,
+    episode INTEGER,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    last_refreshed REAL,
+    refresh_attempts INTEGER NOT NULL DEFAULT 0,
+    resolved_at REAL,
+    PRIMARY KEY (section_id, rating_key)
+);
+CREATE INDEX IF NOT EXISTS idx_tba_items_pending ON tba_items (section_id, resolved_at);
+"""
+
+# Stay well below SQLite's bound-parameter limit in IN (...) queries
+QUERY_CHUNK_SIZE = 500
+
+class TBAIndex:
+    """SQLite index of every item ever matched, so pending items can be re-checked without a rescan"""
+
+    def __init__(self, path: Path, logger: logging.Logger):
+        self.path = Path(path)
+        self.logger = logger
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.executescript(SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def record_matches(self, section_id: str, library: str, items: Iterable[TBAItem]):
+        """Insert newly matched items and refresh title/last-seen for known ones"""
+        now = time.time()
+        rows = [
+            (section_id, item.rating_key, library, item.type, item.title,
+             item.show, item.season, item.episode, now, now)
+            for item in items
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                """
+                INSERT INTO tba_items (section_id, rating_key, library, type, title, show, season, episode,
+                                       first_seen, last_seen)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (section_id, rating_key) DO UPDATE SET
+                    library = excluded.library,
+                    title = excluded.title,
+                    last_seen = excluded.last_seen,
+                    resolved_at = NULL
+                """,
+                rows
+            )
+
+    def record_refresh(self, section_id: str, rating_key: str):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE tba_items SET last_refreshed = ?, refresh_attempts = refresh_attempts + 1 "
+                "WHERE section_id = ? AND rating_key = ?",
+                (time.time(), section_id, str(rating_key))
+            )
+
+    def mark_resolved(self, section_id: str, rating_keys: Iterable[str], titles: Optional[Dict[str, str]] = None):
+        """Mark items as resolved, storing their new title when it is known"""
+        now = time.time()
+        titles = titles or {}
+        with self._lock, self._conn:
+            for rating_key in rating_keys:
+                self._conn.execute(
+                    "UPDATE tba_items SET resolved_at = ?, title = COALESCE(?, title) "
+                    "WHERE section_id = ? AND rating_key = ? AND resolved_at IS NULL",
+                    (now, titles.get(rating_key), section_id, str(rating_key))
+                )
+
+    def pending_keys(self, section_id: str) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT rating_key FROM tba_items WHERE section_id = ? AND resolved_at IS NULL ORDER BY first_seen",
+                (section_id,)
+            ).fetchall()
+        return [row['rating_key'] for row in rows]
+
+    def pending_titles(self, section_id: str) -> Dict[str, str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT rating_key, title FROM tba_items WHERE section_id = ? AND resolved_at IS NULL",
+                (section_id,)
+            ).fetchall()
+        return {row['rating_key']: row['title'] for row in rows}
+
+    def refresh_history(self, section_id: str,
+                        rating_keys: Optional[List[str]] = None) -> Dict[str, Tuple[int, Optional[float]]]:
+        """Refresh attempts and last refresh time of pending items in a section, optionally only the given ones"""
+        query = ("SELECT rating_key, refresh_attempts, last_refreshed FROM tba_items "
+                 "WHERE section_id = ? AND resolved_at IS NULL")
+        if rating_keys is None:
+            chunks = [()]
+        else:
+            chunks = [tuple(rating_keys[i:i + QUERY_CHUNK_SIZE]) for i in range(0, len(rating_keys), QUERY_CHUNK_SIZE)]
+        rows = []
+        with self._lock:
+            for chunk in chunks:
+                condition = f" AND rating_key IN ({','.join('?' * len(chunk))})" if chunk else ''
+                rows.extend(self._conn.execute(query + condition, (section_id, *chunk)).fetchall())
+        return {row['rating_key']: (row['refresh_attempts'], row['last_refreshed']) for row in rows}
+
+    def pending_sections(self) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT section_id FROM tba_items WHERE resolved_at IS NULL"
+            ).fetchall()
+        return [row['section_id'] for row in rows]
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) AS total, SUM(resolved_at IS NULL) AS pending FROM tba_items"
+            ).fetchone()
+        return {'total': row['total'] or 0, 'pending': row['pending'] or 0}
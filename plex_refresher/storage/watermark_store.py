@@ -0,0 +1,57 @@
+# plex_refresher/storage/watermark_store.py
+import json
+import logging
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+from plex_refresher.utils.atomic_file import write_json_atomic
+
+class WatermarkStore:
+    """Persists per-section scan watermarks so cycles only fetch items changed since the last scan"""
+
+    def __init__(self, path: Path, logger: logging.Logger):
+        self.path = Path(path)
+        self.logger = logger
+        self.sections: Dict[str, Dict] = self._load()
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Dict]:
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable watermark file {self.path}: {str(e)}")
+            return {}
+
+    def save(self):
+        write_json_atomic(self.path, self.sections, indent=2, sort_keys=True)
+
+    def get_watermark(self, section_id: str) -> Optional[int]:
+        return self.sections.get(section_id, {}).get('watermark')
+
+    def full_scan_due(self, section_id: str, full_scan_interval: int) -> bool:
+        """A full scan is due when the section has never been scanned or the fallback interval has passed"""
+        section = self.sections.get(section_id)
+        if not section or section.get('watermark') is None:
+            return True
+        return time.time() - section.get('last_full_scan', 0) >= full_scan_interval
+
+    def require_full_scan(self, section_ids: Iterable[str]):
+        """Make the next scan of these sections a full one, keeping their watermarks"""
+        with self._lock:
+            for section_id in section_ids:
+                if section_id in self.sections:
+                    self.sections[section_id]['last_full_scan'] = 0
+            self.save()
+
+    def update(self, section_id: str, watermark: int, full_scan: bool):
+        with self._lock:
+            section = self.sections.setdefault(section_id, {})
+            section['watermark'] = max(watermark, section.get('watermark') or 0)
+            section['last_scan'] = time.time()
+            if full_scan:
+                section['last_full_scan'] = section['last_scan']
+            self.save()
@@ -1,5 +1,11 @@
 # plex_refresher/utils/__init__.py
+from .atomic_file import write_json_atomic
 from .config_loader import ConfigLoader
+from .config_watcher import ConfigWatcher
 from .logging_setup import LoggingSetup
+from .title_matcher import TitleMatcher
+from .log_handlers import BatchingLokiHandler, ItemLineLimiter
+from .json_lines import JsonLinesWriter
+from .metrics import MetricsRegistry, RefresherMetrics
 
-__all__ = ['ConfigLoader', 'LoggingSetup']
\ No newline at end of file
+__all__ = ['write_json_atomic', 'ConfigLoader', 'ConfigWatcher', 'LoggingSetup', 'TitleMatcher', 'BatchingLokiHandler', 'ItemLineLimiter', 'JsonLinesWriter', 'MetricsRegistry', 'RefresherMetrics']
\ No newline at end of file
@@ -0,0 +1,14 @@
+# plex_refresher/utils/atomic_file.py
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+def write_json_atomic(path: Path, data: Any, **dump_options):
+    """Write data as JSON to a temporary file and rename it over path, so a crash never leaves a truncated file"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f, **dump_options)
+    os.replace(tmp_path, path)
@@ -5,6 +5,7 @@ from typing import Dict, Any
 from urllib.parse import urlparse
 from plex_refresher.exceptions.config_errors import ConfigurationError  # Fixed import
 from plex_refresher.config.config_schema import CONFIG_SCHEMA          # Fixed import
+from plex_refresher.utils.title_matcher import TitleMatcher
 import logging
 from pathlib import Path
 
@@ -60,6 +61,17 @@ class ConfigLoader:
                 f"Invalid value for {field_name}. Must be one of: {', '.join(rules['values'])}"
             )
 
+        # Validate each entry of a list of dictionaries
+        if 'item_fields' in rules:
+            validated_items = []
+            for index, item in enumerate(field_value):
+                if not isinstance(item, dict):
+                    raise ConfigurationError(f"Invalid entry for {field_name}[{index}]. Expected a dictionary")
+                validated_items.append(
+                    cls.validate_config_section(f"{field_name}[{index}]", item, {'fields': rules['item_fields']})
+                )
+            return validated_items
+
         return field_value
 
     @classmethod
@@ -86,16 +98,50 @@ class ConfigLoader:
             
         return validated
 
+    @staticmethod
+    def data_dir() -> Path:
+        """Directory holding config and persisted state: /app/data in Docker, ./data locally"""
+        docker_dir = Path('/app/data')
+        return docker_dir if docker_dir.exists() else Path('data')
+
     @classmethod
-    def load_and_validate(cls, config_path: Path = None) -> Dict:
+    def default_path(cls) -> Path:
         # Docker path: /app/data/config.yaml
         # Local path: ./data/config.yaml
+        return cls.data_dir() / 'config.yaml'
+
+    @classmethod
+    def normalize_servers(cls, plex_config: Dict) -> list:
+        """Return the configured servers as a list, turning a single plex.url/token into one entry"""
+        servers = plex_config.get('servers')
+        if not servers:
+            if not plex_config.get('url') or not plex_config.get('token'):
+                raise ConfigurationError("plex.url and plex.token are required unless plex.servers is set")
+            servers = [{
+                'url': plex_config['url'],
+                'token': plex_config['token'],
+                'libraries': plex_config.get('libraries')
+            }]
+        
+        names = set()
+        for index, server in enumerate(servers):
+            if not cls.validate_url(server['url']):
+                raise ConfigurationError(f"Invalid Plex URL format for server {index + 1}")
+            if not cls.validate_token(server['token']):
+                raise ConfigurationError(f"Invalid Plex token format for server {index + 1}")
+            server['name'] = server.get('name') or urlparse(server['url']).netloc
+            if server['name'] in names:
+                raise ConfigurationError(f"Duplicate Plex server name: {server['name']}")
+            names.add(server['name'])
+            if not server.get('libraries'):
+                server.pop('libraries', None)
+        
+        return servers
+
+    @classmethod
+    def load_and_validate(cls, config_path: Path = None) -> Dict:
         if config_path is None:
-            # Check for Docker environment first
-            docker_path = Path('/app/data/config.yaml')
-            local_path = Path('data/config.yaml')
-            
-            config_path = docker_path if docker_path.exists() else local_path
+            config_path = cls.default_path()
 
         if not config_path.exists():
             raise ConfigurationError(f"Configuration file not found: {config_path}")
@@ -109,23 +155,20 @@ class ConfigLoader:
                 
             validated_config = {}
             for section_name, schema in CONFIG_SCHEMA.items():
-                if section_name not in config:
-                    if schema['required']:
-                        raise ConfigurationError(f"Missing required section: {section_name}")
-                    continue
+                if section_name not in config and schema['required']:
+                    raise ConfigurationError(f"Missing required section: {section_name}")
                     
+                # Optional sections that are left out still get their defaults
                 validated_config[section_name] = cls.validate_config_section(
                     section_name,
-                    config[section_name],
+                    config.get(section_name) or {},
                     schema
                 )
             
-            if not cls.validate_url(validated_config['plex']['url']):
-                raise ConfigurationError("Invalid Plex URL format")
-                
-            if not cls.validate_token(validated_config['plex']['token']):
-                raise ConfigurationError("Invalid Plex token format")
-                
+            validated_config['plex']['servers'] = cls.normalize_servers(validated_config['plex'])
+            # Compile the search patterns once so a bad regex fails at startup
+            TitleMatcher.from_config(validated_config['search'])
+            
             if not validated_config['plex'].get('libraries'):
                 validated_config['plex'].pop('libraries', None)
             
@@ -0,0 +1,47 @@
+# plex_refresher/utils/config_watcher.py
+import logging
+import os
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
+from plex_refresher.exceptions.config_errors import ConfigurationError
+from plex_refresher.utils.config_loader import ConfigLoader
+
+# Sections whose changes only take effect after a restart
+RESTART_SECTIONS = ('logging', 'events')
+
+# Search settings that change which titles match
+MATCHER_FIELDS = ('patterns', 'exclude_patterns', 'case_sensitive', 'word_boundary', 'include_full_title')
+
+class ConfigWatcher:
+    """Notices edits to the config file and returns the new settings once they validate"""
+
+    def __init__(self, path: Path, logger: logging.Logger):
+        self.path = Path(path)
+        self.logger = logger
+        self._signature = self._stat()
+
+    def _stat(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def poll(self) -> Optional[Dict]:
+        """Return the validated config if the file changed since the last poll, else None"""
+        signature = self._stat()
+        if signature is None or signature == self._signature:
+            return None
+        self._signature = signature
+        try:
+            return ConfigLoader.load_and_validate(self.path)
+        except ConfigurationError as e:
+            self.logger.error(f"Ignoring invalid change to {self.path} - keeping the running config: {str(e)}")
+            return None
+
+def changed_sections(old: Dict, new: Dict) -> Set[str]:
+    """Top-level config sections that differ between two validated configs"""
+    return {section for section in set(old) | set(new) if old.get(section) != new.get(section)}
+
+def matcher_changed(old: Dict, new: Dict) -> bool:
+    return any(old['search'].get(field) != new['search'].get(field) for field in MATCHER_FIELDS)
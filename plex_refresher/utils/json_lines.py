@@ -0,0 +1,43 @@
+# plex_refresher/utils/json_lines.py
+import json
+import sys
+import threading
+from dataclasses import asdict
+from typing import IO, Optional
+
+class JsonLinesWriter:
+    """Writes one JSON object per line, flushed as it is written so consumers can stream the output.
+
+    Scans and refreshes report from worker threads, so writes are serialised.
+    """
+
+    def __init__(self, stream: Optional[IO[str]] = None):
+        self.stream = stream or sys.stdout
+        self.records = 0
+        self._lock = threading.Lock()
+
+    def write(self, record: dict):
+        line = json.dumps(record, separators=(',', ':'), default=str)
+        with self._lock:
+            self.stream.write(line + '\n')
+            self.stream.flush()
+            self.records += 1
+
+    def match(self, server: str, library: str, section_id: str, items):
+        for item in items:
+            self.write({'event': 'match', 'server': server, 'library': library, 'section_id': section_id, **asdict(item)})
+
+    def refresh(self, result):
+        target = result.target
+        self.write({
+            'event': 'refresh',
+            'section_id': target.section_id,
+            'rating_key': target.rating_key,
+            'level': target.level,
+            'label': target.label,
+            'items': [item.rating_key for item in target.items],
+            'success': result.success,
+            'attempts': result.attempts,
+            'latency': round(result.latency, 3),
+            'error': result.error
+        })
@@ -0,0 +1,135 @@
+# plex_refresher/utils/log_handlers.py
+import logging
+import sys
+import threading
+import time
+from logging.handlers import QueueHandler
+from typing import Dict, List, Optional, Tuple
+
+class DeferredFormatQueueHandler(QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread.
+
+    The stock handler formats every record on the calling thread; this one only merges the
+    message arguments and exception text so the record is safe to hand across threads.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+class ItemLineLimiter(logging.Filter):
+    """Lets at most lines_per_second per-item lines through and counts the rest.
+
+    The next line that passes reports how many were suppressed since the last one.
+    """
+
+    def __init__(self, lines_per_second: float):
+        super().__init__()
+        self.rate = lines_per_second
+        self.suppressed = 0
+        self._tokens = lines_per_second
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < 1:
+                self.suppressed += 1
+                return False
+            self._tokens -= 1
+            suppressed, self.suppressed = self.suppressed, 0
+        if suppressed:
+            record.msg = f"{record.getMessage()} (+{suppressed} item lines suppressed)"
+            record.args = None
+        return True
+
+class BatchingLokiHandler(logging.Handler):
+    """Buffers records and pushes them to Loki in one request per batch.
+
+    A batch is sent once batch_size records are waiting or flush_interval seconds have
+    passed, from a background thread so logging never waits on Loki. Payloads and labels
+    are built with python-logging-loki's v1 emitter.
+    """
+
+    def __init__(self, url: str, tags: Optional[Dict[str, str]] = None, batch_size: int = 500,
+                 flush_interval: float = 2.0, auth: Optional[Tuple[str, str]] = None):
+        super().__init__()
+        from logging_loki.emitter import LokiEmitterV1
+        self.emitter = LokiEmitterV1(url, tags, auth)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        # Beyond this many waiting records (Loki down), new records are dropped and counted
+        self.max_buffered = batch_size * 20
+        self.dropped = 0
+        self.pushes = 0
+        self._buffer: List[Tuple[logging.LogRecord, str]] = []
+        self._buffer_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='loki-push', daemon=True)
+        self._thread.start()
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            line = self.format(record)
+        except Exception:
+            self.handleError(record)
+            return
+        with self._buffer_lock:
+            if len(self._buffer) >= self.max_buffered:
+                self.dropped += 1
+                return
+            self._buffer.append((record, line))
+            full = len(self._buffer) >= self.batch_size
+        if full:
+            self._wake.set()
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def build_payload(self, batch: List[Tuple[logging.LogRecord, str]]) -> Dict:
+        """Group a batch into one Loki push body with a stream per distinct label set"""
+        streams: Dict[Tuple, Dict] = {}
+        for record, line in batch:
+            tags = self.emitter.build_tags(record)
+            key = tuple(sorted((str(k), str(v)) for k, v in tags.items()))
+            stream = streams.setdefault(key, {'stream': tags, 'values': []})
+            stream['values'].append([str(int(record.created * 1e9)), line])
+        return {'streams': list(streams.values())}
+
+    def flush(self):
+        with self._buffer_lock:
+            batch, self._buffer = self._buffer, []
+        if not batch:
+            return
+        try:
+            response = self.emitter.session.post(self.emitter.url, json=self.build_payload(batch), timeout=10)
+            if response.status_code != self.emitter.success_response_code:
+                raise ValueError(f"Unexpected Loki API response status code: {response.status_code}")
+            self.pushes += 1
+        except Exception as e:
+            # Logging about a failed log push would feed straight back into this handler
+            sys.stderr.write(f"Dropped {len(batch)} log lines after failed Loki push: {str(e)}\n")
+
+    def close(self):
+        if self._stopping.is_set():
+            return
+        self._stopping.set()
+        self._wake.set()
+        self._thread.join(timeout=self.flush_interval + 10)
+        self.flush()
+        self.emitter.close()
+        super().close()
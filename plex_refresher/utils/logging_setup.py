@@ -1,16 +1,59 @@
 # plex_refresher/utils/logging_setup.py
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+from logging.handlers import QueueListener, RotatingFileHandler
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List
 from plex_refresher.exceptions.config_errors import ConfigurationError  # Fixed import
+from plex_refresher.utils.log_handlers import BatchingLokiHandler, DeferredFormatQueueHandler, ItemLineLimiter
+
+# Child logger for per-item lines (matches, refreshes), which can be rate limited
+ITEM_LOGGER = 'items'
 
 class LoggingSetup:
     @staticmethod
-    def setup_logging(config: Dict) -> logging.Logger:
+    def setup_logging(config: Dict, log_file: bool = True) -> logging.Logger:
+        """Configure the root logger; log_file=False logs to stderr only, as the one-shot CLI does"""
         log_config = config['logging']
-        log_path = Path(log_config['file'])
+        handlers: List[logging.Handler] = [logging.StreamHandler()]
+        if log_file:
+            handlers.insert(0, LoggingSetup._file_handler(log_config))
+        if log_config.get('loki_url'):
+            handlers.append(LoggingSetup._loki_handler(log_config))
+        
+        if log_config.get('queue'):
+            # A background thread owns the handlers; callers only enqueue the record
+            formatter = logging.Formatter(log_config['format'])
+            for handler in handlers:
+                handler.setFormatter(formatter)
+            log_queue = queue.SimpleQueue()
+            listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+            listener.start()
+            atexit.register(LoggingSetup._stop_listener, listener, handlers)
+            handlers = [DeferredFormatQueueHandler(log_queue)]
+        else:
+            for handler in handlers:
+                if isinstance(handler, BatchingLokiHandler):
+                    atexit.register(handler.close)
         
+        # force replaces the bootstrap handler main.py installs before the config is read
+        logging.basicConfig(
+            level=getattr(logging, log_config['level']),
+            format=log_config['format'],
+            handlers=handlers,
+            force=True
+        )
+        
+        logger = logging.getLogger('plex_refresher')
+        item_lines_per_second = log_config.get('item_lines_per_second')
+        if item_lines_per_second:
+            logger.getChild(ITEM_LOGGER).addFilter(ItemLineLimiter(item_lines_per_second))
+        return logger
+
+    @staticmethod
+    def _file_handler(log_config: Dict) -> RotatingFileHandler:
+        log_path = Path(log_config['file'])
         try:
             log_path.parent.mkdir(parents=True, exist_ok=True)
             test_file = log_path.parent / '.test_write'
@@ -18,18 +61,32 @@ class LoggingSetup:
             test_file.unlink()
         except Exception as e:
             raise ConfigurationError(f"Cannot write to log directory {log_path.parent}: {str(e)}")
-        
-        logging.basicConfig(
-            level=getattr(logging, log_config['level']),
-            format=log_config['format'],
-            handlers=[
-                RotatingFileHandler(
-                    log_path,
-                    maxBytes=log_config['max_size_mb'] * 1024 * 1024,
-                    backupCount=log_config['backup_count']
-                ),
-                logging.StreamHandler()
-            ]
+        return RotatingFileHandler(
+            log_path,
+            maxBytes=log_config['max_size_mb'] * 1024 * 1024,
+            backupCount=log_config['backup_count']
         )
-        
-        return logging.getLogger('plex_refresher')
\ No newline at end of file
+
+    @staticmethod
+    def _loki_handler(log_config: Dict) -> BatchingLokiHandler:
+        try:
+            import logging_loki  # noqa: F401 - python-logging-loki, only needed when Loki is configured
+        except ImportError:
+            raise ConfigurationError("logging.loki_url is set but python-logging-loki is not installed")
+        auth = None
+        if log_config.get('loki_username'):
+            auth = (log_config['loki_username'], log_config.get('loki_password') or '')
+        return BatchingLokiHandler(
+            log_config['loki_url'],
+            tags=log_config.get('loki_labels') or {'application': 'plex-tba-refresher'},
+            batch_size=log_config['loki_batch_size'],
+            flush_interval=log_config['loki_flush_interval_seconds'],
+            auth=auth
+        )
+
+    @staticmethod
+    def _stop_listener(listener: QueueListener, handlers: List[logging.Handler]):
+        """Drain queued records and flush the handlers on exit"""
+        listener.stop()
+        for handler in handlers:
+            handler.close()
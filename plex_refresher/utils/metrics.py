@@ -0,0 +1,188 @@
+# plex_refresher/utils/metrics.py
+import re
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+# Upper bounds, in seconds, of the latency histogram buckets
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300)
+
+# Numeric path segments are folded so each endpoint is one label value
+_ID_SEGMENT = re.compile(r'/\d+(?:,\d+)*(?=/|$)')
+
+def endpoint(path: str) -> str:
+    """/library/metadata/123/refresh?x=1 -> /library/metadata/{id}/refresh"""
+    return _ID_SEGMENT.sub('/{id}', path.split('?', 1)[0]) or '/'
+
+class Metric:
+    """A counter, gauge or histogram with a fixed set of label names"""
+
+    def __init__(self, name: str, help_text: str, kind: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.kind = kind
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self._values: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = float(value)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            counts, total, count = self._values.get(key) or ([0] * len(self.buckets), 0.0, 0)
+            counts = [c + (value <= bound) for c, bound in zip(counts, self.buckets)]
+            self._values[key] = (counts, total + value, count + 1)
+
+    def samples(self) -> Iterator[Tuple[str, Dict[str, str], float]]:
+        with self._lock:
+            values = dict(self._values)
+        for key, value in sorted(values.items()):
+            labels = dict(zip(self.labelnames, key))
+            if self.kind != 'histogram':
+                yield self.name, labels, value
+                continue
+            counts, total, count = value
+            for bound, bucket_count in zip(self.buckets, counts):
+                yield f"{self.name}_bucket", {**labels, 'le': f"{bound:g}"}, bucket_count
+            yield f"{self.name}_bucket", {**labels, 'le': '+Inf'}, count
+            yield f"{self.name}_sum", labels, total
+            yield f"{self.name}_count", labels, count
+
+    def snapshot(self) -> Dict[str, object]:
+        """Current values keyed by 'label=value,...'; histograms as count and sum"""
+        with self._lock:
+            values = dict(self._values)
+        result = {}
+        for key, value in values.items():
+            label = ','.join(f"{name}={v}" for name, v in zip(self.labelnames, key))
+            result[label] = {'count': value[2], 'sum': value[1]} if self.kind == 'histogram' else value
+        return result
+
+class MetricsRegistry:
+    """Minimal Prometheus-compatible registry; render() produces the text exposition format"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def _add(self, metric: Metric) -> Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Metric:
+        return self._add(Metric(name, help_text, 'counter', labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Metric:
+        return self._add(Metric(name, help_text, 'gauge', labelnames))
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Metric:
+        return self._add(Metric(name, help_text, 'histogram', labelnames, buckets))
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for name, labels, value in metric.samples():
+                label_text = ','.join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+                value = _format(value)
+                lines.append(f"{name}{{{label_text}}} {value}" if label_text else f"{name} {value}")
+        return '\n'.join(lines) + '\n'
+
+    def snapshot(self) -> Dict[str, Dict[str, object]]:
+        return {name: metric.snapshot() for name, metric in self._metrics.items()}
+
+    @staticmethod
+    def delta(before: Dict[str, Dict[str, object]], after: Dict[str, Dict[str, object]],
+              skip: Sequence[str] = ()) -> Dict[str, Dict[str, object]]:
+        """Per-label change between two snapshots; gauges and names in skip are reported as-is"""
+        result = {}
+        for name, values in after.items():
+            changed = {}
+            for label, value in values.items():
+                old = before.get(name, {}).get(label)
+                if isinstance(value, dict):
+                    old = old or {'count': 0, 'sum': 0.0}
+                    if value['count'] != old['count']:
+                        changed[label] = {'count': value['count'] - old['count'], 'sum': value['sum'] - old['sum']}
+                elif name in skip:
+                    changed[label] = value
+                elif value != (old or 0):
+                    changed[label] = value - (old or 0)
+            if changed:
+                result[name] = changed
+        return result
+
+def _format(value: float) -> str:
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+class RefresherMetrics(MetricsRegistry):
+    """The metrics the refresher exposes"""
+
+    def __init__(self):
+        super().__init__()
+        self.operation_seconds = self.histogram(
+            'plex_refresher_operation_seconds', 'Time spent in connect, searches and refreshes', ['operation'])
+        self.scan_seconds = self.histogram(
+            'plex_refresher_scan_seconds', 'Library scan duration', ['server', 'library', 'method'])
+        self.scan_items_per_second = self.gauge(
+            'plex_refresher_scan_items_per_second', 'Items listed per second in the last scan', ['server', 'library'])
+        self.items_scanned = self.counter(
+            'plex_refresher_items_scanned_total', 'Items listed by scans', ['server', 'library'])
+        self.scan_bytes = self.counter(
+            'plex_refresher_scan_bytes_total', 'Response bytes received by scans', ['server', 'library'])
+        self.http_requests = self.counter(
+            'plex_refresher_http_requests_total', 'HTTP requests sent to Plex', ['server', 'method', 'endpoint', 'status'])
+        self.http_seconds = self.histogram(
+            'plex_refresher_http_request_seconds', 'Plex HTTP request latency', ['server', 'method', 'endpoint'])
+        self.matches = self.counter(
+            'plex_refresher_matches_total', 'TBA matches found by scans', ['server', 'library'])
+        self.refreshes_issued = self.counter(
+            'plex_refresher_refreshes_issued_total', 'Refresh requests sent', ['level'])
+        self.refreshes_succeeded = self.counter(
+            'plex_refresher_refreshes_succeeded_total', 'Refresh requests that succeeded', ['level'])
+        self.refreshes_resolved = self.counter(
+            'plex_refresher_refreshes_resolved_total', 'Items whose title no longer matches')
+        self.connect_retries = self.counter(
+            'plex_refresher_connect_retries_total', 'Connection attempts retried', ['server'])
+        self.sleep_seconds = self.counter(
+            'plex_refresher_sleep_seconds_total', 'Time spent waiting, by reason', ['reason'])
+        self.last_cycle_seconds = self.gauge(
+            'plex_refresher_last_cycle_seconds', 'Duration of the last refresh cycle')
+        self.last_cycle_timestamp = self.gauge(
+            'plex_refresher_last_cycle_timestamp_seconds', 'Unix time the last refresh cycle finished')
+
+    def observe_request(self, server: str, method: str, path: str, status: object, seconds: float):
+        path = endpoint(path)
+        self.http_requests.inc(server=server, method=method, endpoint=path, status=status)
+        self.http_seconds.observe(seconds, server=server, method=method, endpoint=path)
+
+    @contextmanager
+    def time(self, operation: str):
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            self.operation_seconds.observe(time.monotonic() - started, operation=operation)
+
+    def slept(self, reason: str, seconds: float):
+        if seconds > 0:
+            self.sleep_seconds.inc(seconds, reason=reason)
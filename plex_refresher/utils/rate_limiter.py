@@ -0,0 +1,36 @@
+# plex_refresher/utils/rate_limiter.py
+import threading
+import time
+
+class TokenBucket:
+    """Thread-safe token bucket: allows `rate` acquisitions per second with bursts up to `capacity`"""
+
+    def __init__(self, rate: float, capacity: int = 1):
+        self.rate = float(rate)
+        self.capacity = max(1, int(capacity))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def set_rate(self, rate: float):
+        with self._lock:
+            self._refill()
+            self.rate = float(rate)
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> float:
+        """Block until a token is available and return the time spent waiting"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate if self.rate > 0 else 1.0
+            time.sleep(delay)
+            waited += delay
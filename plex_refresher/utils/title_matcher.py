@@ -0,0 +1,120 @@
+# plex_refresher/utils/title_matcher.py
+import re
+from typing import Dict, Iterable, List, Optional
+
+# Prefix marking a search pattern as a regular expression rather than a literal
+REGEX_PREFIX = 're:'
+
+class TitleMatcher:
+    """Matches titles against every search pattern with one pre-compiled regex.
+
+    Plain patterns are literals, compared casefolded unless case_sensitive is set. They match
+    anywhere in a title, or with word_boundary only as whole words ("TBA" then matches
+    "Episode TBA" but not "Tbaytown").
+    Patterns prefixed with "re:" are regular expressions used as written. A title matching
+    any exclusion pattern never matches.
+    """
+
+    def __init__(self, patterns: Iterable[str], exclude: Iterable[str] = (), case_sensitive: bool = False,
+                 word_boundary: bool = False, include_full_title: bool = False):
+        self.patterns = list(patterns)
+        if not self.patterns:
+            raise ValueError("At least one search pattern is required")
+        self.exclude = list(exclude)
+        self.case_sensitive = case_sensitive
+        self.word_boundary = word_boundary
+        self.include_full_title = include_full_title
+        self._patterns = self._compile(self.patterns)
+        self._exclusions = self._compile(self.exclude) if self.exclude else None
+
+    @classmethod
+    def from_config(cls, search_config: Dict) -> 'TitleMatcher':
+        return cls(
+            search_config['patterns'],
+            exclude=search_config.get('exclude_patterns') or (),
+            case_sensitive=search_config.get('case_sensitive', False),
+            word_boundary=search_config.get('word_boundary', False),
+            include_full_title=search_config.get('include_full_title', False)
+        )
+
+    @property
+    def literals(self) -> List[str]:
+        """Plain patterns, which Plex can also filter on server side"""
+        return [p for p in self.patterns if not p.startswith(REGEX_PREFIX)]
+
+    def title_filters(self) -> List[str]:
+        """Values for Plex title filters: one ORing every literal (comma-separated), plus one per literal containing a comma"""
+        joinable = [p for p in self.literals if ',' not in p]
+        return ([','.join(joinable)] if joinable else []) + [p for p in self.literals if ',' in p]
+
+    def listable(self, title: Optional[str]) -> bool:
+        """Whether a Plex title filter would list this title: it contains a literal, ignoring case"""
+        if not title:
+            return False
+        title = title.casefold()
+        return any(literal.casefold() in title for literal in self.literals)
+
+    def _compile(self, patterns: List[str]) -> '_CompiledPatterns':
+        literals = {}
+        expressions = {}
+        for index, pattern in enumerate(patterns):
+            if pattern.startswith(REGEX_PREFIX):
+                try:
+                    re.compile(pattern[len(REGEX_PREFIX):])
+                except re.error as e:
+                    raise ValueError(f"Invalid regular expression in search pattern {pattern!r}: {e}")
+                expressions[f"r{index}"] = pattern
+            else:
+                literals.setdefault(pattern if self.case_sensitive else pattern.casefold(), pattern)
+
+        literal_regex = None
+        if literals:
+            # One alternation, longest first, with shared lookarounds is much faster than a group per literal
+            source = '|'.join(re.escape(literal) for literal in sorted(literals, key=len, reverse=True))
+            if self.word_boundary:
+                # Lookarounds rather than \b so literals that start or end with punctuation still work
+                source = rf"(?<!\w)(?:{source})(?!\w)"
+            literal_regex = re.compile(source)
+
+        expression_regex = None
+        if expressions:
+            flags = 0 if self.case_sensitive else re.IGNORECASE
+            expression_regex = re.compile(
+                '|'.join(f"(?P<{group}>{pattern[len(REGEX_PREFIX):]})" for group, pattern in expressions.items()),
+                flags
+            )
+        return _CompiledPatterns(literal_regex, literals, expression_regex, expressions)
+
+    def match(self, title: Optional[str], show_title: Optional[str] = None) -> Optional[str]:
+        """Return the pattern a title matches, or None"""
+        if not title:
+            return None
+        if show_title and self.include_full_title:
+            title = f"{show_title} - {title}"
+        if not self.case_sensitive:
+            title = title.casefold()
+        pattern = self._patterns.search(title)
+        if pattern is None or (self._exclusions is not None and self._exclusions.search(title)):
+            return None
+        return pattern
+
+class _CompiledPatterns:
+    """Literal patterns as one alternation plus regex patterns as named groups of another"""
+    __slots__ = ('literal_regex', 'literals', 'expression_regex', 'expressions')
+
+    def __init__(self, literal_regex, literals: Dict[str, str], expression_regex, expressions: Dict[str, str]):
+        self.literal_regex = literal_regex
+        self.literals = literals
+        self.expression_regex = expression_regex
+        self.expressions = expressions
+
+    def search(self, title: str) -> Optional[str]:
+        if self.literal_regex is not None:
+            found = self.literal_regex.search(title)
+            if found:
+                return self.literals[found.group()]
+        if self.expression_regex is not None:
+            found = self.expression_regex.search(title)
+            if found:
+                return self.expressions[found.lastgroup]
+        return None
@@ -0,0 +1,78 @@
+# tests/conftest.py
+import logging
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+sys.path.insert(0, str(REPO_ROOT / 'benchmarks'))
+
+from fake_plex_server import FakeLibrary, FakePlexServer  # noqa: E402
+from plex_refresher.core.refresher import PlexMetadataRefresher  # noqa: E402
+from plex_refresher.utils.config_loader import ConfigLoader  # noqa: E402
+
+TOKEN = 'test-token-0123456789'
+
+CONFIG = """
+plex:
+  servers:
+    - name: "fake"
+      url: "{url}"
+      token: "{token}"
+      libraries: {libraries}
+search:
+  method: "{method}"
+  backend: "{backend}"
+  patterns: {patterns}
+refresh:
+  interval_seconds: 3600
+  delay_between_items: 1
+  verify_delay_seconds: 0
+  dry_run: {dry_run}
+throttle:
+  enabled: false
+logging:
+  level: "INFO"
+  format: "%(message)s"
+  file: "data/logs/test.log"
+  max_size_mb: 1
+  backup_count: 0
+"""
+
+def tba_key(server, section: str) -> str:
+    return next(i['ratingKey'] for i in server.library.sections[section] if i['title'] == 'TBA')
+
+@pytest.fixture
+def fake_server():
+    """A fresh stand-in Plex server: 40 movies and 160 episodes, a few of them titled TBA"""
+    server = FakePlexServer(FakeLibrary(200, tba_ratio=0.1)).start()
+    yield server
+    server.stop()
+
+@pytest.fixture
+def logger():
+    return logging.getLogger('plex_refresher.tests')
+
+@pytest.fixture
+def make_refresher(fake_server, tmp_path, monkeypatch):
+    """Build a refresher against the fake server, with its state under a temporary data dir"""
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'data').mkdir()
+    created = []
+
+    def make(libraries=None, backend='raw', method='quick', patterns=('TBA',), dry_run=False):
+        path = tmp_path / 'data' / 'config.yaml'
+        path.write_text(CONFIG.format(
+            url=fake_server.url, token=TOKEN, backend=backend, method=method, dry_run=str(dry_run).lower(),
+            patterns='[' + ', '.join(f'"{pattern}"' for pattern in patterns) + ']',
+            libraries='[' + ', '.join(f'"{name}"' for name in libraries) + ']' if libraries else 'null'
+        ))
+        refresher = PlexMetadataRefresher(ConfigLoader.load_and_validate(path), log_file=False)
+        created.append(refresher)
+        return refresher
+
+    yield make
+    for refresher in created:
+        refresher.close()
@@ -0,0 +1,144 @@
+# tests/test_async_plex_client.py
+import asyncio
+import time
+
+import aiohttp
+import pytest
+
+from conftest import TOKEN
+from fake_plex_server import MOVIE_SECTION, SHOW_SECTION
+from plex_refresher.core.async_plex_client import AsyncPlexClient, AsyncRunner
+from plex_refresher.core.refresh_dispatcher import RefreshDispatcher
+from plex_refresher.core.refresh_planner import RefreshTarget
+
+def client_for(server, logger, **kwargs) -> AsyncPlexClient:
+    kwargs.setdefault('retry_delay', 0.01)
+    return AsyncPlexClient(server.url, TOKEN, logger, **kwargs)
+
+def run(coro):
+    return asyncio.run(coro)
+
+def test_list_all_pages_through_the_section_in_order(fake_server, logger):
+    async def go():
+        async with client_for(fake_server, logger) as client:
+            return [page async for page in client.list_all(MOVIE_SECTION, 'movie', 7)]
+    pages = run(go())
+    movies = fake_server.library.sections[MOVIE_SECTION]
+    assert [len(page) for page in pages] == [7, 7, 7, 7, 7, 5]
+    assert [record.rating_key for page in pages for record in page] == [m['ratingKey'] for m in movies]
+    assert fake_server.requests == len(pages)
+
+def test_list_all_of_an_empty_listing(fake_server, logger):
+    async def go():
+        async with client_for(fake_server, logger) as client:
+            return [page async for page in client.list_all(MOVIE_SECTION, 'movie', 10, {'title': 'no such title'})]
+    assert run(go()) == [[]]
+
+def test_fetch_metadata_batches_rating_keys(fake_server, logger):
+    keys = [i['ratingKey'] for i in fake_server.library.sections[SHOW_SECTION][:150]]
+    async def go():
+        async with client_for(fake_server, logger) as client:
+            return await client.fetch_metadata(keys)
+    records = run(go())
+    assert sorted(record.rating_key for record in records) == sorted(keys)
+    # HYDRATE_BATCH_SIZE keys per request
+    assert fake_server.requests == 2
+
+def test_keep_alive_connections_are_pooled(fake_server, logger):
+    async def go():
+        async with client_for(fake_server, logger, max_per_host=3) as client:
+            for _ in range(10):
+                await client.fetch_metadata(['1'])
+            await asyncio.gather(*(client.fetch_metadata(['1']) for _ in range(30)))
+            return client.requests
+    assert run(go()) == 40
+    assert fake_server.requests == 40
+    assert fake_server.connections <= 3
+
+def test_server_errors_are_retried(fake_server, logger):
+    fake_server.inject(503, 502)
+    async def go():
+        async with client_for(fake_server, logger) as client:
+            return await client.fetch_metadata(['1']), client.requests
+    records, requests = run(go())
+    assert len(records) == 1
+    assert requests == 3
+
+def test_retries_give_up_after_the_limit(fake_server, logger):
+    fake_server.inject(500, 500, 500)
+    async def go():
+        async with client_for(fake_server, logger, retries=2) as client:
+            await client.fetch_metadata(['1'])
+    with pytest.raises(aiohttp.ClientResponseError) as raised:
+        run(go())
+    assert raised.value.status == 500
+    assert fake_server.requests == 3
+
+def test_client_errors_are_not_retried(fake_server, logger):
+    fake_server.inject(404)
+    async def go():
+        async with client_for(fake_server, logger) as client:
+            await client.fetch_metadata(['1'])
+    with pytest.raises(aiohttp.ClientResponseError):
+        run(go())
+    assert fake_server.requests == 1
+
+def test_timeouts_are_retried(fake_server, logger):
+    fake_server.inject(2.0)
+    async def go():
+        async with client_for(fake_server, logger, timeout=0.5) as client:
+            started = time.monotonic()
+            records = await client.fetch_metadata(['1'])
+            return records, client.requests, time.monotonic() - started
+    records, requests, elapsed = run(go())
+    assert len(records) == 1
+    assert requests == 2
+    assert elapsed < 2.0
+
+def test_refresh_puts_the_item(fake_server, logger):
+    async def go():
+        async with client_for(fake_server, logger) as client:
+            await client.refresh('3')
+    run(go())
+    assert fake_server.refreshed == ['3']
+
+def test_refresh_is_not_retried_by_the_client(fake_server, logger):
+    fake_server.inject(503)
+    async def go():
+        async with client_for(fake_server, logger) as client:
+            await client.refresh('3')
+    with pytest.raises(aiohttp.ClientResponseError):
+        run(go())
+    assert fake_server.refreshed == []
+
+def test_refresh_dispatcher_retries_through_the_async_client(fake_server, logger):
+    fake_server.inject(503)
+    runner = AsyncRunner()
+    client = client_for(fake_server, logger)
+    try:
+        dispatcher = RefreshDispatcher(
+            lambda target: runner.run(client.refresh(target.rating_key)),
+            requests_per_second=100, max_in_flight=2, max_retries=2, logger=logger
+        )
+        dispatcher.submit(RefreshTarget('3', 'item', 'Movie 2', f'fake:{MOVIE_SECTION}'))
+        results = dispatcher.drain()
+    finally:
+        runner.run(client.close())
+        runner.stop()
+    assert [(r.success, r.attempts) for r in results] == [(True, 2)]
+    assert fake_server.refreshed == ['3']
+
+def test_list_all_fetches_ahead_only_within_the_window(fake_server, logger):
+    async def go():
+        async with client_for(fake_server, logger) as client:
+            pages = client.list_all(MOVIE_SECTION, 'movie', 2, window=3)
+            consumed = [await pages.__anext__(), await pages.__anext__()]
+            # A slow consumer: nothing beyond the window may be fetched meanwhile
+            await asyncio.sleep(0.3)
+            fetched = fake_server.requests
+            await pages.aclose()
+            return consumed, fetched
+    consumed, fetched = run(go())
+    assert [len(page) for page in consumed] == [2, 2]
+    # The first page, then the window refilled after the second page was taken
+    assert fetched == 1 + 3 + 1
@@ -0,0 +1,30 @@
+# tests/test_command_line.py
+import pytest
+
+import main
+from conftest import CONFIG, TOKEN
+
+def test_rating_keys_need_a_single_server():
+    args = main.parse_args(['scan', '--server', 'fake', '--rating-key', '5'])
+    assert args.server == ['fake'] and args.rating_keys == ['5']
+    for argv in (['scan', '--rating-key', '5'],
+                 ['refresh', '--server', 'a', '--server', 'b', '--rating-key', '5']):
+        with pytest.raises(SystemExit):
+            main.parse_args(argv)
+
+def test_recheck_rejects_rating_keys():
+    assert main.parse_args(['recheck']).rating_keys is None
+    with pytest.raises(SystemExit):
+        main.parse_args(['recheck', '--server', 'fake', '--rating-key', '5'])
+
+def test_scan_writes_no_state(fake_server, tmp_path, monkeypatch, capsys):
+    monkeypatch.chdir(tmp_path)
+    path = tmp_path / 'data' / 'config.yaml'
+    path.parent.mkdir()
+    config = CONFIG.format(url=fake_server.url, token=TOKEN, libraries='null', method='deep', backend='raw',
+                           patterns='["TBA"]', dry_run='false')
+    path.write_text(config.replace('refresh:\n', 'refresh:\n  incremental: true\n') + 'metrics:\n  cycle_report: true\n')
+    main.run_command(main.parse_args(['--config', str(path), 'scan', '--library', 'Movies', '--json']))
+    assert '"event":"match"' in capsys.readouterr().out
+    assert sorted(p.name for p in (tmp_path / 'data').iterdir()) == ['config.yaml']
+    assert not fake_server.refreshed
@@ -0,0 +1,82 @@
+# tests/test_cycle_checkpoint.py
+import json
+import time
+
+from plex_refresher.storage.cycle_checkpoint import CycleCheckpoint
+from plex_refresher.utils.config_loader import ConfigLoader
+
+def checkpoint_at(path, logger, max_age=3600, save_interval=0):
+    return CycleCheckpoint(path, max_age=max_age, save_interval=save_interval, logger=logger)
+
+def test_interrupted_cycle_resumes_where_it_stopped(tmp_path, logger):
+    path = tmp_path / 'checkpoint.json'
+    checkpoint = checkpoint_at(path, logger)
+    assert not checkpoint.begin()
+    checkpoint.finish_library('a:1')
+    checkpoint.scanned_to('a:2', 3000)
+
+    resumed = checkpoint_at(path, logger)
+    assert resumed.begin()
+    assert resumed.library_done('a:1')
+    assert not resumed.library_done('a:2')
+    assert resumed.offset('a:2') == 3000
+    assert resumed.offset('a:3') == 0
+
+def test_old_checkpoints_are_discarded(tmp_path, logger):
+    path = tmp_path / 'checkpoint.json'
+    checkpoint = checkpoint_at(path, logger)
+    checkpoint.begin()
+    checkpoint.finish_library('a:1')
+    state = json.loads(path.read_text())
+    path.write_text(json.dumps({**state, 'updated': time.time() - 7200}))
+
+    fresh = checkpoint_at(path, logger)
+    assert not fresh.begin()
+    assert not fresh.library_done('a:1')
+
+def test_pending_refreshes_move_from_queued_to_dispatched_to_done(tmp_path, logger):
+    checkpoint = checkpoint_at(tmp_path / 'checkpoint.json', logger)
+    checkpoint.begin()
+    checkpoint.queue('a:1', ['1', '2', '3', '4'])
+    checkpoint.settle('a:1', ['4'])
+    checkpoint.dispatch('a:1', ['1', '2'])
+    checkpoint.refreshed('a:1', ['1'])
+    assert checkpoint.state['queued'] == {'a:1': ['3']}
+    assert checkpoint.state['dispatched'] == {'a:1': ['2']}
+    assert checkpoint.take_pending() == {'a:1': ['3', '2']}
+    assert checkpoint.take_pending() == {}
+
+def test_saves_are_spaced_unless_forced(tmp_path, logger):
+    path = tmp_path / 'checkpoint.json'
+    checkpoint = checkpoint_at(path, logger, save_interval=3600)
+    checkpoint.begin()
+    checkpoint.queue('a:1', ['1'])
+    assert json.loads(path.read_text())['queued'] == {}
+    checkpoint.save(force=True)
+    assert json.loads(path.read_text())['queued'] == {'a:1': ['1']}
+
+def test_finish_removes_the_file_and_stops_tracking(tmp_path, logger):
+    path = tmp_path / 'checkpoint.json'
+    checkpoint = checkpoint_at(path, logger)
+    checkpoint.begin()
+    checkpoint.finish()
+    assert not path.exists()
+    checkpoint.queue('a:1', ['1'])
+    assert not path.exists()
+    assert checkpoint.take_pending() == {}
+
+def test_stopped_cycle_keeps_its_checkpoint(fake_server, make_refresher):
+    refresher = make_refresher(libraries=['Movies'])
+    refresher.config['checkpoint']['enabled'] = True
+    refresher.checkpoint = refresher._create_checkpoint()
+    # Stop as soon as the first matches come in, as stop() does from another thread
+    refresher.on_match = lambda *args: refresher.stop()
+    refresher.refresh_metadata()
+    assert (ConfigLoader.data_dir() / 'state' / 'checkpoint.json').exists()
+
+def test_finished_cycle_removes_its_checkpoint(fake_server, make_refresher):
+    refresher = make_refresher(libraries=['Movies'])
+    refresher.config['checkpoint']['enabled'] = True
+    refresher.checkpoint = refresher._create_checkpoint()
+    refresher.refresh_metadata()
+    assert not (ConfigLoader.data_dir() / 'state' / 'checkpoint.json').exists()
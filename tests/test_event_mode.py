@@ -0,0 +1,117 @@
+# tests/test_event_mode.py
+import socket
+import time
+
+import pytest
+import requests
+
+from conftest import TOKEN, tba_key
+from fake_plex_server import MOVIE_SECTION, SHOW_SECTION
+from plex_refresher.core.async_plex_client import AsyncRunner
+from plex_refresher.core.event_listener import ItemEvent, PlexEventListener
+from plex_refresher.core.plex_client import PlexClient
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def wait_for(condition, timeout: float = 5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, 'timed out'
+        time.sleep(0.02)
+
+@pytest.fixture
+def runner():
+    runner = AsyncRunner()
+    yield runner
+    runner.stop()
+
+@pytest.fixture
+def plex_client(fake_server, logger):
+    client = PlexClient(fake_server.url, TOKEN, logger, name='fake')
+    assert client.connect()
+    return client
+
+def test_websocket_notifications_become_item_events(fake_server, plex_client, logger, runner):
+    listener = PlexEventListener([plex_client], logger, websocket=True)
+    listener.start(runner)
+    try:
+        wait_for(lambda: fake_server.subscribers == 1)
+        episode = tba_key(fake_server, SHOW_SECTION)
+        movie = tba_key(fake_server, MOVIE_SECTION)
+        # Still processing, so not announced yet
+        fake_server.notify(episode, state=1)
+        fake_server.notify(episode)
+        fake_server.notify(movie)
+        events = listener.collect(timeout=5, debounce=0.2)
+    finally:
+        listener.stop()
+    assert events == [
+        ItemEvent('fake', SHOW_SECTION, episode, 'episode'),
+        ItemEvent('fake', MOVIE_SECTION, movie, 'movie')
+    ]
+
+def test_webhooks_become_item_events(fake_server, plex_client, logger, runner):
+    port = free_port()
+    listener = PlexEventListener([plex_client], logger, websocket=False, webhook_host='127.0.0.1', webhook_port=port)
+    listener.start(runner)
+    try:
+        episode = tba_key(fake_server, SHOW_SECTION)
+        url = f'http://127.0.0.1:{port}/webhook'
+        assert requests.post(url, json=fake_server.webhook_payload(episode, event='media.play')).ok
+        assert requests.post(url, json=fake_server.webhook_payload(episode)).ok
+        events = listener.collect(timeout=5, debounce=0.1)
+    finally:
+        listener.stop()
+    assert events == [ItemEvent('fake', SHOW_SECTION, episode, 'episode')]
+
+def test_events_refresh_matching_items(fake_server, make_refresher):
+    refresher = make_refresher()
+    episode = tba_key(fake_server, SHOW_SECTION)
+    untitled = next(i['ratingKey'] for i in fake_server.library.sections[SHOW_SECTION] if i['title'] != 'TBA')
+    refresher.check_events([
+        ItemEvent('fake', SHOW_SECTION, episode, 'episode'),
+        ItemEvent('fake', SHOW_SECTION, untitled, 'episode')
+    ])
+    assert fake_server.refreshed == [episode]
+
+def test_events_refresh_through_the_async_client(fake_server, make_refresher):
+    refresher = make_refresher(backend='async')
+    movie = tba_key(fake_server, MOVIE_SECTION)
+    refresher.check_events([ItemEvent('fake', MOVIE_SECTION, movie, 'movie')])
+    assert fake_server.refreshed == [movie]
+
+def test_events_outside_the_configured_libraries_are_ignored(fake_server, make_refresher):
+    refresher = make_refresher(libraries=['Movies'])
+    movie = tba_key(fake_server, MOVIE_SECTION)
+    refresher.check_events([
+        ItemEvent('fake', SHOW_SECTION, tba_key(fake_server, SHOW_SECTION), 'episode'),
+        ItemEvent('fake', MOVIE_SECTION, movie, 'movie')
+    ])
+    assert fake_server.refreshed == [movie]
+
+def test_events_outside_the_library_filter_are_ignored(fake_server, make_refresher):
+    refresher = make_refresher()
+    refresher.library_filter = {'TV Shows'}
+    episode = tba_key(fake_server, SHOW_SECTION)
+    refresher.check_events([
+        ItemEvent('fake', SHOW_SECTION, episode, 'episode'),
+        ItemEvent('fake', MOVIE_SECTION, tba_key(fake_server, MOVIE_SECTION), 'movie')
+    ])
+    assert fake_server.refreshed == [episode]
+
+def test_websocket_events_drive_a_refresh(fake_server, make_refresher, runner):
+    refresher = make_refresher()
+    refresher._connect_servers()
+    listener = PlexEventListener(refresher.plex_clients, refresher.logger, websocket=True)
+    listener.start(runner)
+    try:
+        wait_for(lambda: fake_server.subscribers == 1)
+        episode = tba_key(fake_server, SHOW_SECTION)
+        fake_server.notify(episode)
+        refresher.check_events(listener.collect(timeout=5, debounce=0.1))
+    finally:
+        listener.stop()
+    assert fake_server.refreshed == [episode]
@@ -0,0 +1,47 @@
+# tests/test_guid_deduper.py
+import logging
+
+from plex_refresher.core.guid_deduper import GuidDeduper
+from plex_refresher.models.tba_item import TBAItem
+
+def movie(rating_key: str, guid: str = 'tmdb://1') -> TBAItem:
+    return TBAItem(rating_key=rating_key, type='movie', title='TBA', guid=guid)
+
+def test_first_copy_becomes_primary_and_later_copies_mirror_it():
+    deduper = GuidDeduper(logging.getLogger('test'))
+    assert deduper.claim('a:1', [movie('10')]) == [movie('10')]
+    assert deduper.claim('b:1', [movie('20')]) == []
+    assert deduper.collapsed == 1
+    assert deduper.mirrors_of('a:1', '10') == [('b:1', movie('20'))]
+
+def test_primary_stays_the_same_when_scan_order_changes():
+    deduper = GuidDeduper(logging.getLogger('test'))
+    deduper.claim('a:1', [movie('10')])
+    deduper.claim('b:1', [movie('20')])
+    deduper.reset()
+    # The mirror library finishes first this cycle
+    assert deduper.claim('b:1', [movie('20')]) == []
+    assert deduper.claim('a:1', [movie('10')]) == [movie('10')]
+    assert deduper.mirrors_of('a:1', '10') == [('b:1', movie('20'))]
+
+def test_new_primary_is_chosen_once_the_old_one_stops_matching():
+    deduper = GuidDeduper(logging.getLogger('test'))
+    deduper.claim('a:1', [movie('10')])
+    deduper.reset()
+    deduper.claim('b:1', [movie('20')])
+    deduper.reset()
+    assert deduper.claim('b:1', [movie('20')]) == [movie('20')]
+
+def test_items_without_guid_are_always_refreshed():
+    deduper = GuidDeduper(logging.getLogger('test'))
+    assert deduper.claim('a:1', [movie('10', guid='')]) == [movie('10', guid='')]
+    assert deduper.claim('b:1', [movie('20', guid='')]) == [movie('20', guid='')]
+
+def test_reset_clears_mirrors_and_counts():
+    deduper = GuidDeduper(logging.getLogger('test'))
+    deduper.claim('a:1', [movie('10'), movie('11', 'tmdb://2')])
+    deduper.claim('b:1', [movie('20'), movie('21', 'tmdb://2')])
+    assert deduper.collapsed == 2
+    deduper.reset()
+    assert deduper.collapsed == 0
+    assert deduper.mirrors_of('a:1', '10') == []
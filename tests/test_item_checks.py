@@ -0,0 +1,81 @@
+# tests/test_item_checks.py
+from dataclasses import replace
+
+import pytest
+
+from conftest import tba_key
+from fake_plex_server import EPISODES_PER_SEASON, MACHINE_IDENTIFIER, MOVIE_SECTION, SHOW_SECTION
+from plex_refresher.models.tba_item import TBAItem
+
+def test_rating_keys_refresh_matching_items(fake_server, make_refresher):
+    refresher = make_refresher()
+    episode = tba_key(fake_server, SHOW_SECTION)
+    movie = tba_key(fake_server, MOVIE_SECTION)
+    refresher.check_rating_keys([episode, movie])
+    assert sorted(fake_server.refreshed) == sorted([episode, movie])
+
+def test_rating_keys_outside_the_library_filter_are_ignored(fake_server, make_refresher):
+    refresher = make_refresher()
+    refresher.library_filter = {'Movies'}
+    movie = tba_key(fake_server, MOVIE_SECTION)
+    refresher.check_rating_keys([tba_key(fake_server, SHOW_SECTION), movie])
+    assert fake_server.refreshed == [movie]
+
+def test_rating_keys_outside_the_configured_libraries_are_ignored(fake_server, make_refresher):
+    refresher = make_refresher(libraries=['TV Shows'])
+    episode = tba_key(fake_server, SHOW_SECTION)
+    refresher.check_rating_keys([episode, tba_key(fake_server, MOVIE_SECTION)])
+    assert fake_server.refreshed == [episode]
+
+@pytest.mark.parametrize('backend', ['plexapi', 'raw', 'async'])
+def test_per_pattern_quick_search_sends_lean_listings(fake_server, make_refresher, backend):
+    fake_server.or_filter = False
+    refresher = make_refresher(backend=backend, patterns=('TBA', 'TBD'), dry_run=True)
+    refresher.refresh_metadata()
+    titles = [query['title'][0] for query in fake_server.listings if 'title' in query]
+    assert set(titles) >= {'TBA', 'TBD'}
+    assert all('excludeFields' in query for query in fake_server.listings if 'title' in query)
+
+def test_quick_search_only_resolves_items_a_title_filter_lists(fake_server, make_refresher):
+    refresher = make_refresher(libraries=['Movies'], patterns=('TBA', 're:^Movie 3$'), dry_run=True)
+    client = refresher._connect_servers()[0]
+    section_id = f'{MACHINE_IDENTIFIER}:{MOVIE_SECTION}'
+    regex_match = TBAItem.from_item(client.plex.fetchItem(4))
+    # Listed as TBA last cycle and retitled on the server since
+    retitled = replace(TBAItem.from_item(client.plex.fetchItem(6)), title='TBA')
+    refresher.index.record_matches(section_id, 'Movies', [regex_match, retitled])
+    refresher.refresh_metadata()
+    pending = refresher.index.pending_keys(section_id)
+    assert regex_match.rating_key in pending
+    assert retitled.rating_key not in pending
+
+@pytest.mark.parametrize('backend', ['plexapi', 'raw', 'async'])
+def test_deep_scan_rechecks_pending_episodes_past_the_episode_limit(fake_server, make_refresher, backend):
+    refresher = make_refresher(libraries=['TV Shows'], backend=backend, method='deep', dry_run=True)
+    refresher.config['search']['episode_scan_limit'] = 2
+    client = refresher._connect_servers()[0]
+    section_id = f'{MACHINE_IDENTIFIER}:{SHOW_SECTION}'
+    episodes = fake_server.library.sections[SHOW_SECTION]
+    # Each show's last episodes aired most recently, so the first ones fall outside the limit
+    older = [i for i in episodes if int(i['index']) < EPISODES_PER_SEASON and i['parentIndex'] == '1']
+    still_tba = next(i['ratingKey'] for i in older if i['title'] == 'TBA')
+    retitled = next(i['ratingKey'] for i in older if i['title'] != 'TBA')
+    refresher.index.record_matches(section_id, 'TV Shows', [
+        TBAItem.from_item(client.plex.fetchItem(int(still_tba))),
+        replace(TBAItem.from_item(client.plex.fetchItem(int(retitled))), title='TBA')
+    ])
+    refresher.refresh_metadata()
+    pending = refresher.index.pending_keys(section_id)
+    assert still_tba in pending
+    assert retitled not in pending
+
+@pytest.mark.parametrize('backend', ['plexapi', 'raw', 'async'])
+def test_recheck_pending_builds_the_same_records_on_every_backend(fake_server, make_refresher, backend):
+    refresher = make_refresher(libraries=['TV Shows'], backend=backend, dry_run=True)
+    client = refresher._connect_servers()[0]
+    section_id = f'{MACHINE_IDENTIFIER}:{SHOW_SECTION}'
+    episode = TBAItem.from_item(client.plex.fetchItem(int(tba_key(fake_server, SHOW_SECTION))))
+    refresher.index.record_matches(section_id, 'TV Shows', [episode])
+    assert refresher.recheck_pending() == {section_id: [episode]}
+    # The async backend re-checks over its pooled client rather than through plexapi
+    assert bool(refresher.async_clients) == (backend == 'async')
@@ -0,0 +1,38 @@
+# tests/test_load_monitor.py
+import threading
+import time
+
+from plex_refresher.core.load_monitor import REDUCED, LoadMonitor, ServerLoad
+from plex_refresher.core.plex_client import PlexClient
+
+THROTTLE = {
+    'pause_at_sessions': 0, 'pause_at_transcodes': 0, 'pause_at_activities': 0,
+    'reduce_at_sessions': 1, 'reduce_at_transcodes': 0, 'activity_types': [],
+    'reduced_page_delay_seconds': 0.3, 'reduced_factor': 0.5, 'max_pause_seconds': 0
+}
+
+def test_reduced_page_spacing_outlasts_wakeups(logger):
+    client = PlexClient('http://localhost:1', 'token', logger, name='plex')
+    monitor = LoadMonitor([client], THROTTLE, refresh_rate=10, max_in_flight=2, logger=logger)
+    monitor._apply('plex', ServerLoad(sessions=1))
+    assert monitor._states['plex'].level == REDUCED
+    monitor.before_page('plex')
+
+    done = threading.Event()
+
+    def wake():
+        # Refresh slots being released wake every waiter on the condition
+        while not done.is_set():
+            monitor.acquire_refresh('plex')
+            monitor.release_refresh('plex')
+            time.sleep(0.02)
+
+    waker = threading.Thread(target=wake)
+    waker.start()
+    try:
+        started = time.monotonic()
+        monitor.before_page('plex')
+        assert time.monotonic() - started >= 0.29
+    finally:
+        done.set()
+        waker.join()
@@ -0,0 +1,25 @@
+# tests/test_rate_limiter.py
+import time
+
+from plex_refresher.utils.rate_limiter import TokenBucket
+
+def test_burst_up_to_capacity_without_waiting():
+    bucket = TokenBucket(rate=1, capacity=3)
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+
+def test_acquires_beyond_the_burst_are_paced():
+    bucket = TokenBucket(rate=20, capacity=1)
+    bucket.acquire()
+    started = time.monotonic()
+    waited = sum(bucket.acquire() for _ in range(4))
+    elapsed = time.monotonic() - started
+    assert 0.18 <= waited <= elapsed + 0.01
+    assert elapsed < 0.5
+
+def test_set_rate_applies_to_the_next_wait():
+    bucket = TokenBucket(rate=0.1, capacity=1)
+    bucket.acquire()
+    bucket.set_rate(50)
+    started = time.monotonic()
+    bucket.acquire()
+    assert time.monotonic() - started < 0.1
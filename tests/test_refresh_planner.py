@@ -0,0 +1,44 @@
+# tests/test_refresh_planner.py
+import pytest
+
+from plex_refresher.core.refresh_planner import RefreshPlanner
+from plex_refresher.models.tba_item import TBAItem
+
+SECTION = 'fake:2'
+
+def episode(rating_key: str, season: int, show: str = '100') -> TBAItem:
+    return TBAItem(rating_key=rating_key, type='episode', title='TBA', show=f'Show {show}', season=season,
+                   episode=int(rating_key), parent_rating_key=f'{show}-{season}', grandparent_rating_key=show)
+
+@pytest.fixture
+def planner(logger):
+    return RefreshPlanner(season_threshold=3, show_threshold=6, logger=logger)
+
+def levels(targets):
+    return sorted((target.level, target.rating_key, len(target.items)) for target in targets)
+
+def test_items_below_the_thresholds_are_refreshed_one_by_one(planner):
+    movie = TBAItem(rating_key='1', type='movie', title='TBA')
+    targets = planner.plan([(movie, 'fake:1'), (episode('2', 1), SECTION), (episode('3', 1), SECTION)])
+    assert levels(targets) == [('item', '1', 1), ('item', '2', 1), ('item', '3', 1)]
+    assert planner.saved == 0
+
+def test_crowded_seasons_collapse_into_one_refresh(planner):
+    episodes = [episode(str(key), 1) for key in range(1, 4)] + [episode('4', 2)]
+    targets = planner.plan((item, SECTION) for item in episodes)
+    assert levels(targets) == [('item', '4', 1), ('season', '100-1', 3)]
+    assert str(next(t for t in targets if t.level == 'season')) == 'Show 100 - Season 1 (season, 3 TBA episodes)'
+    assert planner.saved == 2
+
+def test_crowded_shows_collapse_into_one_refresh(planner):
+    episodes = [episode(str(key), key % 3) for key in range(1, 7)]
+    assert levels(planner.plan((item, SECTION) for item in episodes)) == [('show', '100', 6)]
+
+def test_the_same_show_in_two_libraries_is_planned_separately(planner):
+    episodes = [(episode(str(key), 1), section) for key in range(1, 4) for section in (SECTION, 'other:2')]
+    assert [target.section_id for target in planner.plan(episodes)] == [SECTION, 'other:2']
+
+def test_zero_thresholds_never_collapse(logger):
+    planner = RefreshPlanner(season_threshold=0, show_threshold=0, logger=logger)
+    targets = planner.plan((episode(str(key), 1), SECTION) for key in range(1, 10))
+    assert {target.level for target in targets} == {'item'}
@@ -0,0 +1,68 @@
+# tests/test_refresh_scheduler.py
+import time
+
+import pytest
+
+from plex_refresher.core.refresh_scheduler import RefreshScheduler
+from plex_refresher.models.tba_item import TBAItem
+
+SECTION = 'fake:1'
+
+def movie(rating_key: str) -> TBAItem:
+    return TBAItem(rating_key=rating_key, type='movie', title='TBA')
+
+@pytest.fixture
+def scheduler(logger):
+    return RefreshScheduler(base_delay=60, max_delay=600, jitter=0, logger=logger)
+
+def due_keys(scheduler, now=None):
+    return [entry.item.rating_key for entry in scheduler.pop_due(now)]
+
+def test_backoff_doubles_up_to_the_cap(scheduler):
+    assert [scheduler.backoff_delay(attempts) for attempts in range(1, 6)] == [60, 120, 240, 480, 600]
+
+def test_backoff_jitter_stays_within_bounds(logger):
+    scheduler = RefreshScheduler(base_delay=100, max_delay=1000, jitter=0.2, logger=logger)
+    assert all(80 <= scheduler.backoff_delay(1) <= 120 for _ in range(100))
+
+def test_due_entries_come_out_in_due_order(scheduler):
+    now = time.time()
+    scheduler.observe(SECTION, [movie('1')], {'1': (2, now - 1000)})
+    scheduler.observe(SECTION, [movie('2')])
+    scheduler.observe(SECTION, [movie('3')], {'3': (1, now)})
+    assert due_keys(scheduler) == ['1', '2']
+    assert due_keys(scheduler, now + 61) == ['3']
+
+def test_history_seeds_the_backoff(scheduler):
+    now = time.time()
+    scheduler.observe(SECTION, [movie('1')], {'1': (2, now)})
+    assert due_keys(scheduler) == []
+    assert scheduler.next_due() == pytest.approx(now + 120, abs=1)
+
+def test_popped_entries_are_parked_until_rescheduled(scheduler):
+    scheduler.observe(SECTION, [movie('1')])
+    assert due_keys(scheduler) == ['1']
+    # Observing a parked item again does not make it due a second time
+    scheduler.observe(SECTION, [movie('1')])
+    assert due_keys(scheduler, time.time() + 10_000) == []
+    assert scheduler.next_due() is None
+    scheduler.reschedule(SECTION, '1')
+    assert due_keys(scheduler) == []
+    assert due_keys(scheduler, time.time() + 61) == ['1']
+
+def test_reschedule_unverified_only_backs_off_parked_entries(scheduler):
+    scheduler.observe(SECTION, [movie('1'), movie('2')])
+    scheduler.pop_due()
+    scheduler.observe(SECTION, [movie('3')])
+    scheduler.reschedule_unverified(SECTION, ['1', '3', '4'])
+    assert due_keys(scheduler) == ['3']
+    assert due_keys(scheduler, time.time() + 61) == ['1']
+    # Still parked: its re-check succeeded and it waits for the outcome
+    assert len(scheduler) == 3
+
+def test_forgotten_items_are_never_due(scheduler):
+    scheduler.observe(SECTION, [movie('1'), movie('2')])
+    scheduler.observe('other:1', [movie('1')])
+    scheduler.forget(SECTION, ['1'])
+    assert sorted(due_keys(scheduler)) == ['1', '2']
+    assert len(scheduler) == 2
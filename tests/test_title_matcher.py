@@ -0,0 +1,55 @@
+# tests/test_title_matcher.py
+import pytest
+
+from plex_refresher.utils.title_matcher import TitleMatcher
+
+def test_literals_match_substrings_by_default():
+    matcher = TitleMatcher(['TBA', 'TBD'])
+    assert matcher.match('Episode TBA') == 'TBA'
+    assert matcher.match('tba') == 'TBA'
+    assert matcher.match('Tbaytown') == 'TBA'
+    assert matcher.match('Episode 1') is None
+    assert matcher.match(None) is None
+
+def test_word_boundary_matches_whole_words_only():
+    matcher = TitleMatcher(['TBA', 'TBD'], word_boundary=True)
+    assert matcher.match('Episode TBA') == 'TBA'
+    assert matcher.match('TBA/TBD') == 'TBA'
+    assert matcher.match('(TBD)') == 'TBD'
+    assert matcher.match('Tbaytown') is None
+    assert matcher.match('STBA') is None
+
+def test_from_config_defaults_to_substring_matching():
+    assert TitleMatcher.from_config({'patterns': ['TBA']}).match('Tbaytown') == 'TBA'
+    assert TitleMatcher.from_config({'patterns': ['TBA'], 'word_boundary': True}).match('Tbaytown') is None
+
+@pytest.mark.parametrize('word_boundary', [False, True])
+def test_longest_literal_wins(word_boundary):
+    matcher = TitleMatcher(['TBA', 'TBA Episode'], word_boundary=word_boundary)
+    assert matcher.match('TBA Episode') == 'TBA Episode'
+
+@pytest.mark.parametrize('word_boundary', [False, True])
+def test_case_sensitive_literals(word_boundary):
+    matcher = TitleMatcher(['TBA'], case_sensitive=True, word_boundary=word_boundary)
+    assert matcher.match('Episode TBA') == 'TBA'
+    assert matcher.match('Episode tba') is None
+
+@pytest.mark.parametrize('word_boundary', [False, True])
+def test_exclusions_and_regexes(word_boundary):
+    matcher = TitleMatcher(['TBA', r're:^Episode \d+$'], exclude=['TBA Trailer'], word_boundary=word_boundary)
+    assert matcher.match('TBA Trailer') is None
+    assert matcher.match('Episode 12') == r're:^Episode \d+$'
+    assert matcher.literals == ['TBA']
+
+def test_full_title_includes_the_show():
+    matcher = TitleMatcher(['Unknown Show'], include_full_title=True)
+    assert matcher.match('Pilot', 'Unknown Show') == 'Unknown Show'
+    assert TitleMatcher(['Unknown Show']).match('Pilot', 'Unknown Show') is None
+
+def test_title_filters_or_literals_without_commas():
+    matcher = TitleMatcher(['TBA', 'TBD', 'Yes, TBA', 're:^x$'])
+    assert matcher.title_filters() == ['TBA,TBD', 'Yes, TBA']
+
+def test_invalid_regex_is_rejected():
+    with pytest.raises(ValueError):
+        TitleMatcher(['re:('])
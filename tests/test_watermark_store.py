@@ -0,0 +1,43 @@
+# tests/test_watermark_store.py
+import time
+
+from plex_refresher.storage.watermark_store import WatermarkStore
+
+def test_watermarks_only_move_forward_and_persist(tmp_path, logger):
+    path = tmp_path / 'watermarks.json'
+    store = WatermarkStore(path, logger)
+    assert store.get_watermark('a:1') is None
+    store.update('a:1', 200, full_scan=True)
+    store.update('a:1', 150, full_scan=False)
+    assert store.get_watermark('a:1') == 200
+    assert WatermarkStore(path, logger).get_watermark('a:1') == 200
+
+def test_full_scan_due(tmp_path, logger):
+    store = WatermarkStore(tmp_path / 'watermarks.json', logger)
+    assert store.full_scan_due('a:1', 3600)
+    store.update('a:1', 200, full_scan=True)
+    assert not store.full_scan_due('a:1', 3600)
+    store.sections['a:1']['last_full_scan'] = time.time() - 3600
+    assert store.full_scan_due('a:1', 3600)
+
+def test_incremental_scans_keep_the_last_full_scan_time(tmp_path, logger):
+    store = WatermarkStore(tmp_path / 'watermarks.json', logger)
+    store.update('a:1', 200, full_scan=True)
+    full = store.sections['a:1']['last_full_scan']
+    store.update('a:1', 300, full_scan=False)
+    assert store.sections['a:1']['last_full_scan'] == full
+
+def test_require_full_scan_keeps_the_watermark(tmp_path, logger):
+    path = tmp_path / 'watermarks.json'
+    store = WatermarkStore(path, logger)
+    store.update('a:1', 200, full_scan=True)
+    store.require_full_scan(['a:1', 'b:1'])
+    reloaded = WatermarkStore(path, logger)
+    assert reloaded.full_scan_due('a:1', 3600)
+    assert reloaded.get_watermark('a:1') == 200
+    assert 'b:1' not in reloaded.sections
+
+def test_unreadable_file_starts_empty(tmp_path, logger):
+    path = tmp_path / 'watermarks.json'
+    path.write_text('{not json')
+    assert WatermarkStore(path, logger).sections == {}